@@ -1,7 +1,7 @@
 import os
 
 from flask import Flask
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import scoped_session, sessionmaker
 
@@ -25,6 +25,7 @@ def create_app():
     global db_session
     engine = create_engine(app.config["DATABASE_URI"])
     db_session = scoped_session(sessionmaker(autocommit=False, autoflush=False, bind=engine))
+    sync_schema(engine)
 
     # Allow Lead.query style access
     Base.query = db_session.query_property()
@@ -41,32 +42,68 @@ def create_app():
 
     # --- UI Helpers & Stats ---
     from .models.config import AppConfig
+    from .services.quota import monthly_limit
 
     @app.context_processor
     def inject_stats():
         """Injects API usage statistics into all HTML templates for the top navbar."""
-        try:
-            nearby = int(AppConfig.get("google_api_nearby", 0))
-            details = int(AppConfig.get("google_api_details", 0))
-        except (ValueError, TypeError):
-            nearby = 0
-            details = 0
+        # Cached counters plus those not flushed yet: no DB read on most renders
+        usage = AppConfig.usage_stats()
+        nearby = usage["google_api_nearby"]
+        details = usage["google_api_details"]
+        cache_hits = usage["nearby_cache_hits"]
+        cache_misses = usage["nearby_cache_misses"]
+        details_cached = usage["details_cache_hits"]
+
+        # Google Places API monthly budgets (GOOGLE_NEARBY_MONTHLY_LIMIT / GOOGLE_DETAILS_MONTHLY_LIMIT)
+        nearby_limit = monthly_limit("google_api_nearby")
+        details_limit = monthly_limit("google_api_details")
+
+        nearby_pct = round((nearby / nearby_limit) * 100, 1) if nearby_limit else 100
+        details_pct = round((details / details_limit) * 100, 1) if details_limit else 100
+
+        # Every Nearby Search cache hit is one page we did not buy again
+        lookups = cache_hits + cache_misses
+        cache_hit_pct = round((cache_hits / lookups) * 100, 1) if lookups else 0
+
+        return dict(
+            api_nearby=nearby,
+            api_details=details,
+            api_nearby_pct=nearby_pct,
+            api_details_pct=details_pct,
+            api_nearby_limit=nearby_limit,
+            api_details_limit=details_limit,
+            nearby_cache_saved=cache_hits,
+            nearby_cache_hit_pct=cache_hit_pct,
+            details_cache_saved=details_cached,
+        )
 
-        # Google Places API Free Tiers (adjust as needed)
-        nearby_limit = 5000
-        details_limit = 10000
+    return app
 
-        nearby_pct = round((nearby / nearby_limit) * 100, 1)
-        details_pct = round((details / details_limit) * 100, 1)
 
-        return dict(api_nearby=nearby, api_details=details, api_nearby_pct=nearby_pct, api_details_pct=details_pct)
+def sync_schema(engine):
+    """
+    Creates missing tables and adds columns introduced since the database was created.
+    Lightweight stand-in for migrations: only ever adds nullable columns.
+    """
+    from app.models import config, lead, scan_checkpoint, usage  # noqa: F401  (register models on Base)
 
-    return app
+    new_tables = set(Base.metadata.tables) - set(inspect(engine).get_table_names())
+    Base.metadata.create_all(engine)
+
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        if "api_usage" in new_tables and "app_config" not in new_tables:
+            usage.ApiUsage.import_counters(conn, config.USAGE_COUNTERS)
+        for table in Base.metadata.sorted_tables:
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing:
+                    column_type = column.type.compile(dialect=engine.dialect)
+                    conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
 
 
 def init_db():
     """Bootstraps the database tables from the SQLAlchemy models."""
-    from app.models.lead import Base
-
     engine = create_engine(os.environ.get("DATABASE_URI", "sqlite:///leadscan.db"))
-    Base.metadata.create_all(engine)
+    sync_schema(engine)
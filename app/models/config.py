@@ -1,12 +1,46 @@
+import atexit
 import logging
-from datetime import datetime
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import date
 
-from sqlalchemy import Column, String, text
+from sqlalchemy import Column, String
 
 from app import Base
+from app.models.usage import ApiUsage, month_start
+from app.services.settings import env_number
 
 logger = logging.getLogger(__name__)
 
+# Usage counters recorded in the api_usage ledger (monthly budgets, navbar, /usage)
+USAGE_COUNTERS = (
+    "google_api_nearby",
+    "google_api_details",
+    "nearby_cache_hits",
+    "nearby_cache_misses",
+    "details_cache_hits",
+)
+
+# --- Write-behind usage counts ---
+DEFAULT_USAGE_FLUSH_INTERVAL = 5  # seconds between batched counter writes (USAGE_FLUSH_INTERVAL); 0 writes through
+_pending_lock = threading.Lock()
+_pending = Counter()  # (day, counter) -> count recorded in memory, not yet in the ledger
+_last_flush = time.monotonic()
+_deferred = threading.local()  # Threads inside deferred_flush(): another thread commits their counts
+
+# --- Navbar stats cache ---
+DEFAULT_USAGE_STATS_TTL = 30  # seconds stored counters are reused between renders (USAGE_STATS_TTL)
+_stats_lock = threading.Lock()
+_stats_cache = {"values": None, "at": 0.0, "month": None}
+
+
+def _invalidate_stats():
+    """Drops the cached counters after a write to them."""
+    with _stats_lock:
+        _stats_cache["values"] = None
+
 
 class AppConfig(Base):
     """
@@ -46,52 +80,97 @@ class AppConfig(Base):
             db_session.rollback()
 
     @staticmethod
-    def check_monthly_reset():
+    def record_usage(key, amount=1):
+        """
+        Counts usage in memory; the totals are appended to the api_usage ledger
+        by flush_usage, at most every USAGE_FLUSH_INTERVAL seconds (on the next
+        record after it elapses), at the end of scans and bulk runs, and at exit.
+        """
+        with _pending_lock:
+            _pending[(date.today(), key)] += amount
+            due = time.monotonic() - _last_flush >= env_number(
+                "USAGE_FLUSH_INTERVAL", DEFAULT_USAGE_FLUSH_INTERVAL, float
+            )
+        if due and not getattr(_deferred, "active", False):
+            AppConfig.flush_usage()
+
+    @staticmethod
+    @contextmanager
+    def deferred_flush():
         """
-        Automatically resets API usage counters if we have entered a new billing month.
+        Within the block, record_usage on this thread only counts in memory and
+        never commits. For worker threads whose caller owns the DB writes (bulk
+        analysis): the caller commits the counts with flush_usage.
         """
-        current_month = datetime.now().strftime("%Y-%m")
-        stored_month = AppConfig.get("last_billing_month")
+        _deferred.active = True
+        try:
+            yield
+        finally:
+            _deferred.active = False
 
-        if stored_month != current_month:
-            # New month detected: Reset counters to 0
-            AppConfig.set("last_billing_month", current_month)
-            AppConfig.set("google_api_nearby", "0")
-            AppConfig.set("google_api_details", "0")
-            AppConfig.set("google_api_calls", "0")
-            logger.info(f"New billing month detected ({current_month}). Resetting API counters.")
+    @staticmethod
+    def pending_usage(key, since=None):
+        """Counts recorded for key from `since` (default: this billing month) that are not in the ledger yet."""
+        since = since or month_start()
+        with _pending_lock:
+            return sum(count for (day, counter), count in _pending.items() if counter == key and day >= since)
 
     @staticmethod
-    def increment(key, amount=1):
+    def flush_usage():
         """
-        Atomically increment a numeric configuration value (e.g., API hits).
-        Uses SQL UPDATE for thread-safe atomic increment.
+        Appends pending usage counts to the api_usage ledger: one row per
+        (day, counter) and a single commit, with no read-modify-write of shared
+        rows. Counts are kept for the next flush if the write fails.
         """
+        global _last_flush
         from app import db_session
 
-        # Ensure counters are fresh for the current month
-        AppConfig.check_monthly_reset()
+        with _pending_lock:
+            _last_flush = time.monotonic()
+            if not _pending or db_session is None:
+                return
+            counts = dict(_pending)
+            _pending.clear()
 
         try:
-            # Ensure the key exists first
-            item = db_session.get(AppConfig, key)
-            if not item:
-                item = AppConfig(key=key, value="0")
-                db_session.add(item)
-                db_session.commit()
-
-            # Atomic increment using SQL UPDATE
-            db_session.execute(
-                text("UPDATE app_config SET value = CAST(COALESCE(value, '0') AS INTEGER) + :amt WHERE key = :key"),
-                {"amt": amount, "key": key},
+            db_session.add_all(
+                ApiUsage(counter=counter, day=day, count=count) for (day, counter), count in counts.items() if count
             )
             db_session.commit()
-
-            # Return the new value
-            item = db_session.get(AppConfig, key)
-            return int(item.value) if item else amount
-
+            _invalidate_stats()
         except Exception as e:
-            logger.error(f"Failed to increment config key '{key}': {e}")
+            logger.error(f"Failed to flush usage counters: {e}")
             db_session.rollback()
-            return 0
+            with _pending_lock:
+                _pending.update(counts)
+
+    @staticmethod
+    def usage_stats():
+        """
+        {counter: count} for USAGE_COUNTERS this billing month, ledger plus pending, for the navbar.
+        Ledger totals are read in one rollup query and reused until this process
+        flushes, the month changes or USAGE_STATS_TTL seconds pass (other processes' writes).
+        """
+        since = month_start()
+        ttl = env_number("USAGE_STATS_TTL", DEFAULT_USAGE_STATS_TTL, float)
+        with _stats_lock:
+            stored = _stats_cache["values"]
+            if stored is not None and (time.monotonic() - _stats_cache["at"] >= ttl or _stats_cache["month"] != since):
+                stored = None
+        if stored is None:
+            try:
+                stored = ApiUsage.totals(since, USAGE_COUNTERS)
+            except Exception as e:
+                logger.warning(f"Failed to read usage counters: {e}")
+                return {counter: AppConfig.pending_usage(counter) for counter in USAGE_COUNTERS}
+            with _stats_lock:
+                _stats_cache.update(values=stored, at=time.monotonic(), month=since)
+        return {counter: stored.get(counter, 0) + AppConfig.pending_usage(counter) for counter in USAGE_COUNTERS}
+
+
+@atexit.register
+def _flush_at_exit():
+    try:
+        AppConfig.flush_usage()
+    except Exception as e:
+        logger.warning(f"Failed to flush usage counters at exit: {e}")
@@ -2,6 +2,8 @@ import enum
 from datetime import datetime
 
 from sqlalchemy import Boolean, Column, DateTime, Enum, Integer, String, Text
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 from app import Base
 
@@ -32,10 +34,14 @@ class Lead(Base):
     name = Column(String(255), nullable=False)
     address = Column(String(500))
     phone = Column(String(50))
+    email = Column(String(255))
     website_url = Column(String(500))
 
     # --- Analysis Metrics ---
     ssl_active = Column(Boolean, default=False)
+    ssl_issuer = Column(String(255))
+    ssl_expires_at = Column(DateTime)
+    ssl_protocol = Column(String(20))  # e.g. TLSv1.3
     mobile_viewport = Column(Boolean, default=False)
     contact_info_found = Column(Boolean, default=False)
     content_heuristic_score = Column(Integer, default=0)  # 0-100 score
@@ -44,7 +50,11 @@ class Lead(Base):
     analysis_notes = Column(Text)
     copyright_year = Column(Integer)
     tech_stack = Column(String(100))
-    load_time = Column(Integer)  # In milliseconds
+    ttfb = Column(Integer)  # Time to first byte, in milliseconds
+    load_time = Column(Integer)  # Headers + body download, in milliseconds
+    links_checked = Column(Integer)  # Landing-page links with a conclusive check
+    broken_link_count = Column(Integer)
+    broken_link_samples = Column(Text)  # Newline-separated "url (status)" examples
 
     # --- Workflow ---
     status = Column(Enum(LeadStatus), default=LeadStatus.SCRAPED)
@@ -56,3 +66,29 @@ class Lead(Base):
 
     def __repr__(self):
         return f"<Lead {self.name}>"
+
+    @staticmethod
+    def insert_params_per_row(keys):
+        """Bound parameters one insert_new row takes: its own keys plus every Python-side column default."""
+        defaults = {column.name for column in Lead.__table__.columns if column.default is not None}
+        return len(set(keys) | defaults)
+
+    @staticmethod
+    def insert_new(rows):
+        """
+        Inserts scraped leads ({"place_id", "name", "address"} dicts) with one
+        INSERT ... ON CONFLICT(place_id) DO NOTHING, so place_ids already stored
+        are skipped without a lookup each. Returns how many were new; does not commit.
+        """
+        from app import db_session
+
+        if not rows:
+            return 0
+        dialect = db_session.get_bind().dialect.name
+        insert = postgresql_insert if dialect == "postgresql" else sqlite_insert
+        statement = (
+            insert(Lead)
+            .values([{**row, "status": LeadStatus.SCRAPED, "created_at": datetime.utcnow()} for row in rows])
+            .on_conflict_do_nothing(index_elements=["place_id"])
+        )
+        return db_session.execute(statement).rowcount
@@ -0,0 +1,102 @@
+import json
+import logging
+from datetime import datetime, timedelta
+
+from sqlalchemy import Column, DateTime, Integer, String, Text
+
+from app import Base
+
+logger = logging.getLogger(__name__)
+
+
+class ScanCheckpoint(Base):
+    """
+    Persisted progress of one Omni-Search scan (area + keyword + mode), so a scan
+    interrupted by a disconnect or restart can resume instead of starting over.
+    List and dict fields are stored as JSON text.
+    """
+
+    __tablename__ = "scan_checkpoints"
+
+    id = Column(Integer, primary_key=True)
+    scan_key = Column(String(255), unique=True, nullable=False, index=True)
+    status = Column(String(20), default="running")  # running | complete
+    completed_categories = Column(Text, default="[]")
+    page_tokens = Column(Text, default="{}")  # {category: {"token": next_page_token, "page": index}}
+    seen_place_ids = Column(Text, default="[]")
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+    @staticmethod
+    def key_for(lat, lng, radius, keyword, tiling=False):
+        return f"{round(float(lat), 4)},{round(float(lng), 4)}|{int(radius)}|{keyword.strip().lower()}|tiling={tiling}"
+
+    @staticmethod
+    def find_resumable(scan_key, max_age):
+        """Returns the unfinished checkpoint for scan_key if it was updated within max_age seconds."""
+        from app import db_session
+
+        if db_session is None:
+            return None
+        try:
+            checkpoint = db_session.query(ScanCheckpoint).filter_by(scan_key=scan_key, status="running").first()
+        except Exception as e:
+            logger.warning(f"Failed to load scan checkpoint '{scan_key}': {e}")
+            return None
+        if checkpoint and checkpoint.updated_at >= datetime.utcnow() - timedelta(seconds=max_age):
+            return checkpoint
+        return None
+
+    @staticmethod
+    def start(scan_key):
+        """Creates (or resets) the checkpoint for a fresh scan. Returns None if the DB is unavailable."""
+        from app import db_session
+
+        if db_session is None:
+            return None
+        try:
+            checkpoint = db_session.query(ScanCheckpoint).filter_by(scan_key=scan_key).first()
+            if not checkpoint:
+                checkpoint = ScanCheckpoint(scan_key=scan_key)
+                db_session.add(checkpoint)
+            checkpoint.status = "running"
+            checkpoint.completed_categories = "[]"
+            checkpoint.page_tokens = "{}"
+            checkpoint.seen_place_ids = "[]"
+            checkpoint.created_at = checkpoint.updated_at = datetime.utcnow()
+            db_session.commit()
+            return checkpoint
+        except Exception as e:
+            logger.warning(f"Failed to start scan checkpoint '{scan_key}': {e}")
+            db_session.rollback()
+            return None
+
+    @property
+    def completed(self):
+        return json.loads(self.completed_categories or "[]")
+
+    @property
+    def tokens(self):
+        return json.loads(self.page_tokens or "{}")
+
+    @property
+    def seen(self):
+        return json.loads(self.seen_place_ids or "[]")
+
+    def save(self, completed, tokens, seen, status="running"):
+        """
+        Persists progress. Commits the caller's session, so leads added for the
+        place_ids in `seen` are committed together with the checkpoint.
+        """
+        from app import db_session
+
+        try:
+            self.completed_categories = json.dumps(sorted(completed))
+            self.page_tokens = json.dumps(tokens)
+            self.seen_place_ids = json.dumps(sorted(seen))
+            self.status = status
+            self.updated_at = datetime.utcnow()
+            db_session.commit()
+        except Exception as e:
+            logger.warning(f"Failed to save scan checkpoint '{self.scan_key}': {e}")
+            db_session.rollback()
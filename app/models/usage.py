@@ -0,0 +1,77 @@
+import logging
+from datetime import date
+
+from sqlalchemy import Column, Date, Index, Integer, String, func, text
+
+from app import Base
+
+logger = logging.getLogger(__name__)
+
+
+def month_start(today=None):
+    """First day of the billing month containing today."""
+    return (today or date.today()).replace(day=1)
+
+
+class ApiUsage(Base):
+    """
+    Append-only ledger of Google Places usage: each usage flush inserts one row
+    per (counter, day) it saw, never updating earlier rows, so concurrent writers
+    do not contend on a shared row and past months keep their history.
+    Totals are SUM rollups over the (day, counter) index.
+    """
+
+    __tablename__ = "api_usage"
+    __table_args__ = (Index("ix_api_usage_day_counter", "day", "counter"),)
+
+    id = Column(Integer, primary_key=True)
+    counter = Column(String(50), nullable=False)  # One of USAGE_COUNTERS
+    day = Column(Date, nullable=False)
+    count = Column(Integer, nullable=False)
+
+    @staticmethod
+    def totals(since, counters=None):
+        """{counter: count} from `since` (a date) onwards, optionally limited to some counters."""
+        from app import db_session
+
+        query = db_session.query(ApiUsage.counter, func.sum(ApiUsage.count)).filter(ApiUsage.day >= since)
+        if counters is not None:
+            query = query.filter(ApiUsage.counter.in_(counters))
+        return {counter: int(total) for counter, total in query.group_by(ApiUsage.counter)}
+
+    @staticmethod
+    def daily(since):
+        """[(day, {counter: count})] from `since` onwards, oldest first; days without usage are omitted."""
+        from app import db_session
+
+        rows = (
+            db_session.query(ApiUsage.day, ApiUsage.counter, func.sum(ApiUsage.count))
+            .filter(ApiUsage.day >= since)
+            .group_by(ApiUsage.day, ApiUsage.counter)
+            .order_by(ApiUsage.day)
+        )
+        days = {}
+        for day, counter, total in rows:
+            days.setdefault(day, {})[counter] = int(total)
+        return list(days.items())
+
+    @staticmethod
+    def import_counters(conn, counters):
+        """
+        Seeds a new ledger with this month's legacy app_config counters (as
+        today's usage), so upgrading mid-month keeps the budget accurate.
+        """
+        stored_month = conn.execute(text("SELECT value FROM app_config WHERE key = 'last_billing_month'")).scalar()
+        if stored_month != date.today().strftime("%Y-%m"):
+            return
+        for counter in counters:
+            value = conn.execute(text("SELECT value FROM app_config WHERE key = :key"), {"key": counter}).scalar()
+            try:
+                count = int(value or 0)
+            except (ValueError, TypeError):
+                continue
+            if count:
+                conn.execute(
+                    ApiUsage.__table__.insert().values(counter=counter, day=date.today(), count=count),
+                )
+        logger.info("Imported this month's usage counters into the api_usage ledger.")
@@ -1,15 +1,19 @@
 import json
 import logging
 import os
+from datetime import date, timedelta
 
 from flask import Blueprint, Response, abort, flash, redirect, render_template, request, stream_with_context, url_for
 from sqlalchemy import create_engine
 
 from app import Base, db_session
-from app.models.config import AppConfig
+from app.models.config import USAGE_COUNTERS, AppConfig
 from app.models.lead import Lead, LeadStatus
-from app.services.google_places import search_nearby
+from app.models.usage import ApiUsage
+from app.services.bulk import run_bulk_analysis
+from app.services.google_places import latency, search_nearby
 from app.services.pipeline import process_lead_analysis
+from app.services.quota import PRICE_PER_1000
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +23,11 @@ bp = Blueprint("main", __name__)
 MIN_RADIUS = 100  # meters
 MAX_RADIUS = 50000  # meters (50km)
 DEFAULT_RADIUS = 1000
+DEFAULT_USAGE_DAYS = 30
+MAX_USAGE_DAYS = 366
+SQLITE_MAX_VARIABLES = 999  # Bound parameters per statement on SQLite before 3.32
+# Search results per INSERT: each row binds place_id, name and address plus Lead's Python-side defaults
+LEAD_INSERT_CHUNK = SQLITE_MAX_VARIABLES // Lead.insert_params_per_row(("place_id", "name", "address"))
 
 # --- System Routes ---
 
@@ -29,32 +38,52 @@ def reset_db():
     if request.method == "GET":
         return redirect(url_for("main.index"))
 
-    # 1. Backup Stats
-    backup_stats = {}
+    # 1. Write out usage still held in memory
     try:
-        backup_stats["google_api_nearby"] = AppConfig.get("google_api_nearby", "0")
-        backup_stats["google_api_details"] = AppConfig.get("google_api_details", "0")
-        backup_stats["last_billing_month"] = AppConfig.get("last_billing_month", None)
+        AppConfig.flush_usage()
     except Exception:
         pass  # If DB is broken, just proceed
 
-    # 2. Wipe DB
+    # 2. Wipe DB, keeping the usage ledger
     db_session.remove()  # Close session to release file locks for SQLite
 
     engine = create_engine(os.environ.get("DATABASE_URI", "sqlite:///leadscan.db"))
-    Base.metadata.drop_all(bind=engine)
+    wiped = [table for table in Base.metadata.sorted_tables if table.name != ApiUsage.__tablename__]
+    Base.metadata.drop_all(bind=engine, tables=wiped)
     Base.metadata.create_all(bind=engine)
 
-    # 3. Restore Stats
-    if backup_stats.get("last_billing_month"):
-        AppConfig.set("last_billing_month", backup_stats["last_billing_month"])
-        AppConfig.set("google_api_nearby", backup_stats["google_api_nearby"])
-        AppConfig.set("google_api_details", backup_stats["google_api_details"])
-
     flash("Database reset! (API Stats preserved)")
     return redirect(url_for("main.index"))
 
 
+@bp.route("/usage")
+def usage():
+    """Google Places calls and estimated cost per day, rolled up from the usage ledger."""
+    try:
+        days = max(1, min(int(request.args.get("days", DEFAULT_USAGE_DAYS)), MAX_USAGE_DAYS))
+    except (ValueError, TypeError):
+        days = DEFAULT_USAGE_DAYS
+
+    AppConfig.flush_usage()
+    since = date.today() - timedelta(days=days - 1)
+    rows = []
+    for day, counts in ApiUsage.daily(since):
+        cost = sum(counts.get(counter, 0) * price / 1000 for counter, price in PRICE_PER_1000.items())
+        rows.append({"day": day, "counts": counts, "cost": cost})
+    totals = ApiUsage.totals(since)
+    peak_cost = max((row["cost"] for row in rows), default=0)
+
+    return render_template(
+        "usage.html",
+        days=days,
+        rows=rows,
+        totals={counter: totals.get(counter, 0) for counter in USAGE_COUNTERS},
+        total_cost=sum(row["cost"] for row in rows),
+        peak_cost=peak_cost,
+        latency=latency.summary(),
+    )
+
+
 @bp.route("/favicon.ico")
 def favicon():
     """Prevents 404 errors in console logs for the missing favicon."""
@@ -94,6 +123,8 @@ def index():
 def search():
     """Performs an Omni-Search and streams real-time progress logs to the UI."""
     keyword = request.form.get("keyword", "business").strip()
+    force_refresh = request.form.get("force_refresh") == "1"
+    tiling = True if request.form.get("tiling") == "1" else None  # Unchecked: NEARBY_TILING decides
 
     # Input validation: radius with bounds checking
     try:
@@ -115,22 +146,37 @@ def search():
     def generate():
         total_found = 0
         total_new = 0
+        pending = []  # Results not written yet
 
-        # Stream results from the Google Places service generator
-        for type, data in search_nearby(lat, lng, radius, keyword):
-            if type == "log":
-                yield json.dumps({"type": "log", "message": data}) + "\n"
-            elif type == "result":
-                total_found += 1
-                # Deduplicate and Save
-                existing = Lead.query.filter_by(place_id=data["place_id"]).first()
-                if not existing:
-                    new_lead = Lead(
-                        place_id=data["place_id"], name=data["name"], address=data["address"], status=LeadStatus.SCRAPED
-                    )
-                    db_session.add(new_lead)
-                    total_new += 1
+        def write_pending():
+            nonlocal total_new
+            # Deduplicate and Save: place_ids already stored are skipped by the insert itself
+            total_new += Lead.insert_new(pending)
+            pending.clear()
 
+        # Stream results from the Google Places service generator
+        scan = search_nearby(lat, lng, radius, keyword, force_refresh=force_refresh, tiling=tiling)
+        try:
+            for type, data in scan:
+                if type == "log":
+                    yield json.dumps({"type": "log", "message": data}) + "\n"
+                elif type == "result":
+                    total_found += 1
+                    pending.append({"place_id": data["place_id"], "name": data["name"], "address": data["address"]})
+                    if len(pending) >= LEAD_INSERT_CHUNK:
+                        write_pending()
+                        db_session.commit()
+                elif type == "checkpoint":
+                    # The checkpoint marks these place_ids seen and commits: they must be in that transaction
+                    write_pending()
+        except GeneratorExit:
+            # Client disconnected: write what arrived, then close the scan so it checkpoints them
+            write_pending()
+            scan.close()
+            db_session.commit()
+            raise
+
+        write_pending()
         db_session.commit()
         yield json.dumps({"type": "done", "new_leads": total_new, "total_scanned": total_found}) + "\n"
 
@@ -199,7 +245,7 @@ def analyze_lead_dashboard(lead_id):
 
 @bp.route("/bulk-analyze", methods=["POST"])
 def bulk_analyze():
-    """Trigger analysis for multiple 'Scraped' leads in sequence."""
+    """Trigger concurrent analysis for multiple 'Scraped' leads."""
     analyze_all = request.form.get("analyze_all") == "on"
     try:
         limit = int(request.form.get("limit", 5))
@@ -214,18 +260,12 @@ def bulk_analyze():
         flash('No "Scraped" leads found to analyze.')
         return redirect(url_for("main.index"))
 
-    count = 0
-    errors = 0
-    for lead in leads:
-        try:
-            if process_lead_analysis(lead.id):
-                count += 1
-            else:
-                errors += 1
-        except Exception:
-            errors += 1
-
-    flash(f"Bulk Analysis Complete: Processed {count} leads{msg_suffix}. Errors: {errors}")
+    result = run_bulk_analysis([lead.id for lead in leads])
+
+    saved_msg = f" Shared-site fetches saved: {result.fetches_saved}." if result.fetches_saved else ""
+    flash(
+        f"Bulk Analysis Complete: Processed {result.processed} leads{msg_suffix}. Errors: {result.errors}.{saved_msg}"
+    )
     return redirect(url_for("main.index"))
 
 
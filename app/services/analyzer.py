@@ -1,46 +1,438 @@
+import codecs
+import hashlib
 import logging
-import re
+import os
 import socket
 import ssl
+import threading
 import time
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
 from urllib.parse import urlparse
 
 import requests
-from bs4 import BeautifulSoup
+
+from app.services.cache import DiskCache
+from app.services.dns_cache import resolver
+from app.services.html_features import EXTRACTOR_VERSION, HtmlFeatureExtractor
+from app.services.tech_signatures import ENGINE
 
 logger = logging.getLogger(__name__)
 
+# --- Fetch Configuration ---
+FETCH_TIMEOUT = 10  # seconds
+CHUNK_SIZE = 16384  # bytes per streamed read
+DEFAULT_MAX_BYTES = 2_000_000  # Body cap per page (override with ANALYZER_MAX_BYTES)
+REQUEST_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+}
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml", "text/plain")
 
-# --- SSL Verification Helper ---
-def check_ssl_valid(hostname, port=443, timeout=5):
+# --- URL Probing ---
+PROBE_MODES = ("race", "sequential")  # ANALYZER_PROBE_MODE
+PROBE_GRACE = 1.0  # seconds a lower-priority winner waits for preferred candidates
+
+# One fetched candidate URL: the open response plus how it was obtained
+Probe = namedtuple("Probe", ["url", "response", "ttfb", "ssl_failed", "cached"])
+
+# Conditional-request cache: validators, content hash and parsed features per URL
+page_cache = DiskCache("pages")
+# Entries written by another extractor or signature database are treated as misses
+PAGE_CACHE_VERSION = f"{EXTRACTOR_VERSION}-{ENGINE.version}"
+
+
+# --- SSL Verification Helpers ---
+def _tls_info(sock):
     """
-    Performs proper SSL certificate verification using socket connection.
-    Returns True if the certificate is valid and trusted.
+    Reads certificate issuer, expiry and protocol version from a connected TLS socket.
+    Fields that cannot be read (e.g. unverified peers expose no parsed cert) are None.
+    """
+    info = {"issuer": None, "expires_at": None, "protocol": None}
+    try:
+        info["protocol"] = sock.version()
+        cert = sock.getpeercert() or {}
+        issuer = dict(item[0] for item in cert.get("issuer", ()))
+        info["issuer"] = issuer.get("organizationName") or issuer.get("commonName")
+        if cert.get("notAfter"):
+            info["expires_at"] = datetime.fromtimestamp(
+                ssl.cert_time_to_seconds(cert["notAfter"]), timezone.utc
+            ).replace(tzinfo=None)
+    except (AttributeError, TypeError, ValueError, KeyError) as e:
+        logger.debug(f"Could not read TLS details: {e}")
+    if not isinstance(info["protocol"], str):
+        info["protocol"] = None
+    if not isinstance(info["issuer"], str):
+        info["issuer"] = None
+    return info
+
+
+def tls_info_from_response(response):
+    """
+    Returns TLS details for the connection a streamed response arrived on,
+    or None when the socket is not a live TLS socket (plain HTTP, replayed or mocked responses).
+    """
+    raw = getattr(response, "raw", None)
+    connection = getattr(raw, "connection", None)
+    sock = getattr(connection, "sock", None)
+    if not isinstance(sock, ssl.SSLSocket):
+        # Servers that close after the response detach the socket from the
+        # connection; it is still reachable through the body's file object.
+        fp = getattr(getattr(raw, "_fp", None), "fp", None)
+        sock = getattr(getattr(fp, "raw", None), "_sock", None)
+    if not isinstance(sock, ssl.SSLSocket):
+        return None
+    return _tls_info(sock)
+
+
+def get_ssl_info(hostname, port=443, timeout=5):
+    """
+    Probes a host with its own TLS handshake and full certificate verification.
+    Returns {"valid", "issuer", "expires_at", "protocol"}.
     """
+    invalid = {"valid": False, "issuer": None, "expires_at": None, "protocol": None}
+    if resolver.dead_reason(hostname, port):
+        return invalid
+
+    # Connect to a cached address when we have one; SNI still uses the hostname
+    addresses = resolver.cached_addresses(hostname)
+    target = addresses[0] if addresses else hostname
     try:
         context = ssl.create_default_context()
-        with socket.create_connection((hostname, port), timeout=timeout) as sock:
-            with context.wrap_socket(sock, server_hostname=hostname):
-                return True
+        with socket.create_connection((target, port), timeout=timeout) as sock:
+            with context.wrap_socket(sock, server_hostname=hostname) as ssock:
+                return {"valid": True, **_tls_info(ssock)}
     except ssl.SSLCertVerificationError:
-        return False
+        pass
     except Exception as e:
+        # A refusal is cached for this port only, so plain-HTTP fetches of the host still run
+        resolver.record_failure(hostname, e, port=port)
         logger.debug(f"SSL check failed for {hostname}: {e}")
-        return False
+    return invalid
 
 
-def analyze_url(url):
+def check_ssl_valid(hostname, port=443, timeout=5):
+    """
+    Performs proper SSL certificate verification using socket connection.
+    Returns True if the certificate is valid and trusted.
+    """
+    return get_ssl_info(hostname, port=port, timeout=timeout)["valid"]
+
+
+def get_max_bytes():
+    """Returns the per-page body cap, configurable via ANALYZER_MAX_BYTES."""
+    try:
+        return max(CHUNK_SIZE, int(os.environ.get("ANALYZER_MAX_BYTES", DEFAULT_MAX_BYTES)))
+    except (ValueError, TypeError):
+        return DEFAULT_MAX_BYTES
+
+
+def _get(url, verify, cached=None):
+    """
+    Issues a streaming GET: returns as soon as the status line and headers arrive.
+    With a cached entry, sends If-None-Match / If-Modified-Since validators.
+    Returns (response, ttfb_ms); the caller must read or close the body.
+    """
+    headers = dict(REQUEST_HEADERS)
+    if cached:
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+    start_time = time.time()
+    response = requests.get(url, timeout=FETCH_TIMEOUT, verify=verify, headers=headers, stream=True)
+    return response, int((time.time() - start_time) * 1000)
+
+
+def get_probe_mode():
+    """Returns how candidate URLs are tried: "race" (default) or "sequential"."""
+    mode = (os.environ.get("ANALYZER_PROBE_MODE") or "race").strip().lower()
+    return mode if mode in PROBE_MODES else "race"
+
+
+def url_port(url):
+    """The port a URL connects to, or None for scheme-less input (both schemes are probed)."""
+    if not url.startswith(("http://", "https://")):
+        return None
+    parsed = urlparse(url)
+    try:
+        return parsed.port or (443 if parsed.scheme == "https" else 80)
+    except ValueError:
+        return None
+
+
+def candidate_urls(url):
+    """
+    Lists the URLs worth trying for a lead's website, most preferred first:
+    the deep link before the site root, and for scheme-less input HTTPS before HTTP.
+    """
+    if url.startswith(("http://", "https://")):
+        scheme, rest = url.split("://", 1)
+        schemes = [scheme]
+    else:
+        schemes, rest = ["https", "http"], url
+
+    deep_links, roots = [], []
+    for scheme in schemes:
+        deep_link = f"{scheme}://{rest}"
+        parsed = urlparse(deep_link)
+        deep_links.append(deep_link)
+        if parsed.path not in ("", "/") or parsed.query:
+            roots.append(f"{scheme}://{parsed.netloc}/")
+    return deep_links + roots
+
+
+def _cached_page(url):
+    """The page-cache entry for a URL, or None when absent or from an older extractor/signature version."""
+    cached = page_cache.get(url)
+    return cached if cached and cached.get("version") == PAGE_CACHE_VERSION else None
+
+
+def _attempt(url):
+    """Fetches one candidate, retrying without verification on certificate errors."""
+    cached = _cached_page(url)
+    try:
+        response, ttfb = _get(url, verify=True, cached=cached)
+        return Probe(url, response, ttfb, False, cached)
+    except requests.exceptions.SSLError:
+        response, ttfb = _get(url, verify=False, cached=cached)
+        return Probe(url, response, ttfb, True, cached)
+
+
+def _is_good(probe):
+    return probe.response.status_code == 200 or (bool(probe.cached) and probe.response.status_code == 304)
+
+
+def _best_good(outcomes):
+    """
+    The (ssl_failed, priority) rank of the best good answer so far, or None.
+    Answers that only loaded without certificate verification rank below every
+    verified one, so a broken HTTPS (e.g. a hosting panel page) never beats a working HTTP.
+    """
+    ranks = [
+        (outcome.ssl_failed, priority)
+        for priority, outcome in outcomes.items()
+        if isinstance(outcome, Probe) and _is_good(outcome)
+    ]
+    return min(ranks, default=None)
+
+
+def _close_late(future):
+    """Closes a losing candidate's response if it arrives after the race is over."""
+    if not future.cancelled() and future.exception() is None:
+        future.result().response.close()
+
+
+def _release_when_settled(futures, release):
+    """Calls release() once every future has finished or been cancelled."""
+    remaining = [len(futures)]
+    lock = threading.Lock()
+
+    def settle(_):
+        with lock:
+            remaining[0] -= 1
+            last = remaining[0] == 0
+        if last:
+            release()
+
+    for future in futures:
+        future.add_done_callback(settle)
+
+
+def _race(candidates, host_limiter=None):
+    """
+    Fetches candidates concurrently and returns ({priority: Probe or Exception}, started).
+    Stops at the first verified good answer, giving still-pending preferred candidates
+    PROBE_GRACE seconds to beat it; an unverified one waits for every other candidate.
+    Unstarted candidates are cancelled and late responses are closed as they arrive.
+    With a host_limiter, the caller's own slot covers one fetch and the race only
+    widens into slots that are free for the host right now, held until every
+    started fetch has finished; with no free slot it falls back to _sequential.
+    """
+    width = len(candidates)
+    extra = 0
+    if host_limiter is not None:
+        # Candidates share one host (deep link/root, http/https)
+        extra = host_limiter.try_acquire(candidates[0], len(candidates) - 1)
+        if not extra:
+            outcomes = _sequential(candidates)
+            return outcomes, len(outcomes)
+        width = 1 + extra
+
+    outcomes = {}
+    executor = ThreadPoolExecutor(max_workers=width, thread_name_prefix="probe")
+    futures = {executor.submit(_attempt, url): priority for priority, url in enumerate(candidates)}
+    if extra:
+        _release_when_settled(futures, lambda: host_limiter.release(candidates[0], extra))
+    pending = set(futures)
+    deadline = None
+    try:
+        while pending:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    outcomes[futures[future]] = future.result()
+                except Exception as e:
+                    outcomes[futures[future]] = e
+
+            best = _best_good(outcomes)
+            if best is None:
+                continue
+            unverified, priority = best
+            if not any(unverified or futures[future] < priority for future in pending):
+                break
+            if unverified:
+                continue
+            deadline = deadline or time.monotonic() + PROBE_GRACE
+            if time.monotonic() >= deadline:
+                break
+    finally:
+        for future in pending:
+            future.cancel()
+            future.add_done_callback(_close_late)
+        executor.shutdown(wait=False)
+    return outcomes, sum(1 for future in futures if not future.cancelled())
+
+
+def _sequential(candidates):
+    """Tries candidates one at a time, stopping at the first verified good answer."""
+    outcomes = {}
+    for priority, url in enumerate(candidates):
+        try:
+            outcomes[priority] = _attempt(url)
+        except Exception as e:
+            outcomes[priority] = e
+            continue
+        if _is_good(outcomes[priority]) and not outcomes[priority].ssl_failed:
+            break
+    return outcomes
+
+
+def probe_url(url, mode=None, host_limiter=None):
+    """
+    Finds the best responding variant of a website URL (see candidate_urls).
+    The most preferred good answer (200, or 304 against a cached entry) wins, with
+    answers that needed the unverified TLS retry ranked below verified ones; failing that, the most preferred response of any status. If every candidate
+    raised, the most preferred candidate's exception is re-raised.
+    Pass the caller's host_limiter (with one slot held) to keep a race within the per-host cap.
+    Returns (winner Probe, number of candidates fetched); losers are closed.
+    """
+    candidates = candidate_urls(url)
+    mode = mode or get_probe_mode()
+    if len(candidates) == 1:
+        return _attempt(candidates[0]), 1
+
+    if mode == "race":
+        outcomes, tried = _race(candidates, host_limiter)
+    else:
+        outcomes = _sequential(candidates)
+        tried = len(outcomes)
+    probes = {p: outcome for p, outcome in outcomes.items() if isinstance(outcome, Probe)}
+    if not probes:
+        raise outcomes[min(outcomes)]
+
+    best = _best_good(probes)
+    winner = probes[best[1]] if best else probes[min(probes)]
+    for probe in probes.values():
+        if probe is not winner and probe.response is not winner.response:
+            probe.response.close()
+    return winner, tried
+
+
+def _is_html(response):
+    """True when the response declares (or omits) an HTML-like content type."""
+    content_type = str(response.headers.get("Content-Type") or "").lower()
+    return not content_type or content_type.startswith(HTML_CONTENT_TYPES)
+
+
+def _decoder_for(response):
+    """Returns an incremental text decoder for the response's declared charset."""
+    try:
+        return codecs.getincrementaldecoder(response.encoding or "utf-8")(errors="replace")
+    except LookupError:
+        return codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+
+def _stream_body(response, on_chunk, max_bytes, until=None):
+    """
+    Passes the response body to on_chunk piece by piece.
+    Stops at the byte cap, or as soon as until() reports nothing more is needed.
+    Returns (bytes_read, stop_reason) where stop_reason is None, "capped" or "decided".
+    """
+    bytes_read = 0
+    for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+        if not chunk:
+            continue
+        chunk = chunk[: max_bytes - bytes_read]
+        bytes_read += len(chunk)
+        on_chunk(chunk)
+        if bytes_read >= max_bytes:
+            return bytes_read, "capped"
+        if until and until():
+            return bytes_read, "decided"
+    return bytes_read, None
+
+
+def _read_features(response, cached, max_bytes):
+    """
+    Reads the body and returns (features, bytes_read, stop_reason, content_hash, reused).
+    Without a cached hash the body is parsed while it streams (with early exit).
+    With one, the capped body is hashed first and only parsed if it changed.
+    """
+    extractor = HtmlFeatureExtractor()
+    extractor.feed_headers(response.headers)
+    decoder = _decoder_for(response)
+    hasher = hashlib.sha256()
+    cached_hash = cached.get("content_hash") if cached else None
+
+    if cached_hash:
+        buffered = []
+
+        def buffer_chunk(chunk):
+            hasher.update(chunk)
+            buffered.append(chunk)
+
+        bytes_read, stop_reason = _stream_body(response, buffer_chunk, max_bytes)
+        if hasher.hexdigest() == cached_hash:
+            return cached["features"], bytes_read, stop_reason, cached_hash, True
+        for chunk in buffered:
+            extractor.feed(decoder.decode(chunk))
+    else:
+
+        def parse_chunk(chunk):
+            hasher.update(chunk)
+            extractor.feed(decoder.decode(chunk))
+
+        bytes_read, stop_reason = _stream_body(response, parse_chunk, max_bytes, until=lambda: extractor.decided)
+
+    extractor.feed(decoder.decode(b"", final=True))
+    # A partial read (early exit) is not a stable fingerprint of the page
+    content_hash = hasher.hexdigest() if stop_reason != "decided" else None
+    return extractor.close(), bytes_read, stop_reason, content_hash, False
+
+
+def _describe_tls(results):
+    """Formats captured certificate details for the analysis log."""
+    parts = [results["ssl_protocol"], results["ssl_issuer"]]
+    if results["ssl_expires_at"]:
+        parts.append(f"expires {results['ssl_expires_at']:%Y-%m-%d}")
+    parts = [p for p in parts if p]
+    return f" ({', '.join(parts)})" if parts else ""
+
+
+def analyze_url(url, host_limiter=None):
     """
     Analyzes a URL for connectivity, security, and technical heuristics.
-    Returns a dictionary of results including status codes, tech stack, and load times.
+    The body is streamed through the feature extractor under a byte cap, so
+    oversized pages and non-HTML payloads never land in memory whole.
+    Callers fetching under a HostLimiter slot pass the limiter so URL probing stays within it.
+    Returns a dictionary of results including status codes, tech stack, TTFB and load times.
     """
     if not url:
         return {"exists": False, "error": "No URL provided"}
 
-    # Ensure URL has a schema
-    if not url.startswith(("http://", "https://")):
-        url = "http://" + url
-
     results = {
         "url": url,
         "exists": False,
@@ -49,62 +441,55 @@ def analyze_url(url):
         "final_url": None,
         "mobile_viewport": False,
         "contact_info_found": False,
+        "email": None,
+        "phone": None,
         "copyright_year": None,
         "tech_stack": None,
+        "ssl_issuer": None,
+        "ssl_expires_at": None,
+        "ssl_protocol": None,
+        "ttfb": None,
         "load_time": None,
+        "links": [],
         "error": None,
         "logs": [],
     }
 
+    host = urlparse(url if "://" in url else "http://" + url).hostname
+    port = url_port(url)
+    dead_reason = resolver.dead_reason(host, port)
+    if dead_reason:
+        # Known-dead domain (NXDOMAIN) or refused port from an earlier lead: fail fast
+        results["error"] = "Connection failed (DNS or Server down)"
+        results["logs"].append(f"⚡ Skipped: {host} failed recently ({dead_reason})")
+        return results
+
+    response = None
     try:
         # --- Phase 1: Connectivity & Performance ---
         results["logs"].append(f"📡 Connecting to {url}...")
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        }
 
-        # First attempt with SSL verification enabled
-        start_time = time.time()
-        ssl_fetch_failed = False
-        try:
-            response = requests.get(url, timeout=10, verify=True, headers=headers)
-        except requests.exceptions.SSLError:
-            # Fallback: fetch without verification but note the SSL issue
-            ssl_fetch_failed = True
-            response = requests.get(url, timeout=10, verify=False, headers=headers)
+        # Deep link, site root and (for scheme-less input) both schemes are probed
+        # together; previously analyzed pages are revalidated instead of refetched
+        requested_url = url
+        probe, tried = probe_url(url, host_limiter=host_limiter)
+        response, ttfb, ssl_fetch_failed, cached = probe.response, probe.ttfb, probe.ssl_failed, probe.cached
+        url = probe.url
+        if tried > 1:
+            outcome = "won" if _is_good(probe) else f"best answer ({response.status_code})"
+            results["logs"].append(f"🏁 Probed {tried} URL variants: {url} {outcome}")
+        if ssl_fetch_failed:
             results["logs"].append("⚠️ SSL certificate verification failed during fetch")
 
-        duration = int((time.time() - start_time) * 1000)
-        results["load_time"] = duration
-
-        # Fallback Logic: If deep link is 404, attempt to scan the root domain
-        if response.status_code == 404:
-            results["logs"].append("❌ Deep link returned 404. Trying root...")
-            parsed_initial = urlparse(url)
-            root_url = f"{parsed_initial.scheme}://{parsed_initial.netloc}/"
-            if root_url != url:
-                try:
-                    root_response = requests.get(root_url, timeout=10, verify=not ssl_fetch_failed, headers=headers)
-                    if root_response.status_code == 200:
-                        results["logs"].append("✅ Root domain found.")
-                        response = root_response
-                        url = root_url
-                    else:
-                        results["logs"].append(f"❌ Root domain failed ({root_response.status_code}).")
-                except requests.exceptions.SSLError:
-                    root_response = requests.get(root_url, timeout=10, verify=False, headers=headers)
-                    if root_response.status_code == 200:
-                        results["logs"].append("✅ Root domain found (SSL issues).")
-                        response = root_response
-                        url = root_url
-                        ssl_fetch_failed = True
-                except Exception as e:
-                    logger.warning(f"Root domain fallback failed: {e}")
+        not_modified = bool(cached) and response.status_code == 304
+        status_code = 200 if not_modified else response.status_code
 
         results["exists"] = True
-        results["status_code"] = response.status_code
-        results["final_url"] = response.url
-        results["logs"].append(f"✅ Status: {response.status_code} | Speed: {duration}ms")
+        results["status_code"] = status_code
+        results["final_url"] = cached["final_url"] if not_modified else response.url
+        results["ttfb"] = ttfb
+        results["load_time"] = ttfb
+        results["logs"].append(f"✅ Status: {status_code} | TTFB: {ttfb}ms")
 
         # --- Phase 2: Security (SSL) - Proper Verification ---
         parsed = urlparse(results["final_url"])
@@ -113,64 +498,94 @@ def analyze_url(url):
                 # We already know SSL verification failed
                 results["ssl_active"] = False
                 results["logs"].append("🔴 SSL: Invalid/Self-Signed Certificate")
-            elif check_ssl_valid(parsed.netloc):
-                results["ssl_active"] = True
-                results["logs"].append("🟢 SSL: Valid Certificate")
             else:
-                results["ssl_active"] = False
-                results["logs"].append("🔴 SSL: Certificate Verification Failed")
+                # The verified fetch already completed a trusted handshake; read the
+                # certificate from that connection instead of opening a second one
+                results["ssl_active"] = True
+                tls = tls_info_from_response(response)
+                if tls:
+                    results["ssl_issuer"] = tls["issuer"]
+                    results["ssl_expires_at"] = tls["expires_at"]
+                    results["ssl_protocol"] = tls["protocol"]
+                results["logs"].append(f"🟢 SSL: Valid Certificate{_describe_tls(results)}")
         else:
             results["logs"].append("🔓 SSL: Not Secure (HTTP)")
+            # Plain HTTP fetch: probe port 443 to see if a usable certificate exists
+            tls = get_ssl_info(parsed.hostname) if parsed.hostname else None
+            if tls and tls["valid"]:
+                results["ssl_issuer"] = tls["issuer"]
+                results["ssl_expires_at"] = tls["expires_at"]
+                results["ssl_protocol"] = tls["protocol"]
+                results["logs"].append(f"ℹ️ HTTPS is available but not used{_describe_tls(results)}")
 
         # --- Phase 3: Content & Heuristics ---
-        if response.status_code == 200:
-            soup = BeautifulSoup(response.text, "html.parser")
-            html_content = response.text.lower()
+        if not_modified:
+            results["logs"].append("♻️ Not modified (304), reusing cached analysis")
+            features = cached["features"]
+        elif status_code == 200:
+            if not _is_html(response):
+                results["logs"].append(f"📦 Non-HTML content ({response.headers.get('Content-Type')}), body skipped")
+                return results
+
+            # Headers first, then a single bounded streaming pass over the body
+            download_start = time.time()
+            max_bytes = get_max_bytes()
+            features, bytes_read, stop_reason, content_hash, reused = _read_features(response, cached, max_bytes)
+            results["load_time"] = ttfb + int((time.time() - download_start) * 1000)
+            results["logs"].append(f"⏱️ Load: {results['load_time']}ms ({bytes_read // 1024} KB read)")
+            if stop_reason == "capped":
+                results["logs"].append(f"✂️ Body capped at {max_bytes // 1024} KB")
+            elif stop_reason == "decided":
+                results["logs"].append("⏩ All heuristics decided, stopped reading early")
+            if reused:
+                results["logs"].append("♻️ Content unchanged since last scan, reusing cached analysis")
+
+            entry = {
+                "final_url": results["final_url"],
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "content_hash": content_hash,
+                "features": features,
+                "version": PAGE_CACHE_VERSION,
+            }
+            for key in {requested_url, url, results["final_url"]}:
+                page_cache.set(key, entry)
+        else:
+            features = None
 
+        if features:
             # Tech Stack Detection
             results["logs"].append("🔍 Analyzing Tech Stack...")
-            stack = []
-            if "wp-content" in html_content:
-                stack.append("WordPress")
-            if "wix.com" in html_content or "_wix_" in html_content:
-                stack.append("Wix")
-            if "squarespace" in html_content:
-                stack.append("Squarespace")
-            if "shopify" in html_content:
-                stack.append("Shopify")
-            if "go daddy" in html_content or "godaddy" in html_content:
-                stack.append("GoDaddy")
-
+            stack = features["tech_stack"]
             results["tech_stack"] = ", ".join(stack) if stack else "Custom/Other"
             results["logs"].append(f"🛠️ Tech: {results['tech_stack']}")
 
             # Mobile Responsiveness
-            viewport = soup.find("meta", attrs={"name": "viewport"})
-            if viewport and "width=device-width" in str(viewport.get("content", "")).lower():
+            if features["mobile_viewport"]:
                 results["mobile_viewport"] = True
                 results["logs"].append("📱 Mobile: Optimized")
             else:
                 results["logs"].append("📵 Mobile: Not Optimized")
 
             # Contact Information
-            text_content = soup.get_text()
-            email_pattern = r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}"
-            phone_pattern = r"\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}"
-
-            if re.search(email_pattern, text_content) or re.search(phone_pattern, text_content):
+            if features["contact_info_found"]:
                 results["contact_info_found"] = True
+                results["email"] = features.get("email")
+                results["phone"] = features.get("phone")
                 results["logs"].append("✉️ Contact: Found on homepage")
             else:
                 results["logs"].append("❓ Contact: Not found in text")
 
             # Copyright / Freshness
-            footer_text = text_content[-2000:]
-            match = re.search(r"(?:Copyright|©).*?(\d{4})", footer_text, re.IGNORECASE | re.DOTALL)
-            if match:
-                results["copyright_year"] = int(match.group(1))
+            if features["copyright_year"]:
+                results["copyright_year"] = features["copyright_year"]
                 results["logs"].append(f"📅 Copyright: {results['copyright_year']}")
 
-    except requests.exceptions.ConnectionError:
+            # Outbound links, for the broken-link checker stage
+            results["links"] = features.get("links", [])
+
+    except requests.exceptions.ConnectionError as e:
+        resolver.record_failure(host, e, port=port)
         results["error"] = "Connection failed (DNS or Server down)"
         results["logs"].append(f"❌ {results['error']}")
     except requests.exceptions.Timeout:
@@ -179,5 +594,8 @@ def analyze_url(url):
     except Exception as e:
         results["error"] = str(e)
         results["logs"].append(f"💥 Unexpected error: {str(e)}")
+    finally:
+        if response is not None:
+            response.close()
 
     return results
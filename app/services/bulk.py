@@ -0,0 +1,171 @@
+import logging
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlparse
+
+from app.models.config import AppConfig
+from app.models.lead import Lead
+from app.services.analyzer import analyze_url
+from app.services.dns_cache import resolver
+from app.services.google_places import get_place_details
+from app.services.host_limits import HostLimiter, hostname
+from app.services.pipeline import apply_enrichment, run_site_stages
+from app.services.settings import env_flag, env_number
+
+logger = logging.getLogger(__name__)
+
+# --- Concurrency Defaults ---
+DEFAULT_MAX_WORKERS = 8  # Global cap on in-flight leads
+DEFAULT_PER_HOST_LIMIT = 2  # Politeness cap per website host
+
+BulkResult = namedtuple("BulkResult", ["processed", "errors", "fetches_saved"])
+
+
+def site_key(url):
+    """
+    Normalizes a website URL for de-duplication: scheme, host case, default
+    ports, trailing slashes and fragments are ignored, e.g.
+    "HTTPS://Joes.com/" and "joes.com" share one key.
+    """
+    url = url.strip()
+    if not url.lower().startswith(("http://", "https://")):
+        url = "http://" + url
+    parsed = urlparse(url)
+    host = (parsed.hostname or "").lower()
+    if parsed.port and parsed.port not in (80, 443):
+        host = f"{host}:{parsed.port}"
+    path = parsed.path.rstrip("/") or "/"
+    return f"{host}{path}" + (f"?{parsed.query}" if parsed.query else "")
+
+
+def _fetch_details(snapshot):
+    """Stage 1 worker: Google Details for one lead."""
+    from app import db_session
+
+    try:
+        # Usage is only counted here; the writer thread commits it
+        with AppConfig.deferred_flush():
+            return get_place_details(snapshot["place_id"])
+    finally:
+        # Budget checks read through a thread-local session; release it with the task
+        db_session.remove()
+
+
+def _analyze(website_url, host_limiter):
+    """Stage 3 worker: website scan under the per-host cap, then the post-fetch stages."""
+    with host_limiter.limit(website_url):
+        analysis = analyze_url(website_url, host_limiter=host_limiter)
+    # Crawled pages and checked links take their own slots, one per fetch, from the same limiter
+    return run_site_stages(analysis, host_limiter=host_limiter)
+
+
+def _fan_out(site, analysis):
+    """Yields one (lead_id, details, analysis) per lead sharing a scanned site."""
+    shared = len(site["leads"]) - 1
+    if shared and analysis:
+        # Copy so each lead's log records the reuse without mutating the shared result
+        note = f"♻️ Shared scan of {site['url']} with {shared} other lead(s)"
+        analysis = {**analysis, "logs": [*analysis.get("logs", []), note]}
+    for lead_id, details in site["leads"]:
+        yield lead_id, details, analysis
+
+
+def run_bulk_analysis(lead_ids, max_workers=None, per_host=None, preresolve=None):
+    """
+    Analyzes many leads concurrently, in three stages:
+    1. Google Details for every lead (to learn each website URL).
+    2. Optional DNS pre-resolution of every website host, so dead domains are
+       negative-cached before the scans start (BULK_PRERESOLVE_DNS).
+    3. Website scans, one per unique site (see site_key), fanned out to every
+       lead sharing it; every DB write, Google usage counts included, happens
+       on the calling thread, one lead at a time.
+    Returns a BulkResult(processed, errors, fetches_saved).
+    """
+    from app import db_session
+
+    max_workers = max_workers or env_number("BULK_MAX_WORKERS", DEFAULT_MAX_WORKERS, minimum=1)
+    per_host = per_host or env_number("BULK_PER_HOST_LIMIT", DEFAULT_PER_HOST_LIMIT, minimum=1)
+    if preresolve is None:
+        preresolve = env_flag("BULK_PRERESOLVE_DNS", True)
+    host_limiter = HostLimiter(per_host)
+
+    # Snapshot the inputs up front so workers never share ORM objects
+    snapshots = []
+    for lead_id in lead_ids:
+        lead = Lead.query.get(lead_id)
+        if lead:
+            snapshots.append({"id": lead.id, "place_id": lead.place_id, "website_url": lead.website_url})
+
+    count = 0
+    errors = len(lead_ids) - len(snapshots)
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bulk-analyze") as executor:
+        # --- Stage 1: Contact Details ---
+        jobs = []  # (lead_id, details, website_url)
+        futures = {executor.submit(_fetch_details, snap): snap for snap in snapshots}
+        for future in as_completed(futures):
+            snap = futures[future]
+            try:
+                details = future.result()
+            except Exception as e:
+                logger.error(f"Bulk details fetch failed for lead {snap['id']}: {e}")
+                errors += 1
+                continue
+            website_url = details.get("website", snap["website_url"]) if details else snap["website_url"]
+            jobs.append((snap["id"], details, website_url))
+        AppConfig.flush_usage()
+
+        # --- Stage 2: DNS Pre-resolution ---
+        if preresolve:
+            hosts = {hostname(url) for _, _, url in jobs if url}
+            resolved, dead = resolver.prefetch(hosts)
+            logger.info(f"Pre-resolved {resolved}/{len(hosts)} hosts ({len(dead)} dead)")
+
+        # --- Stage 3: Website Analysis + Serialized Writer ---
+        # Multi-location businesses often share one website: scan each site once
+        sites = {}  # site_key -> {"url": str, "leads": [(lead_id, details)]}
+        finished = []  # (lead_id, details, analysis) ready to write
+        for lead_id, details, website_url in jobs:
+            if website_url:
+                site = sites.setdefault(site_key(website_url), {"url": website_url, "leads": []})
+                site["leads"].append((lead_id, details))
+            else:
+                finished.append((lead_id, details, None))
+        fetches_saved = sum(len(site["leads"]) - 1 for site in sites.values())
+
+        futures = {executor.submit(_analyze, site["url"], host_limiter): site for site in sites.values()}
+        pending = as_completed(list(futures))
+        while finished or futures:
+            if not finished:
+                future = next(pending)
+                site = futures.pop(future)
+                try:
+                    analysis = future.result()
+                except Exception as e:
+                    logger.error(f"Bulk analysis worker failed for {site['url']}: {e}")
+                    errors += len(site["leads"])
+                    continue
+                finished.extend(_fan_out(site, analysis))
+                continue
+
+            lead_id, details, analysis = finished.pop()
+            lead = Lead.query.get(lead_id)
+            if not lead:
+                errors += 1
+                continue
+
+            apply_enrichment(lead, details, analysis)
+            try:
+                db_session.commit()
+                count += 1
+            except Exception as e:
+                logger.error(f"Failed to save analysis for lead {lead_id}: {e}")
+                db_session.rollback()
+                errors += 1
+
+    AppConfig.flush_usage()
+    logger.info(
+        f"Bulk analysis finished: {count} saved, {errors} errors, {fetches_saved} duplicate fetches saved "
+        f"({max_workers} workers, {per_host}/host)"
+    )
+    return BulkResult(count, errors, fetches_saved)
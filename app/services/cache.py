@@ -0,0 +1,71 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = "cache"
+
+
+def get_cache_root():
+    """Returns the cache root directory, configurable via CACHE_DIR."""
+    return Path(os.environ.get("CACHE_DIR") or DEFAULT_CACHE_DIR)
+
+
+class DiskCache:
+    """
+    Small persistent key-value cache: one JSON file per key under CACHE_DIR/<namespace>/.
+    Writes are atomic (temp file + rename), so concurrent workers never read torn entries.
+    Entries older than `ttl` seconds (when set) are treated as missing.
+    """
+
+    def __init__(self, namespace, ttl=None):
+        self.namespace = namespace
+        self.ttl = ttl
+
+    def _path(self, key):
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return get_cache_root() / self.namespace / digest[:2] / f"{digest}.json"
+
+    def get_entry(self, key):
+        """Returns {"stored_at", "value"} for a key, or None if absent or unreadable."""
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Discarding unreadable cache entry {path}: {e}")
+            return None
+
+    def get(self, key, max_age=None):
+        """Returns the cached value if present and younger than max_age (or the cache TTL)."""
+        entry = self.get_entry(key)
+        if not entry:
+            return None
+        max_age = self.ttl if max_age is None else max_age
+        if max_age is not None and time.time() - entry.get("stored_at", 0) > max_age:
+            return None
+        return entry.get("value")
+
+    def set(self, key, value):
+        """Stores a JSON-serializable value under key."""
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=path.parent, delete=False) as f:
+                json.dump({"key": key, "stored_at": time.time(), "value": value}, f, default=str)
+            os.replace(f.name, path)
+        except (OSError, TypeError) as e:
+            logger.warning(f"Failed to write cache entry for '{key}': {e}")
+
+    def delete(self, key):
+        try:
+            self._path(key).unlink()
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,172 @@
+import codecs
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from urllib.parse import urlparse
+
+import requests
+
+from app.services.analyzer import CHUNK_SIZE, REQUEST_HEADERS
+from app.services.host_limits import HostLimiter
+from app.services.html_features import HtmlFeatureExtractor
+from app.services.link_checker import normalize_links
+from app.services.settings import env_flag, env_number, new_session
+
+logger = logging.getLogger(__name__)
+
+# --- Budget Defaults (per analyzed site) ---
+DEFAULT_MAX_PAGES = 3  # CONTACT_CRAWL_MAX_PAGES
+DEFAULT_BUDGET_SECONDS = 2.5  # CONTACT_CRAWL_BUDGET: wall-clock cap for the whole stage
+DEFAULT_PER_HOST_LIMIT = 2  # CONTACT_CRAWL_PER_HOST
+PAGE_TIMEOUT = 3  # seconds per page, further clipped to the remaining budget
+PAGE_MAX_BYTES = 500_000  # Contact details sit near the top or in the footer of small pages
+
+# Path fragments that mark likely contact pages, best first
+CONTACT_KEYWORDS = ("contact", "get-in-touch", "reach", "about", "location", "find-us", "visit", "hours")
+
+
+def contact_crawl_enabled():
+    return env_flag("CONTACT_CRAWL_ENABLED", True)
+
+
+def _site_host(url):
+    host = (urlparse(url).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+def contact_page_candidates(page_url, hrefs, max_pages):
+    """
+    Picks up to max_pages same-site links whose path looks like a contact or
+    about page, ordered by keyword priority (contact pages before about pages).
+    """
+    site = _site_host(page_url)
+    ranked = []
+    for url in normalize_links(page_url, hrefs, max_links=len(hrefs)):
+        if _site_host(url) != site:
+            continue
+        path = urlparse(url).path.lower()
+        rank = next((i for i, keyword in enumerate(CONTACT_KEYWORDS) if keyword in path), None)
+        if rank is not None:
+            ranked.append((rank, url))
+    ranked.sort(key=lambda item: item[0])  # Stable: document order within a keyword
+    return [url for _, url in ranked[:max_pages]]
+
+
+def _scan_page(session, url, host_limiter, deadline):
+    """
+    Fetches one page under the per-host cap. Returns its features, or None if
+    it could not be read (including no free host slot before the deadline).
+    """
+    try:
+        with host_limiter.limit(url, timeout=max(0.0, deadline - time.monotonic())):
+            return _read_page(session, url, deadline)
+    except TimeoutError:
+        return None
+
+
+def _read_page(session, url, deadline):
+    """
+    Streams one page through the feature extractor, stopping at the byte cap,
+    the deadline, or as soon as both an email and a phone number are found.
+    Returns the page's features, or None if it could not be read.
+    """
+    timeout = min(PAGE_TIMEOUT, deadline - time.monotonic())
+    if timeout <= 0:
+        return None
+    try:
+        response = session.get(url, timeout=timeout, stream=True)
+    except requests.exceptions.RequestException as e:
+        logger.debug(f"Contact crawl fetch failed for {url}: {e}")
+        return None
+
+    try:
+        if response.status_code != 200:
+            return None
+        extractor = HtmlFeatureExtractor()
+        # Emails and phone numbers are ASCII, so a lenient UTF-8 decode is enough here
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        bytes_read = 0
+        for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+            extractor.feed(decoder.decode(chunk))
+            bytes_read += len(chunk)
+            if extractor.contact_complete or bytes_read >= PAGE_MAX_BYTES or time.monotonic() >= deadline:
+                break
+        return extractor.close()
+    except requests.exceptions.RequestException as e:
+        logger.debug(f"Contact crawl read failed for {url}: {e}")
+        return None
+    finally:
+        response.close()
+
+
+def crawl_contact_pages(page_url, hrefs, max_pages=None, budget=None, per_host=None, host_limiter=None):
+    """
+    Fetches likely contact/about pages concurrently within a fixed budget.
+    Returns {"pages": [crawled urls], "email": str|None, "phone": str|None, "sources": {field: url}}.
+    Contact pages are merged in priority order, so a /contact hit beats an /about hit.
+    Fetches run under host_limiter when one is shared by the caller (bulk runs),
+    otherwise under a per-call cap of per_host (CONTACT_CRAWL_PER_HOST).
+    """
+    max_pages = env_number("CONTACT_CRAWL_MAX_PAGES", DEFAULT_MAX_PAGES, minimum=0) if max_pages is None else max_pages
+    budget = env_number("CONTACT_CRAWL_BUDGET", DEFAULT_BUDGET_SECONDS, float, minimum=0) if budget is None else budget
+    per_host = per_host or env_number("CONTACT_CRAWL_PER_HOST", DEFAULT_PER_HOST_LIMIT, minimum=1)
+
+    report = {"pages": [], "email": None, "phone": None, "sources": {}}
+    candidates = contact_page_candidates(page_url, hrefs, max_pages)
+    if not candidates:
+        return report
+
+    deadline = time.monotonic() + budget
+    host_limiter = host_limiter or HostLimiter(per_host)
+    # Keep-alive session shared by every page of one crawl
+    session = new_session(REQUEST_HEADERS, pool_maxsize=DEFAULT_MAX_PAGES)
+    executor = ThreadPoolExecutor(max_workers=len(candidates), thread_name_prefix="contact-crawl")
+    futures = []
+    try:
+        futures = [executor.submit(_scan_page, session, url, host_limiter, deadline) for url in candidates]
+        done, _ = wait(futures, timeout=budget)
+        for url, future in zip(candidates, futures):
+            features = future.result() if future in done else None
+            if not features:
+                continue
+            report["pages"].append(url)
+            for field in ("email", "phone"):
+                if report[field] is None and features[field]:
+                    report[field] = features[field]
+                    report["sources"][field] = url
+    finally:
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=False)
+        session.close()
+    return report
+
+
+def run_contact_crawl(analysis, host_limiter=None):
+    """
+    Contact crawl stage: runs after analyze_url and, when the homepage lacks an
+    email or phone number, looks for them on linked contact/about pages.
+    Merges hits into contact_info_found, email and phone (plus log lines).
+    """
+    if not analysis or analysis.get("status_code") != 200 or not contact_crawl_enabled():
+        return analysis
+    if analysis.get("email") and analysis.get("phone"):
+        return analysis
+
+    start = time.monotonic()
+    page_url = analysis.get("final_url") or analysis.get("url")
+    report = crawl_contact_pages(page_url, analysis.get("links") or [], host_limiter=host_limiter)
+    if not report["pages"]:
+        return analysis
+
+    found = [field for field in ("email", "phone") if report[field] and not analysis.get(field)]
+    for field in found:
+        analysis[field] = report[field]
+    elapsed = int((time.monotonic() - start) * 1000)
+    if found:
+        analysis["contact_info_found"] = True
+        where = ", ".join(f"{field} on {report['sources'][field]}" for field in found)
+        analysis["logs"].append(f"📇 Contact: found {where} ({elapsed}ms)")
+    else:
+        analysis["logs"].append(f"📇 Contact: nothing new on {len(report['pages'])} linked page(s) ({elapsed}ms)")
+    return analysis
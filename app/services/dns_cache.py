@@ -0,0 +1,157 @@
+import logging
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.services.settings import env_number
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 300  # seconds a successful lookup is reused
+DEFAULT_NEGATIVE_TTL = 900  # seconds a dead domain keeps failing fast
+
+# Substrings that identify permanent-looking failures in wrapped requests/urllib3 errors
+NXDOMAIN_MARKERS = (
+    "name or service not known",
+    "nodename nor servname",
+    "getaddrinfo failed",
+    "no address associated",
+)
+REFUSED_MARKERS = ("connection refused", "errno 111", "errno 61", "actively refused")
+# getaddrinfo codes meaning "this name does not exist" (EAI_AGAIN and friends are transient)
+NXDOMAIN_CODES = {code for code in (socket.EAI_NONAME, getattr(socket, "EAI_NODATA", None)) if code is not None}
+
+
+def classify_failure(error):
+    """
+    Maps a connection error to a negative-cache reason ("nxdomain" or "refused").
+    Returns None for transient failures (timeouts, resets) that should be retried.
+    """
+    if isinstance(error, socket.gaierror):
+        return "nxdomain" if error.errno in NXDOMAIN_CODES else None
+    if isinstance(error, ConnectionRefusedError):
+        return "refused"
+    message = str(error).lower()
+    if any(marker in message for marker in NXDOMAIN_MARKERS):
+        return "nxdomain"
+    if any(marker in message for marker in REFUSED_MARKERS):
+        return "refused"
+    return None
+
+
+class ResolverCache:
+    """
+    Process-wide hostname cache shared by every analysis thread.
+    Successful lookups are kept for `ttl` seconds; hosts that returned NXDOMAIN
+    are remembered for `negative_ttl` so later leads on the same dead domain fail
+    immediately instead of waiting on the network. Refused connections are kept
+    per host:port, since a closed port 443 says nothing about port 80.
+    """
+
+    def __init__(self, ttl=None, negative_ttl=None):
+        self.ttl = env_number("DNS_CACHE_TTL", DEFAULT_TTL, minimum=0) if ttl is None else ttl
+        self.negative_ttl = (
+            env_number("DNS_NEGATIVE_TTL", DEFAULT_NEGATIVE_TTL, minimum=0) if negative_ttl is None else negative_ttl
+        )
+        self._lock = threading.Lock()
+        self._positive = {}  # host -> (expires_at, [addresses])
+        self._negative = {}  # host (nxdomain) or "host:port" (refused) -> (expires_at, reason)
+
+    def _live(self, table, host):
+        with self._lock:
+            entry = table.get(host)
+            if entry and entry[0] > time.time():
+                return entry[1]
+            table.pop(host, None)
+            return None
+
+    def dead_reason(self, host, port=None):
+        """
+        Returns why a host is known dead, or None: "nxdomain" for the whole host,
+        "refused" only when `port` is given and that port refused recently.
+        """
+        host = (host or "").lower()
+        reason = self._live(self._negative, host)
+        if reason is None and port:
+            reason = self._live(self._negative, f"{host}:{port}")
+        return reason
+
+    def cached_addresses(self, host):
+        """Returns cached addresses for a host without touching the network."""
+        return self._live(self._positive, (host or "").lower())
+
+    def mark_dead(self, host, reason, port=None):
+        """Negative-caches a host, or only one of its ports when `port` is given."""
+        if host and reason:
+            key = f"{host.lower()}:{port}" if port else host.lower()
+            with self._lock:
+                self._negative[key] = (time.time() + self.negative_ttl, reason)
+
+    def record_failure(self, host, error, port=None):
+        """
+        Negative-caches a failure if it looks permanent and returns its reason.
+        NXDOMAIN condemns the hostname; a refusal is cached for host:port, and
+        not at all when the port is unknown.
+        """
+        reason = classify_failure(error)
+        if reason == "nxdomain":
+            self.mark_dead(host, reason)
+            logger.debug(f"Negative-cached {host}: {reason}")
+        elif reason == "refused" and port:
+            self.mark_dead(host, reason, port=port)
+            logger.debug(f"Negative-cached {host}:{port}: {reason}")
+        return reason
+
+    def resolve(self, host, port=443):
+        """
+        Resolves a host through the cache. Raises socket.gaierror for dead hosts,
+        including ones already in the negative cache.
+        """
+        host = (host or "").lower()
+        reason = self.dead_reason(host)
+        if reason:
+            raise socket.gaierror(f"{host} is negative-cached ({reason})")
+        addresses = self.cached_addresses(host)
+        if addresses:
+            return addresses
+        try:
+            infos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        except socket.gaierror as e:
+            self.record_failure(host, e)
+            raise
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        with self._lock:
+            self._positive[host] = (time.time() + self.ttl, addresses)
+        return addresses
+
+    def prefetch(self, hosts, max_workers=16):
+        """
+        Resolves many hostnames concurrently ahead of a bulk run, so dead
+        domains are negative-cached before any fetch is attempted.
+        Returns (resolved_count, dead_hosts).
+        """
+        hosts = sorted({h.lower() for h in hosts if h})
+        if not hosts:
+            return 0, []
+
+        def lookup(host):
+            try:
+                self.resolve(host)
+                return True
+            except (OSError, UnicodeError):
+                return False
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(hosts)), thread_name_prefix="dns") as executor:
+            outcomes = list(executor.map(lookup, hosts))
+        dead = [host for host, ok in zip(hosts, outcomes) if not ok and self.dead_reason(host)]
+        return sum(outcomes), dead
+
+    def clear(self):
+        with self._lock:
+            self._positive.clear()
+            self._negative.clear()
+
+
+# Shared by analyzer, SSL probe and bulk pre-resolution
+resolver = ResolverCache()
@@ -0,0 +1,63 @@
+import math
+from collections import namedtuple
+
+EARTH_RADIUS_M = 6_371_000
+
+# A search cell: a square of half-side `half_side` meters around (lat, lng),
+# queried as the circle of `radius` meters that covers it. The root cell is
+# the requested circle itself.
+Cell = namedtuple("Cell", ["lat", "lng", "radius", "half_side", "depth"])
+
+
+def distance_m(lat1, lng1, lat2, lng2):
+    """Great-circle distance in meters (haversine)."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lng2 - lng1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(a))
+
+
+def offset(lat, lng, north_m, east_m):
+    """Moves a coordinate by the given meters north and east (flat-earth approximation, fine at city scale)."""
+    d_lat = math.degrees(north_m / EARTH_RADIUS_M)
+    d_lng = math.degrees(east_m / (EARTH_RADIUS_M * math.cos(math.radians(lat))))
+    return lat + d_lat, lng + d_lng
+
+
+def _local_m(origin, lat, lng):
+    """(north, east) meters of a coordinate from origin, in the same approximation as offset()."""
+    north = math.radians(lat - origin.lat) * EARTH_RADIUS_M
+    east = math.radians(lng - origin.lng) * EARTH_RADIUS_M * math.cos(math.radians(origin.lat))
+    return north, east
+
+
+def overlaps(cell, origin):
+    """Whether a cell's square intersects the origin search circle."""
+    north, east = _local_m(origin, cell.lat, cell.lng)
+    # Distance from the circle center to the nearest point of the square
+    dn = max(abs(north) - cell.half_side, 0)
+    de = max(abs(east) - cell.half_side, 0)
+    return math.hypot(dn, de) < origin.radius
+
+
+def root_cell(lat, lng, radius):
+    return Cell(lat, lng, radius, radius, 0)
+
+
+def subdivide(cell, origin, min_radius):
+    """
+    Splits a cell into four quadrant cells, keeping only those that overlap the
+    origin search circle. Returns [] once children would drop below min_radius.
+    """
+    half = cell.half_side / 2
+    radius = half * math.sqrt(2)
+    if radius < min_radius:
+        return []
+    children = []
+    for north, east in ((half, -half), (half, half), (-half, -half), (-half, half)):
+        lat, lng = offset(cell.lat, cell.lng, north, east)
+        child = Cell(lat, lng, radius, half, cell.depth + 1)
+        if overlaps(child, origin):
+            children.append(child)
+    return children
@@ -1,13 +1,61 @@
 import logging
 import os
+import queue
+import random
+import threading
 import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 
 import requests
 
 from app.models.config import AppConfig
+from app.models.scan_checkpoint import ScanCheckpoint
+from app.services.cache import DiskCache
+from app.services.geo_tiles import distance_m, root_cell, subdivide
+from app.services.place_filter import FILTER
+from app.services.quota import api_limiter, plan_scan, remaining
+from app.services.rate_limit import CallBudget
+from app.services.settings import env_flag, env_number, new_session
 
 logger = logging.getLogger(__name__)
 
+# --- Scan Concurrency ---
+DEFAULT_SEARCH_WORKERS = 6  # Categories scanned at once (OMNI_SEARCH_WORKERS)
+PAGE_TOKEN_DELAY = 2  # seconds before a next_page_token becomes valid
+
+# --- HTTP Client ---
+DEFAULT_BASE_URL = "https://maps.googleapis.com"  # GOOGLE_PLACES_BASE_URL, e.g. a local mock_places server
+CONNECT_TIMEOUT = 5  # seconds
+DEFAULT_READ_TIMEOUT = 15  # seconds (GOOGLE_PLACES_TIMEOUT)
+DEFAULT_RETRIES = 3  # extra attempts on retryable failures (GOOGLE_PLACES_RETRIES)
+BACKOFF_BASE = 0.5  # seconds; attempt n waits a random time up to BACKOFF_BASE * 2**n
+BACKOFF_CAP = 8  # seconds
+POOL_SIZE = 16  # Scan workers plus bulk Details workers
+RETRY_HTTP_STATUSES = {429, 500, 502, 503, 504}
+RETRY_API_STATUSES = {"OVER_QUERY_LIMIT", "UNKNOWN_ERROR"}
+
+# --- Nearby Search Response Cache ---
+DEFAULT_NEARBY_CACHE_TTL = 86400  # seconds (NEARBY_CACHE_TTL); 0 disables the cache
+NEARBY_CACHE_PRECISION = 4  # lat/lng decimals in the cache key (~11m)
+
+nearby_cache = DiskCache("nearby")
+
+# --- Adaptive Tiling ---
+NEARBY_RESULT_CAP = 60  # Google returns at most 3 pages of 20 per search; reaching it means results were cut off
+DEFAULT_TILE_MIN_RADIUS = 250  # meters (NEARBY_TILE_MIN_RADIUS): smallest cell searched
+DEFAULT_MAX_TILES = 64  # cells per category (NEARBY_TILING_MAX_TILES), caps the cost of one dense category
+
+# --- Resumable Scans ---
+DEFAULT_SCAN_RESUME_MAX_AGE = 86400  # seconds an interrupted scan stays resumable (SCAN_RESUME_MAX_AGE)
+DEFAULT_CHECKPOINT_INTERVAL = 5  # seconds between progress saves during a scan (SCAN_CHECKPOINT_INTERVAL)
+
+# --- Place Details Cache ---
+DEFAULT_DETAILS_MAX_AGE = 7 * 86400  # seconds a Details response stays fresh (PLACE_DETAILS_MAX_AGE); 0 disables
+
+details_cache = DiskCache("details")
+
 # Default high-value trade categories for Omni-Search
 # Expanded list covering 95% of local service businesses
 DEFAULT_OMNI_CATEGORIES = [
@@ -116,11 +164,250 @@ def get_omni_categories():
     return DEFAULT_OMNI_CATEGORIES
 
 
-def search_nearby(lat, lng, radius, keyword="business"):
+def _count(key):
+    """Bumps a usage counter (write-behind) without letting a DB hiccup break the scan."""
+    try:
+        AppConfig.record_usage(key)
+    except Exception as e:
+        logger.warning(f"Failed to increment API counter: {e}")
+
+
+class LatencyStats:
+    """Thread-safe per-endpoint call timings (count, total and max seconds)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def record(self, endpoint, seconds):
+        with self._lock:
+            calls, total, worst = self._stats.get(endpoint, (0, 0.0, 0.0))
+            self._stats[endpoint] = (calls + 1, total + seconds, max(worst, seconds))
+
+    def summary(self):
+        """{endpoint: {"calls", "avg_ms", "max_ms"}} for every endpoint called so far."""
+        with self._lock:
+            return {
+                endpoint: {"calls": calls, "avg_ms": round(total * 1000 / calls), "max_ms": round(worst * 1000)}
+                for endpoint, (calls, total, worst) in self._stats.items()
+            }
+
+
+# Keep-alive session shared by every Google Places call in the process
+_session = new_session(pool_connections=2, pool_maxsize=POOL_SIZE, schemes=("https://",))
+latency = LatencyStats()  # Process-wide Google-side latency per endpoint
+
+
+# Shared settings of one scan, handed to every worker
+ScanContext = namedtuple(
+    "ScanContext", ["api_key", "url", "limiter", "budget", "events", "stop", "cache_ttl", "refresh", "stats"]
+)
+
+
+def places_url(endpoint):
+    """Places API endpoint URL under GOOGLE_PLACES_BASE_URL."""
+    base = (os.environ.get("GOOGLE_PLACES_BASE_URL") or DEFAULT_BASE_URL).rstrip("/")
+    return f"{base}/maps/api/place/{endpoint}/json"
+
+
+def _backoff(attempt):
+    """Exponential backoff with full jitter, so concurrent workers do not retry in lockstep."""
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2**attempt))
+
+
+def _google_get(endpoint, url, params, before_attempt=None, wait=time.sleep, stats=None, retry_statuses=()):
+    """
+    GETs a Google Places endpoint on the pooled session and returns the decoded JSON.
+    Retries connection errors, timeouts, retryable HTTP statuses and retryable API
+    statuses (plus `retry_statuses`) up to GOOGLE_PLACES_RETRIES times with backoff.
+    before_attempt() runs before every attempt (rate limit, budget, usage count) and
+    may return False to give up; the last response is then returned (or None).
+    Each attempt is timed into `latency` and, if given, the per-job `stats`.
+    """
+    retries = env_number("GOOGLE_PLACES_RETRIES", DEFAULT_RETRIES, minimum=0)
+    timeout = (CONNECT_TIMEOUT, env_number("GOOGLE_PLACES_TIMEOUT", DEFAULT_READ_TIMEOUT, float))
+    retryable = RETRY_API_STATUSES | set(retry_statuses)
+    data = None
+    for attempt in range(retries + 1):
+        if attempt:
+            wait(_backoff(attempt - 1))
+        if before_attempt and before_attempt() is False:
+            return data
+
+        start = time.perf_counter()
+        try:
+            response = _session.get(url, params=params, timeout=timeout)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            if attempt == retries:
+                raise
+            logger.warning(f"Google {endpoint} request failed ({e}); retrying")
+            continue
+        finally:
+            elapsed = time.perf_counter() - start
+            latency.record(endpoint, elapsed)
+            if stats is not None:
+                stats.record(endpoint, elapsed)
+        logger.debug(f"Google {endpoint}: HTTP {response.status_code} in {elapsed * 1000:.0f}ms")
+
+        if response.status_code in RETRY_HTTP_STATUSES and attempt < retries:
+            logger.warning(f"Google {endpoint} returned HTTP {response.status_code}; retrying")
+            continue
+        response.raise_for_status()
+        data = response.json()
+        if data.get("status") in retryable and attempt < retries:
+            logger.warning(f"Google {endpoint} returned {data.get('status')}; retrying")
+            continue
+        return data
+    return data
+
+
+def nearby_cache_key(lat, lng, radius, keyword, page):
+    """Cache key for one Nearby Search page; nearby coordinates share entries."""
+    return (
+        f"{round(float(lat), NEARBY_CACHE_PRECISION)},{round(float(lng), NEARBY_CACHE_PRECISION)}"
+        f"|{int(radius)}|{keyword.strip().lower()}|{page}"
+    )
+
+
+def _cached_pages(cache_key, ttl):
+    """Yields the cached pages of one category in order, stopping at the first gap."""
+    page = 0
+    while True:
+        data = nearby_cache.get(cache_key(page), max_age=ttl)
+        if data is None:
+            return
+        yield data
+        if "next_page_token" not in data:
+            return
+        page += 1
+
+
+def _scan_category(ctx, kw, cell, resume=None):
+    """
+    Worker: pages through one category's Nearby Search results for one search cell.
+    Never touches the DB; reports each API call, cache hit and ("page", kw, cell, page_index, data)
+    to the consumer via `ctx.events`, then ("done", kw, cell, raw_result_count, finished), where
+    finished means the whole page chain was read (so the consumer can checkpoint the category
+    and tell a saturated cell).
+    Every live call (retries included) is claimed from the scan's budget first;
+    once it is spent the worker reports ("budget", kw) and stops.
+    The page-token delay only blocks this worker, so other categories keep going.
+    With a cache TTL, pages younger than it are replayed first (unless refreshing)
+    and live pages are stored; a chain that is only partly cached is re-fetched
+    from page 0, since stored page tokens expire.
+    resume ({"token", "page"} from a checkpoint) continues a chain at its saved
+    next_page_token, restarting from page 0 if the token has expired.
+    """
+    events, stop = ctx.events, ctx.stop
+    radius = int(round(cell.radius))
+    params = {"location": f"{cell.lat},{cell.lng}", "radius": radius, "keyword": kw, "key": ctx.api_key}
+    cache_key = partial(nearby_cache_key, cell.lat, cell.lng, radius, kw) if ctx.cache_ttl else None
+    raw_results = 0
+    finished = False
+
+    if cell.depth == 0:
+        events.put(("log", f"🔍 Scanning category: {kw.title()}..."))
+    try:
+        if cache_key and not ctx.refresh and not resume:
+            for page, data in enumerate(_cached_pages(cache_key, ctx.cache_ttl)):
+                events.put(("hit", kw))
+                events.put(("page", kw, cell, page, data))
+                raw_results += len(data.get("results", []))
+                finished = "next_page_token" not in data
+            if finished:
+                return
+            raw_results = 0
+
+        def before_attempt():
+            if stop.is_set():
+                return False
+            if not ctx.budget.take():
+                events.put(("budget", kw))
+                return False
+            ctx.limiter.acquire()
+            events.put(("call", kw))
+
+        page = 0
+        search = params
+        if resume:
+            page = resume["page"]
+            search = {"pagetoken": resume["token"], "key": ctx.api_key}
+        while not stop.is_set():
+            # A token used before it activates comes back INVALID_REQUEST: retry it with backoff.
+            # A token saved by an earlier run has simply expired, so that one is not retried.
+            retry_statuses = ("INVALID_REQUEST",) if page and not resume else ()
+            data = _google_get("nearby", ctx.url, search, before_attempt, stop.wait, ctx.stats, retry_statuses)
+            if data is None:
+                break
+            if resume and data.get("status") == "INVALID_REQUEST":
+                events.put(("log", f"  ↩️ {kw.title()}: saved page token expired, restarting the category"))
+                resume, page, search = None, 0, params
+                continue
+            resume = None
+            events.put(("page", kw, cell, page, data))
+            raw_results += len(data.get("results", []))
+
+            if data.get("status") not in ["OK", "ZERO_RESULTS"]:
+                break
+            if cache_key:
+                nearby_cache.set(cache_key(page), data)
+            if "next_page_token" not in data:
+                finished = True
+                break
+            # Handle Google API pagination
+            search = {"pagetoken": data["next_page_token"], "key": ctx.api_key}
+            page += 1
+            stop.wait(PAGE_TOKEN_DELAY)  # Mandatory delay for token activation
+    except Exception as e:
+        events.put(("log", f"⚠️ Error fetching {kw}: {str(e)}"))
+    finally:
+        events.put(("done", kw, cell, raw_results, finished))
+
+
+def _fully_cached(lat, lng, radius, kw, cache_ttl):
+    """Whether a category's whole page chain for this search is fresh in the cache."""
+    pages = list(_cached_pages(partial(nearby_cache_key, lat, lng, radius, kw), cache_ttl))
+    return bool(pages) and "next_page_token" not in pages[-1]
+
+
+def _within(place, origin):
+    """Whether a place lies inside the search circle (places without coordinates are kept)."""
+    location = (place.get("geometry") or {}).get("location") or {}
+    if "lat" not in location or "lng" not in location:
+        return True
+    return distance_m(origin.lat, origin.lng, location["lat"], location["lng"]) <= origin.radius
+
+
+def tiling_enabled():
+    return env_flag("NEARBY_TILING", False)
+
+
+def checkpoints_enabled():
+    return env_flag("SCAN_CHECKPOINTS", True)
+
+
+def search_nearby(lat, lng, radius, keyword="business", force_refresh=False, tiling=None):
     """
     Searches for places using Google Places Nearby Search API.
     If keyword is 'business', performs an Omni-Search across high-value categories.
-    Yields: ('log', message) OR ('result', place_dict) for real-time progress.
+    Categories are scanned concurrently (OMNI_SEARCH_WORKERS) under a shared
+    request rate (GOOGLE_PLACES_QPS); filtering, de-duplication and usage
+    counting stay on the calling thread.
+    Response pages are cached for NEARBY_CACHE_TTL seconds; force_refresh skips
+    cached pages and re-buys (and re-caches) them from Google.
+    With tiling (default NEARBY_TILING), a category whose search comes back
+    saturated (Google's 60-result cap) is re-searched in four smaller cells,
+    recursively down to NEARBY_TILE_MIN_RADIUS, so dense areas are not truncated.
+    Before any call, plan_scan estimates the worst-case cost against the calls
+    left in this month's Nearby Search budget and trims (or refuses) the scan;
+    the remaining budget is also enforced as a hard cap while scanning.
+    Progress (finished categories, outstanding page tokens, place_ids seen) is
+    checkpointed in scan_checkpoints every SCAN_CHECKPOINT_INTERVAL seconds and
+    at the end, and when the generator is closed early (client disconnect); rerunning an interrupted scan within SCAN_RESUME_MAX_AGE seconds
+    picks up where it stopped, unless force_refresh is set.
+    Yields: ('log', message) OR ('result', place_dict) for real-time progress, and
+    ('checkpoint', None) just before each save, which commits the DB session:
+    callers that buffer results should write them out on it.
     """
     api_key = os.environ.get("GOOGLE_PLACES_API_KEY")
     if not api_key:
@@ -131,142 +418,272 @@ def search_nearby(lat, lng, radius, keyword="business"):
     if keyword.lower() == "business":
         keywords_to_search = get_omni_categories()
 
-    # --- Blocklists (Chains & Junk) ---
-    CHAIN_BLOCKLIST = [
-        "walmart",
-        "target",
-        "mcdonald",
-        "starbucks",
-        "cvs",
-        "walgreens",
-        "subway",
-        "dunkin",
-        "domino",
-        "pizza hut",
-        "burger king",
-        "wendy",
-        "taco bell",
-        "kfc",
-        "lowe",
-        "home depot",
-        "best buy",
-        "costco",
-        "kroger",
-        "whole foods",
-        "safeway",
-        "7-eleven",
-        "shell",
-        "bp",
-        "exxon",
-        "sheetz",
-        "wawa",
-        "fedex",
-        "ups",
-        "usps",
-        "bank of america",
-        "wells fargo",
-        "papa john",
-        "little caesar",
-        "checkers",
-        "sonic",
-        "arby",
-        "chipotle",
-        "panda express",
-        "jersey mike",
-        "jimmy john",
-        "five guys",
-        "panera",
-        "buffalo wild wings",
-        "dairy queen",
-        "popeye",
-        "bruster",
-        "firehouse",
-        "ihop",
-        "applebee",
-        "denny",
-        "outback",
-        "red lobster",
-        "olive garden",
-    ]
-
-    TYPE_BLOCKLIST = ["supermarket", "department_store", "shopping_mall", "gas_station", "atm"]
-
-    url = "https://maps.googleapis.com/maps/api/place/nearbysearch/json"
+    url = places_url("nearbysearch")
     processed_pids = set()  # Track place_ids to prevent duplicates across categories
 
-    # --- Search Loop ---
-    for kw in keywords_to_search:
-        yield ("log", f"🔍 Scanning category: {kw.title()}...")
-        params = {"location": f"{lat},{lng}", "radius": radius, "keyword": kw, "key": api_key}
+    tiling = tiling_enabled() if tiling is None else tiling
+    all_categories = list(keywords_to_search)
 
-        try:
-            while True:
-                # Track API usage statistics
-                try:
-                    AppConfig.increment("google_api_nearby")
-                except Exception as e:
-                    logger.warning(f"Failed to increment API counter: {e}")
+    # --- Checkpoint: resume an interrupted scan of the same area ---
+    checkpoint = None
+    completed, tokens = set(), {}
+    if checkpoints_enabled():
+        scan_key = ScanCheckpoint.key_for(lat, lng, radius, keyword, tiling)
+        if not force_refresh:
+            max_age = env_number("SCAN_RESUME_MAX_AGE", DEFAULT_SCAN_RESUME_MAX_AGE)
+            checkpoint = ScanCheckpoint.find_resumable(scan_key, max_age)
+        if checkpoint:
+            completed = set(checkpoint.completed) & set(all_categories)
+            tokens = {kw: t for kw, t in checkpoint.tokens.items() if kw in all_categories and kw not in completed}
+            processed_pids.update(checkpoint.seen)
+            keywords_to_search = [kw for kw in all_categories if kw not in completed]
+            yield (
+                "log",
+                f"♻️ Resuming interrupted scan: {len(completed)}/{len(all_categories)} categories already done.",
+            )
+        else:
+            checkpoint = ScanCheckpoint.start(scan_key)
 
-                response = requests.get(url, params=params)
-                response.raise_for_status()
-                data = response.json()
+    checkpoint_interval = env_number("SCAN_CHECKPOINT_INTERVAL", DEFAULT_CHECKPOINT_INTERVAL, float)
+    last_saved = time.monotonic()
 
-                if data.get("status") not in ["OK", "ZERO_RESULTS"]:
-                    yield ("log", f"❌ Google API Error ({kw}): {data.get('status')}")
-                    break
+    def checkpoint_due():
+        return checkpoint is not None and time.monotonic() - last_saved >= checkpoint_interval
 
-                found_in_batch = 0
-                if "results" in data:
-                    for place in data["results"]:
-                        pid = place.get("place_id")
-                        if pid in processed_pids:
-                            continue
-
-                        name_lower = place.get("name", "").lower()
-                        place_types = place.get("types", [])
-
-                        # Apply filtering
-                        if any(chain in name_lower for chain in CHAIN_BLOCKLIST):
-                            continue
-                        if any(b_type in place_types for b_type in TYPE_BLOCKLIST):
-                            continue
-
-                        processed_pids.add(pid)
-                        found_in_batch += 1
+    def save_progress(status="running"):
+        nonlocal last_saved
+        if checkpoint:
+            checkpoint.save(completed, tokens, processed_pids, status)
+            last_saved = time.monotonic()
+
+    if not keywords_to_search:
+        save_progress("complete")
+        yield ("log", "🏁 Scan complete.")
+        return
+
+    # --- Pre-flight Cost Plan (monthly budget) ---
+    cache_ttl = env_number("NEARBY_CACHE_TTL", DEFAULT_NEARBY_CACHE_TTL, minimum=0)
+    budget_left = remaining("google_api_nearby")
+    cached = set()
+    if cache_ttl and not force_refresh:
+        cached = {
+            kw for kw in keywords_to_search if kw not in tokens and _fully_cached(lat, lng, radius, kw, cache_ttl)
+        }
+    plan = plan_scan(
+        keywords_to_search,
+        budget_left,
+        tiling=tiling,
+        max_tiles=env_number("NEARBY_TILING_MAX_TILES", DEFAULT_MAX_TILES),
+        cached=cached,
+    )
+    yield (
+        "log",
+        f"🧮 Plan: up to {plan.estimated_calls} API call(s) for {len(plan.categories)} categories"
+        f" ({len(cached)} cached); {budget_left} left this month.",
+    )
+    if plan.skipped:
+        yield (
+            "log",
+            f"✂️ Over monthly budget: skipping {len(plan.skipped)} categories ({', '.join(plan.skipped[:5])}...)",
+        )
+    if tiling and not plan.tiling:
+        yield ("log", "✂️ Over monthly budget: tiling disabled for this scan.")
+    if not plan.categories:
+        yield ("log", "⛔ Monthly Nearby Search budget exhausted; scan refused.")
+        return
+    keywords_to_search = plan.categories
+    tiling, max_tiles = plan.tiling, plan.max_tiles
+
+    # --- Concurrent Category Scan ---
+    origin = root_cell(lat, lng, radius)
+    min_tile_radius = env_number("NEARBY_TILE_MIN_RADIUS", DEFAULT_TILE_MIN_RADIUS)
+    tiles_used = {kw: 1 for kw in keywords_to_search}
+    cells_left = {kw: 1 for kw in keywords_to_search}
+    unfinished = set()  # Categories with a cell that errored, ran out of budget or was stopped
+
+    workers = env_number("OMNI_SEARCH_WORKERS", DEFAULT_SEARCH_WORKERS, minimum=1)
+    ctx = ScanContext(
+        api_key=api_key,
+        url=url,
+        limiter=api_limiter(),
+        budget=CallBudget(budget_left),  # Hard cap: the plan is an estimate, this is not
+        events=queue.Queue(),
+        stop=threading.Event(),
+        cache_ttl=cache_ttl,
+        refresh=force_refresh,
+        stats=LatencyStats(),
+    )
+    budget, events, stop = ctx.budget, ctx.events, ctx.stop
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="places-scan")
+    futures = []
+
+    def submit(kw, cell, resume=None):
+        futures.append(executor.submit(_scan_category, ctx, kw, cell, resume))
+
+    for kw in keywords_to_search:
+        submit(kw, origin, tokens.get(kw))
+
+    # --- Consumer: counts usage, filters, de-duplicates and splits saturated cells as pages arrive ---
+    cache_hits = 0
+    api_calls = 0
+    budget_reported = False
+    scanned = False
+    try:
+        pending = len(keywords_to_search)
+        while pending:
+            event = events.get()
+            kind = event[0]
+            if kind == "done":
+                pending -= 1
+                _, kw, cell, raw_results, finished = event
+                cells_left[kw] -= 1
+                if not finished:
+                    unfinished.add(kw)
+                elif tiling and raw_results >= NEARBY_RESULT_CAP and not stop.is_set() and not budget.exhausted:
+                    all_children = subdivide(cell, origin, min_tile_radius)
+                    children = all_children[: max(0, max_tiles - tiles_used[kw])]
+                    skipped = len(all_children) - len(children)
+                    if children:
+                        tiles_used[kw] += len(children)
+                        cells_left[kw] += len(children)
+                        pending += len(children)
+                        for child in children:
+                            submit(kw, child)
+                        yield ("log", f"  🧩 {kw.title()}: saturated area split into {len(children)} smaller cells")
+                    if skipped:
+                        logger.warning(f"Tiling limit ({max_tiles}) reached for {kw}: skipped {skipped} cells")
+                        yield (
+                            "log",
+                            f"  ⚠️ {kw.title()}: tiling limit ({max_tiles} cells) reached, skipped {skipped} "
+                            "saturated sub-cells; some results may be missing",
+                        )
+                    elif not children:
                         yield (
-                            "result",
-                            {
-                                "place_id": pid,
-                                "name": place.get("name"),
-                                "address": place.get("vicinity"),
-                                "rating": place.get("rating"),
-                                "types": place_types,
-                            },
+                            "log",
+                            f"  ⚠️ {kw.title()}: cell still saturated at the minimum tile size, "
+                            "some results may be missing",
                         )
+                if not cells_left[kw] and kw not in unfinished:
+                    completed.add(kw)
+                    tokens.pop(kw, None)
+                    if checkpoint_due():
+                        yield ("checkpoint", None)
+                        save_progress()
+            elif kind == "log":
+                yield event
+            elif kind == "budget":
+                if not budget_reported:
+                    budget_reported = True
+                    yield ("log", "⛔ Monthly Nearby Search budget reached; stopping the scan early.")
+            elif kind == "call":
+                # Track API usage statistics
+                api_calls += 1
+                _count("google_api_nearby")
+                if cache_ttl and not force_refresh:
+                    _count("nearby_cache_misses")
+            elif kind == "hit":
+                cache_hits += 1
+                _count("nearby_cache_hits")
+            elif kind == "page":
+                _, kw, cell, page, data = event
+                if data.get("status") not in ["OK", "ZERO_RESULTS"]:
+                    yield ("log", f"❌ Google API Error ({kw}): {data.get('status')}")
+                    continue
+                found_in_batch = 0
+                for place in data.get("results", []):
+                    pid = place.get("place_id")
+                    if pid in processed_pids:
+                        continue
 
-                if found_in_batch > 0:
-                    yield ("log", f"  ✨ Found {found_in_batch} unique leads")
+                    place_types = place.get("types", [])
 
-                # Handle Google API pagination
-                if "next_page_token" in data:
-                    params = {"pagetoken": data["next_page_token"], "key": api_key}
-                    time.sleep(2)  # Mandatory delay for token activation
-                else:
-                    break
+                    # Tiles overhang the requested circle; keep only places inside it
+                    if tiling and not _within(place, origin):
+                        continue
 
-        except Exception as e:
-            yield ("log", f"⚠️ Error fetching {kw}: {str(e)}")
-            continue
+                    # Apply chain & junk-type blocklists (PLACE_BLOCKLIST_FILE)
+                    if FILTER.blocks(place):
+                        continue
 
+                    processed_pids.add(pid)
+                    found_in_batch += 1
+                    yield (
+                        "result",
+                        {
+                            "place_id": pid,
+                            "name": place.get("name"),
+                            "address": place.get("vicinity"),
+                            "rating": place.get("rating"),
+                            "types": place_types,
+                        },
+                    )
+
+                if cell.depth == 0:
+                    # Where to pick the category up again if the scan is interrupted. Set only
+                    # once every result of this page is out, so a scan closed mid-page re-reads it.
+                    if "next_page_token" in data:
+                        tokens[kw] = {"token": data["next_page_token"], "page": page + 1}
+                    else:
+                        tokens.pop(kw, None)
+                if found_in_batch > 0:
+                    yield ("log", f"  ✨ Found {found_in_batch} unique leads ({kw})")
+                if checkpoint_due():
+                    yield ("checkpoint", None)
+                    save_progress()
+        scanned = True
+    finally:
+        # Stops workers early if the client disconnects mid-scan
+        stop.set()
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=False)
+        AppConfig.flush_usage()
+        if not scanned:
+            # Closed early (or failed): keep the pages already paid for. No event can be
+            # yielded here, so callers write their buffered results before closing the scan.
+            save_progress()
+
+    if checkpoint:
+        yield ("checkpoint", None)
+        save_progress("complete" if completed.issuperset(all_categories) else "running")
+    if cache_hits:
+        yield ("log", f"💾 Served {cache_hits} page(s) from cache, saving {cache_hits} API call(s).")
+    timing = ctx.stats.summary().get("nearby")
+    if timing:
+        yield (
+            "log",
+            f"⏱️ Google latency: avg {timing['avg_ms']}ms, max {timing['max_ms']}ms over {timing['calls']} call(s).",
+        )
+    if processed_pids:
+        cost = api_calls / len(processed_pids)
+        yield (
+            "log",
+            f"📊 Cost: {api_calls} API call(s) for {len(processed_pids)} unique leads ({cost:.2f} calls/lead).",
+        )
     yield ("log", "🏁 Scan complete.")
 
 
-def get_place_details(place_id):
+def get_place_details(place_id, max_age=None):
     """
     Fetches full contact details (website, phone) for a specific place.
+    Responses are cached per place_id and reused while younger than max_age
+    seconds (default PLACE_DETAILS_MAX_AGE); only real API calls are counted.
+    Live calls share the Google rate limit and are skipped (returning {}) once
+    this month's Details budget is spent.
     """
+    max_age = env_number("PLACE_DETAILS_MAX_AGE", DEFAULT_DETAILS_MAX_AGE, minimum=0) if max_age is None else max_age
+    if max_age > 0:
+        cached = details_cache.get(place_id, max_age=max_age)
+        if cached:
+            _count("details_cache_hits")
+            return cached
+
+    if remaining("google_api_details") <= 0:
+        logger.warning(f"Monthly Place Details budget exhausted; skipping details for {place_id}")
+        return {}
+
     api_key = os.environ.get("GOOGLE_PLACES_API_KEY")
-    url = "https://maps.googleapis.com/maps/api/place/details/json"
+    url = places_url("details")
 
     params = {
         "place_id": place_id,
@@ -274,17 +691,17 @@ def get_place_details(place_id):
         "key": api_key,
     }
 
-    try:
+    def before_attempt():
+        api_limiter().acquire()
         # Track API usage statistics
-        try:
-            AppConfig.increment("google_api_details")
-        except Exception as e:
-            logger.warning(f"Failed to increment API counter: {e}")
+        _count("google_api_details")
 
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        data = response.json()
-        return data.get("result", {})
+    try:
+        data = _google_get("details", url, params, before_attempt)
+        result = data.get("result", {})
+        if result:
+            details_cache.set(place_id, result)
+        return result
     except Exception as e:
         logger.error(f"Failed to fetch place details for {place_id}: {e}")
         return {}
@@ -0,0 +1,57 @@
+import threading
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+
+def hostname(url):
+    """Returns the lowercase hostname of a URL, tolerating a missing scheme."""
+    url = url.strip()
+    if not url.lower().startswith(("http://", "https://")):
+        url = "http://" + url
+    return (urlparse(url).hostname or "").lower()
+
+
+class HostLimiter:
+    """
+    Caps the number of concurrent fetches against any single website host.
+    Semaphores are created lazily, one per lowercase hostname.
+    """
+
+    def __init__(self, per_host):
+        self.per_host = per_host
+        self._lock = threading.Lock()
+        self._semaphores = {}
+
+    def _semaphore(self, host):
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.BoundedSemaphore(self.per_host)
+            return self._semaphores[host]
+
+    @contextmanager
+    def limit(self, url, timeout=None):
+        """
+        Blocks until a slot for the URL's host is free.
+        Raises TimeoutError if a timeout is given and no slot frees up in time.
+        """
+        semaphore = self._semaphore(hostname(url))
+        if not semaphore.acquire(timeout=timeout):
+            raise TimeoutError(f"No free slot for {hostname(url)}")
+        try:
+            yield
+        finally:
+            semaphore.release()
+
+    def try_acquire(self, url, count):
+        """Takes up to `count` free slots for the URL's host without waiting; returns how many it got."""
+        semaphore = self._semaphore(hostname(url))
+        taken = 0
+        while taken < count and semaphore.acquire(blocking=False):
+            taken += 1
+        return taken
+
+    def release(self, url, count=1):
+        """Returns slots taken with try_acquire."""
+        semaphore = self._semaphore(hostname(url))
+        for _ in range(count):
+            semaphore.release()
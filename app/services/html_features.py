@@ -0,0 +1,265 @@
+import logging
+import os
+import re
+from collections import deque
+from html.parser import HTMLParser
+
+from app.services.tech_signatures import ENGINE
+
+logger = logging.getLogger(__name__)
+
+# --- Heuristic Patterns ---
+EMAIL_PATTERN = re.compile(r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}")
+PHONE_PATTERN = re.compile(r"\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}")
+COPYRIGHT_PATTERN = re.compile(r"(?:Copyright|©).*?(\d{4})", re.IGNORECASE | re.DOTALL)
+
+FOOTER_CHARS = 2000  # Copyright is searched in the trailing visible text only
+CONTACT_WINDOW = 64  # Text carried between nodes so split phone numbers still match
+SKIP_TEXT_TAGS = {"script", "style", "template", "noscript"}
+MAX_LINKS = 200  # Distinct <a href> targets kept for the broken-link checker
+
+SUPPORTED_BACKENDS = ("html.parser", "lxml")
+EXTRACTOR_VERSION = 1  # Bump when extraction changes what cached features would contain
+
+
+class _FeatureCollector:
+    """
+    Parser-agnostic callbacks that accumulate page features as tags and text stream past.
+    Both parser backends drive this object, so the heuristics live in one place.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.tech = set()
+        self.mobile_viewport = False
+        self.contact_info_found = False
+        self.email = None
+        self.phone = None
+        self._skip_depth = 0
+        self._contact_tail = ""
+        self._footer = deque()
+        self._footer_len = 0
+        self.head_closed = False
+        self.copyright_settled = False
+        self.links = {}  # Insertion-ordered set of raw hrefs
+
+    def start(self, tag, attrs):
+        tag = tag.lower()
+        if tag == "body":
+            self.head_closed = True
+        elif tag == "a" and attrs.get("href"):
+            href = str(attrs["href"]).strip()
+            if len(self.links) < MAX_LINKS:
+                self.links[href] = None
+            self._contact_link(href)
+        if tag in SKIP_TEXT_TAGS:
+            self._skip_depth += 1
+            if tag == "script" and attrs.get("src"):
+                self.tech |= self.engine.match_script(str(attrs["src"]))
+        elif tag == "meta" and not self.mobile_viewport:
+            if str(attrs.get("name") or "").lower() == "viewport":
+                if "width=device-width" in str(attrs.get("content") or "").lower():
+                    self.mobile_viewport = True
+
+    def end(self, tag):
+        tag = tag.lower()
+        if tag in SKIP_TEXT_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+        elif tag == "head":
+            self.head_closed = True
+        elif tag in ("footer", "body") and not self.copyright_settled:
+            # Once the footer has closed, trailing markup is scripts and trackers
+            self.copyright_settled = self.copyright_year() is not None
+
+    def data(self, text):
+        if self._skip_depth or not text:
+            return
+
+        # Contact patterns: scan only the new text plus a short carry-over,
+        # until both an email address and a phone number have been seen
+        if self.email is None or self.phone is None:
+            window = self._contact_tail + text
+            if self.email is None:
+                match = EMAIL_PATTERN.search(window)
+                self.email = match.group(0) if match else None
+            if self.phone is None:
+                match = PHONE_PATTERN.search(window)
+                self.phone = match.group(0).strip() if match else None
+            self.contact_info_found = self.contact_info_found or bool(self.email or self.phone)
+            self._contact_tail = window[-CONTACT_WINDOW:]
+
+        # Footer text: keep a bounded rolling window instead of the whole document
+        self._footer.append(text)
+        self._footer_len += len(text)
+        while self._footer and self._footer_len - len(self._footer[0]) >= FOOTER_CHARS:
+            self._footer_len -= len(self._footer.popleft())
+
+    def _contact_link(self, href):
+        """mailto: and tel: links carry contact details even when they are not in the text."""
+        scheme, _, value = href.partition(":")
+        value = value.split("?", 1)[0].strip()
+        if scheme.lower() == "mailto" and self.email is None and EMAIL_PATTERN.fullmatch(value):
+            self.email = value
+        elif scheme.lower() == "tel" and self.phone is None and PHONE_PATTERN.search(value):
+            self.phone = value
+        else:
+            return
+        self.contact_info_found = True
+
+    def copyright_year(self):
+        footer_text = "".join(self._footer)[-FOOTER_CHARS:]
+        match = COPYRIGHT_PATTERN.search(footer_text)
+        return int(match.group(1)) if match else None
+
+
+class _StdlibBackend(HTMLParser):
+    """Streaming backend built on the standard library's html.parser."""
+
+    def __init__(self, collector):
+        super().__init__(convert_charrefs=True)
+        self.collector = collector
+
+    def handle_starttag(self, tag, attrs):
+        self.collector.start(tag, dict(attrs))
+
+    def handle_startendtag(self, tag, attrs):
+        self.collector.start(tag, dict(attrs))
+        self.collector.end(tag)
+
+    def handle_endtag(self, tag):
+        self.collector.end(tag)
+
+    def handle_data(self, data):
+        self.collector.data(data)
+
+
+class _LxmlTarget:
+    """lxml parser target: forwards SAX-style events to the collector."""
+
+    def __init__(self, collector):
+        self.collector = collector
+
+    def start(self, tag, attrib):
+        self.collector.start(tag, attrib)
+
+    def end(self, tag):
+        self.collector.end(tag)
+
+    def data(self, data):
+        self.collector.data(data)
+
+    def close(self):
+        # Called by the parser's own close(); results live on the collector
+        return self.collector
+
+
+class _LxmlBackend:
+    """Streaming backend using lxml's C parser in target (SAX-style) mode."""
+
+    def __init__(self, collector):
+        from lxml import etree
+
+        self.collector = collector
+        self._parser = etree.HTMLParser(target=_LxmlTarget(collector), remove_comments=True)
+
+    def feed(self, chunk):
+        self._parser.feed(chunk)
+
+    def close(self):
+        try:
+            self._parser.close()
+        except Exception as e:  # lxml raises on documents it could not recover
+            logger.debug(f"lxml parser close failed: {e}")
+
+
+def resolve_backend(name=None):
+    """
+    Picks the parser backend from the argument or HTML_PARSER_BACKEND.
+    Falls back to html.parser when an optional backend is not installed.
+    """
+    name = (name or os.environ.get("HTML_PARSER_BACKEND") or "html.parser").lower()
+    if name not in SUPPORTED_BACKENDS:
+        logger.warning(f"Unknown HTML parser backend '{name}', using html.parser")
+        return "html.parser"
+    if name == "lxml":
+        try:
+            import lxml.etree  # noqa: F401
+        except ImportError:
+            logger.warning("lxml is not installed, using html.parser")
+            return "html.parser"
+    return name
+
+
+class HtmlFeatureExtractor:
+    """
+    Single-pass extractor for the analyzer's page heuristics.
+    Feed HTML text in one or more chunks, then call close() for the results:
+    viewport, tech stack, contact details, copyright year and outbound links
+    are all found while the document streams through the parser once.
+    """
+
+    def __init__(self, backend=None, engine=None):
+        self.backend = resolve_backend(backend)
+        self.engine = engine or ENGINE
+        self._collector = _FeatureCollector(self.engine)
+        self._parser = _LxmlBackend(self._collector) if self.backend == "lxml" else _StdlibBackend(self._collector)
+        self._tech_carry = ""
+        self._carry_len = max(self.engine.html.max_length - 1, 0)
+
+    def feed_headers(self, headers):
+        """Checks response headers and cookies for platform fingerprints before any body bytes arrive."""
+        self._collector.tech |= self.engine.match_headers(headers)
+
+    @property
+    def decided(self):
+        """
+        True once no further body bytes can change the results: viewport settled,
+        contact info and a platform found, and the footer's copyright year read.
+        Links are best-effort: by then the page body (and its footer) has been seen.
+        """
+        collector = self._collector
+        return (
+            bool(collector.tech)
+            and collector.contact_info_found
+            and (collector.mobile_viewport or collector.head_closed)
+            and collector.copyright_settled
+        )
+
+    @property
+    def contact_complete(self):
+        """True once both an email address and a phone number have been found."""
+        return self._collector.email is not None and self._collector.phone is not None
+
+    def feed(self, chunk):
+        """Processes the next piece of the document."""
+        if not chunk:
+            return
+        self._scan_tech(chunk)
+        self._parser.feed(chunk)
+
+    def _scan_tech(self, chunk):
+        # One compiled scan per chunk; a short carry-over catches signatures
+        # split across chunk boundaries.
+        text = self._tech_carry + chunk
+        self._collector.tech |= self.engine.match_html(text)
+        self._tech_carry = text[-self._carry_len :] if self._carry_len else ""
+
+    def close(self):
+        """Finishes parsing and returns the extracted feature dictionary."""
+        self._parser.close()
+        return {
+            "mobile_viewport": self._collector.mobile_viewport,
+            "contact_info_found": self._collector.contact_info_found,
+            "email": self._collector.email,
+            "phone": self._collector.phone,
+            "copyright_year": self._collector.copyright_year(),
+            "tech_stack": self.engine.ordered(self._collector.tech),
+            "links": list(self._collector.links),
+        }
+
+
+def extract_features(html, backend=None):
+    """Convenience wrapper: extracts features from a complete HTML string."""
+    extractor = HtmlFeatureExtractor(backend=backend)
+    extractor.feed(html)
+    return extractor.close()
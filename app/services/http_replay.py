@@ -0,0 +1,241 @@
+"""
+Record/replay harness for offline analysis runs.
+
+recording(corpus_dir) sends every requests call through a real HTTP adapter and
+saves each exchange (status, headers, decoded body, timing, or the error raised)
+to an on-disk corpus. replaying(corpus_dir) serves the same exchanges back
+without touching the network, optionally with the recorded or a fixed latency,
+so analyzer and bulk benchmarks run deterministically on a machine with no network.
+
+Both install themselves process-wide by routing requests.Session.get_adapter
+(which requests.get also goes through) to the harness adapter. The analyzer's
+port-443 certificate probe is recorded and replayed alongside.
+"""
+
+import base64
+import hashlib
+import io
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from app.services import analyzer
+
+logger = logging.getLogger(__name__)
+
+MAX_RECORD_BYTES = 5_000_000  # Bodies beyond this are truncated in the corpus
+# The corpus stores decoded bodies, so transfer framing headers no longer apply
+DROPPED_HEADERS = {"content-encoding", "transfer-encoding", "content-length"}
+RECORDED_ERRORS = {
+    "ssl": requests.exceptions.SSLError,
+    "timeout": requests.exceptions.Timeout,
+    "connection": requests.exceptions.ConnectionError,
+}
+
+
+class HttpCorpus:
+    """
+    On-disk store of recorded exchanges: one JSON file per request under
+    <root>/<sha1[:2]>/<sha1>.json, plus seeds.json listing the URLs that
+    were analyzed to build it.
+    """
+
+    def __init__(self, root):
+        self.root = Path(root)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(method, url, verify=True):
+        return f"{method.upper()} {url}" + ("" if verify else " [unverified]")
+
+    def _path(self, key):
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return self.root / digest[:2] / f"{digest}.json"
+
+    def load(self, key):
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def save(self, key, entry):
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=path.parent, delete=False) as f:
+            json.dump({"key": key, **entry}, f)
+        os.replace(f.name, path)
+
+    def seeds(self):
+        try:
+            with open(self.root / "seeds.json", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return []
+
+    def add_seeds(self, urls):
+        with self._lock:
+            seeds = list(dict.fromkeys(self.seeds() + list(urls)))
+            self.root.mkdir(parents=True, exist_ok=True)
+            with open(self.root / "seeds.json", "w", encoding="utf-8") as f:
+                json.dump(seeds, f, indent=2)
+
+    def entries(self):
+        """Yields every recorded exchange."""
+        for path in sorted(self.root.glob("*/*.json")):
+            with open(path, encoding="utf-8") as f:
+                yield json.load(f)
+
+    def html_pages(self):
+        """Yields (url, html) for every recorded HTML body, for parser benchmarks."""
+        for entry in self.entries():
+            content_type = str(entry.get("headers", {}).get("Content-Type", "")).lower()
+            if entry.get("body") and "html" in content_type:
+                yield entry["url"], base64.b64decode(entry["body"]).decode("utf-8", errors="replace")
+
+
+def _build_response(request, entry, adapter):
+    """Turns a corpus entry back into a requests.Response that streams its body."""
+    response = requests.Response()
+    response.status_code = entry["status"]
+    response.reason = entry.get("reason")
+    response.headers = CaseInsensitiveDict(entry["headers"])
+    response.encoding = get_encoding_from_headers(response.headers)
+    response.raw = io.BytesIO(base64.b64decode(entry["body"]))
+    response.url = entry["url"]
+    response.elapsed = timedelta(seconds=entry["elapsed"])
+    response.request = request
+    response.connection = adapter
+    return response
+
+
+def _raise_recorded(entry):
+    raise RECORDED_ERRORS.get(entry["error"], requests.exceptions.ConnectionError)(entry.get("message", ""))
+
+
+class RecordingAdapter(HTTPAdapter):
+    """Real transport that saves every exchange to the corpus as it happens."""
+
+    def __init__(self, corpus, **kwargs):
+        super().__init__(**kwargs)
+        self.corpus = corpus
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        key = HttpCorpus.key(request.method, request.url, verify)
+        start = time.perf_counter()
+        try:
+            response = super().send(request, stream=True, timeout=timeout, verify=verify, cert=cert, proxies=proxies)
+        except requests.exceptions.RequestException as e:
+            kind = next((name for name, error in RECORDED_ERRORS.items() if isinstance(e, error)), "connection")
+            self.corpus.save(key, {"url": request.url, "error": kind, "message": str(e)})
+            raise
+        elapsed = time.perf_counter() - start
+
+        try:
+            body = response.raw.read(MAX_RECORD_BYTES, decode_content=True) or b""
+        finally:
+            response.close()
+        entry = {
+            "url": response.url,
+            "status": response.status_code,
+            "reason": response.reason,
+            "headers": {k: v for k, v in response.headers.items() if k.lower() not in DROPPED_HEADERS},
+            "body": base64.b64encode(body).decode("ascii"),
+            "elapsed": elapsed,
+        }
+        self.corpus.save(key, entry)
+        return _build_response(request, entry, self)
+
+
+class ReplayAdapter(HTTPAdapter):
+    """
+    Offline transport that serves recorded exchanges.
+    latency: None (instant), "recorded" (sleep the recorded time to headers)
+    or a number of seconds to sleep per request.
+    Requests missing from the corpus fail with ConnectionError.
+    """
+
+    def __init__(self, corpus, latency=None, **kwargs):
+        super().__init__(**kwargs)
+        self.corpus = corpus
+        self.latency = latency
+        self.misses = 0
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        entry = None
+        if not verify:
+            entry = self.corpus.load(HttpCorpus.key(request.method, request.url, verify=False))
+        entry = entry or self.corpus.load(HttpCorpus.key(request.method, request.url))
+        if entry is None:
+            self.misses += 1
+            raise requests.exceptions.ConnectionError(f"Not in replay corpus: {request.method} {request.url}")
+
+        if self.latency == "recorded":
+            time.sleep(entry.get("elapsed", 0))
+        elif self.latency:
+            time.sleep(float(self.latency))
+
+        if "error" in entry:
+            _raise_recorded(entry)
+        return _build_response(request, entry, self)
+
+
+def _encode_tls(info):
+    expires_at = info.get("expires_at")
+    return {**info, "expires_at": expires_at.isoformat() if expires_at else None}
+
+
+def _decode_tls(info):
+    expires_at = info.get("expires_at")
+    return {**info, "expires_at": datetime.fromisoformat(expires_at) if expires_at else None}
+
+
+@contextmanager
+def _installed(adapter, ssl_probe):
+    original_get_adapter = requests.Session.get_adapter
+    original_probe = analyzer.get_ssl_info
+    requests.Session.get_adapter = lambda session, url: adapter
+    analyzer.get_ssl_info = ssl_probe
+    try:
+        yield adapter
+    finally:
+        requests.Session.get_adapter = original_get_adapter
+        analyzer.get_ssl_info = original_probe
+        adapter.close()
+
+
+def recording(corpus_dir):
+    """Context manager: record all HTTP traffic (and TLS probes) into corpus_dir."""
+    corpus = HttpCorpus(corpus_dir)
+    real_probe = analyzer.get_ssl_info
+
+    def probe(hostname, *args, **kwargs):
+        info = real_probe(hostname, *args, **kwargs)
+        corpus.save(HttpCorpus.key("TLS", hostname), {"url": hostname, "tls": _encode_tls(info)})
+        return info
+
+    return _installed(RecordingAdapter(corpus), probe)
+
+
+def replaying(corpus_dir, latency=None):
+    """Context manager: serve all HTTP traffic (and TLS probes) from corpus_dir."""
+    corpus = HttpCorpus(corpus_dir)
+
+    def probe(hostname, *args, **kwargs):
+        entry = corpus.load(HttpCorpus.key("TLS", hostname))
+        if entry:
+            return _decode_tls(entry["tls"])
+        return {"valid": False, "issuer": None, "expires_at": None, "protocol": None}
+
+    return _installed(ReplayAdapter(corpus, latency=latency), probe)
@@ -0,0 +1,154 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from urllib.parse import urldefrag, urljoin, urlparse
+
+import requests
+
+from app.services.analyzer import REQUEST_HEADERS, url_port
+from app.services.dns_cache import classify_failure, resolver
+from app.services.host_limits import HostLimiter
+from app.services.settings import env_flag, env_number, new_session
+
+logger = logging.getLogger(__name__)
+
+# --- Budget Defaults (per analyzed site) ---
+DEFAULT_MAX_LINKS = 25  # LINK_CHECK_MAX_LINKS
+DEFAULT_BUDGET_SECONDS = 4.0  # LINK_CHECK_BUDGET: wall-clock cap for the whole stage
+DEFAULT_PER_HOST_LIMIT = 2  # LINK_CHECK_PER_HOST
+LINK_WORKERS = 8
+LINK_TIMEOUT = 3  # seconds per request, further clipped to the remaining budget
+MAX_SAMPLES = 5  # Broken URLs kept on the lead for the pitch
+
+# Servers that reject HEAD outright but usually answer GET
+HEAD_FALLBACK_STATUSES = {403, 405, 501}
+# Statuses that say nothing about whether the link works
+INCONCLUSIVE_STATUSES = {401, 429}
+
+
+def link_check_enabled():
+    return env_flag("LINK_CHECK_ENABLED", True)
+
+
+def normalize_links(page_url, hrefs, max_links):
+    """
+    Resolves raw hrefs against the page URL and returns up to max_links distinct
+    http(s) targets in document order. Fragments, in-page anchors, mailto:/tel:/
+    javascript: links and links back to the page itself are dropped.
+    """
+    page = urldefrag(page_url)[0].rstrip("/")
+    links = []
+    for href in hrefs:
+        url = urldefrag(urljoin(page_url, href))[0]
+        if urlparse(url).scheme not in ("http", "https") or url.rstrip("/") == page or url in links:
+            continue
+        links.append(url)
+        if len(links) >= max_links:
+            break
+    return links
+
+
+def _check_one(session, url, host_limiter, deadline):
+    """
+    Checks one link: HEAD first, GET (headers only) when HEAD is rejected.
+    Returns (broken, detail) where broken is None when the outcome is unknown
+    (timeouts, rate limits, budget exhausted). The shared DNS cache is only read:
+    a failed link is reported here, never recorded against its host.
+    """
+    dead_reason = resolver.dead_reason(urlparse(url).hostname, url_port(url))
+    if dead_reason:
+        return True, dead_reason
+
+    try:
+        with host_limiter.limit(url, timeout=max(0.0, deadline - time.monotonic())):
+            timeout = min(LINK_TIMEOUT, deadline - time.monotonic())
+            if timeout <= 0:
+                return None, "budget"
+            response = session.head(url, allow_redirects=True, timeout=timeout)
+            response.close()
+            if response.status_code in HEAD_FALLBACK_STATUSES:
+                response = session.get(url, allow_redirects=True, timeout=timeout, stream=True)
+                response.close()
+    except TimeoutError:
+        return None, "budget"
+    except requests.exceptions.Timeout:
+        return None, "timeout"
+    except requests.exceptions.ConnectionError as e:
+        reason = classify_failure(e)
+        return (True, reason) if reason else (None, "connection error")
+    except requests.exceptions.RequestException as e:
+        return None, type(e).__name__
+
+    status = response.status_code
+    if status in INCONCLUSIVE_STATUSES:
+        return None, str(status)
+    return status >= 400, str(status)
+
+
+def check_links(page_url, hrefs, max_links=None, budget=None, per_host=None, host_limiter=None):
+    """
+    Checks a page's links concurrently within a fixed budget.
+    Returns {"checked": int, "unchecked": int, "broken": [(url, detail), ...]}.
+    Links still pending when the budget runs out are reported as unchecked.
+    Fetches run under host_limiter when one is shared by the caller (bulk runs),
+    otherwise under a per-call cap of per_host (LINK_CHECK_PER_HOST).
+    """
+    max_links = env_number("LINK_CHECK_MAX_LINKS", DEFAULT_MAX_LINKS, minimum=0) if max_links is None else max_links
+    budget = env_number("LINK_CHECK_BUDGET", DEFAULT_BUDGET_SECONDS, float, minimum=0) if budget is None else budget
+    per_host = per_host or env_number("LINK_CHECK_PER_HOST", DEFAULT_PER_HOST_LIMIT, minimum=1)
+
+    links = normalize_links(page_url, hrefs, max_links)
+    report = {"checked": 0, "unchecked": 0, "broken": []}
+    if not links:
+        return report
+
+    deadline = time.monotonic() + budget
+    host_limiter = host_limiter or HostLimiter(per_host)
+    # Pooled so links on the same host reuse connections
+    session = new_session(REQUEST_HEADERS, pool_connections=LINK_WORKERS, pool_maxsize=LINK_WORKERS)
+    executor = ThreadPoolExecutor(max_workers=min(LINK_WORKERS, len(links)), thread_name_prefix="link-check")
+    futures = {}
+    try:
+        futures = {executor.submit(_check_one, session, url, host_limiter, deadline): url for url in links}
+        done, _ = wait(futures, timeout=budget)
+        for future, url in futures.items():
+            broken, detail = future.result() if future in done else (None, "budget")
+            if broken is None:
+                report["unchecked"] += 1
+                continue
+            report["checked"] += 1
+            if broken:
+                report["broken"].append((url, detail))
+    finally:
+        # Stragglers finish (or time out) in the background without holding up the lead
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=False)
+        session.close()
+    return report
+
+
+def run_link_check(analysis, host_limiter=None):
+    """
+    Broken-link stage: runs after analyze_url on its results and adds
+    links_checked, broken_link_count and broken_link_samples (plus log lines).
+    Leaves the results untouched when no page was read or the stage is disabled.
+    """
+    if not analysis or analysis.get("status_code") != 200 or not link_check_enabled():
+        return analysis
+
+    start = time.monotonic()
+    page_url = analysis.get("final_url") or analysis.get("url")
+    report = check_links(page_url, analysis.get("links") or [], host_limiter=host_limiter)
+    broken = report["broken"]
+
+    analysis["links_checked"] = report["checked"]
+    analysis["broken_link_count"] = len(broken)
+    analysis["broken_link_samples"] = [f"{url} ({detail})" for url, detail in broken[:MAX_SAMPLES]]
+
+    elapsed = int((time.monotonic() - start) * 1000)
+    skipped = f", {report['unchecked']} unchecked" if report["unchecked"] else ""
+    analysis["logs"].append(f"🔗 Links: {len(broken)} broken of {report['checked']} checked{skipped} ({elapsed}ms)")
+    for sample in analysis["broken_link_samples"]:
+        analysis["logs"].append(f"   💔 {sample}")
+    return analysis
@@ -0,0 +1,188 @@
+"""
+Local stand-in for the Google Places Nearby Search and Details endpoints.
+
+MockPlaces generates deterministic synthetic results: every Nearby Search
+(location, radius, keyword) returns `results` places in pages of 20 linked by
+next_page_token, a share of them (`overlap`) drawn from a pool common to every
+keyword at that location so cross-category de-duplication has work to do.
+Responses can be slowed down (`latency` plus random `jitter`) and a fraction
+of requests (`error_rate`) fails with an HTTP 503 or OVER_QUERY_LIMIT. Page
+tokens can be made to activate late (`token_delay`), like Google's.
+
+serving() runs it on a local HTTP server and points GOOGLE_PLACES_BASE_URL at
+it, so search_nearby, get_place_details and the /search stream can be driven
+at scale without spending quota.
+"""
+
+import base64
+import hashlib
+import json
+import math
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+PAGE_SIZE = 20
+SHARED_POOL = 1000  # Places per location that any keyword may return
+TRADES = ["Plumbing", "Electric", "HVAC", "Roofing", "Dental", "Auto Repair", "Salon", "Landscaping"]
+
+
+def _digest(*parts):
+    return int(hashlib.sha1("|".join(str(p) for p in parts).encode("utf-8")).hexdigest()[:12], 16)
+
+
+class MockPlaces:
+    """Synthetic Places API: answers Nearby Search and Details queries and counts them."""
+
+    def __init__(self, results=60, overlap=0.2, latency=0.0, jitter=0.0, error_rate=0.0, token_delay=0.0, seed=0):
+        self.results = results
+        self.overlap = overlap
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.token_delay = token_delay
+        self.calls = {"nearby": 0, "details": 0}
+        self.errors = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _place(self, location, radius, keyword, index):
+        """One synthetic result; shared-pool places keep the same id whichever keyword finds them."""
+        lat, lng = (float(x) for x in location.split(","))
+        shared = _digest(location, keyword, index, "shared") % 1000 < self.overlap * 1000
+        source = ("pool", _digest(location, keyword, index) % SHARED_POOL) if shared else (keyword, index)
+        seed = _digest(location, radius, *source)
+        # Spread uniformly over the search circle
+        distance = radius * math.sqrt((seed % 10_000) / 10_000)
+        bearing = (seed // 10_000 % 3600) / 3600 * 2 * math.pi
+        place_lat = lat + math.degrees(distance * math.cos(bearing) / 6_371_000)
+        place_lng = lng + math.degrees(distance * math.sin(bearing) / (6_371_000 * math.cos(math.radians(lat))))
+        trade = keyword.title() if not shared else TRADES[seed % len(TRADES)]
+        return {
+            "place_id": f"mock-{seed:x}",
+            "name": f"{trade} Co #{seed % 100_000}",
+            "vicinity": f"{seed % 9000 + 100} Main St",
+            "rating": round(3 + (seed % 20) / 10, 1),
+            "types": [keyword.replace(" ", "_"), "point_of_interest", "establishment"],
+            "geometry": {"location": {"lat": place_lat, "lng": place_lng}},
+        }
+
+    @staticmethod
+    def _token(query, page):
+        raw = json.dumps({"q": query, "page": page, "at": time.time()}).encode("utf-8")
+        return base64.urlsafe_b64encode(raw).decode("ascii")
+
+    def nearby(self, params):
+        """Response body for a Nearby Search query."""
+        if "pagetoken" in params:
+            try:
+                token = json.loads(base64.urlsafe_b64decode(params["pagetoken"]))
+            except ValueError:
+                return {"status": "INVALID_REQUEST", "results": []}
+            if time.time() - token["at"] < self.token_delay:
+                return {"status": "INVALID_REQUEST", "results": []}
+            query, page = token["q"], token["page"]
+        else:
+            if not params.get("location") or not params.get("radius"):
+                return {"status": "INVALID_REQUEST", "results": []}
+            query, page = [params["location"], int(params["radius"]), params.get("keyword", "")], 0
+
+        location, radius, keyword = query
+        indexes = range(page * PAGE_SIZE, min(self.results, (page + 1) * PAGE_SIZE))
+        data = {
+            "status": "OK" if self.results else "ZERO_RESULTS",
+            "results": [self._place(location, radius, keyword, i) for i in indexes],
+        }
+        if (page + 1) * PAGE_SIZE < self.results:
+            data["next_page_token"] = self._token(query, page + 1)
+        return data
+
+    def details(self, params):
+        """Response body for a Place Details query."""
+        place_id = params.get("place_id", "")
+        if not place_id.startswith("mock-"):
+            return {"status": "NOT_FOUND"}
+        seed = int(place_id[5:], 16)
+        return {
+            "status": "OK",
+            "result": {
+                "name": f"Business Co #{seed % 100_000}",
+                "formatted_phone_number": f"(555) {seed % 900 + 100}-{seed % 9000 + 1000}",
+                "website": f"https://{place_id}.example.com",
+                "url": f"https://maps.google.com/?cid={seed}",
+                "formatted_address": f"{seed % 9000 + 100} Main St",
+            },
+        }
+
+    def handle(self, endpoint, params):
+        """(HTTP status, body) for one request, with the configured latency and injected errors."""
+        with self._lock:
+            self.calls[endpoint] += 1
+            error = self._rng.random() < self.error_rate and self._rng.choice(("http", "quota"))
+            delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0)
+            self.errors += bool(error)
+        if delay:
+            time.sleep(delay)
+        if error == "http":
+            return 503, {"error": "injected"}
+        if error == "quota":
+            return 200, {"status": "OVER_QUERY_LIMIT", "results": []}
+        return 200, self.nearby(params) if endpoint == "nearby" else self.details(params)
+
+
+ENDPOINTS = {
+    "/maps/api/place/nearbysearch/json": "nearby",
+    "/maps/api/place/details/json": "details",
+}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        url = urlparse(self.path)
+        endpoint = ENDPOINTS.get(url.path)
+        if not endpoint:
+            self.send_error(404)
+            return
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        status, body = self.server.places.handle(endpoint, params)
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=UTF-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@contextmanager
+def serving(places=None, **options):
+    """
+    Serves a MockPlaces (built from options if not given) on a local port and
+    routes Google Places calls to it via GOOGLE_PLACES_BASE_URL for the block.
+    Yields the MockPlaces, whose base_url is set.
+    """
+    places = places or MockPlaces(**options)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.daemon_threads = True
+    server.places = places
+    places.base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    thread = threading.Thread(target=server.serve_forever, name="mock-places", daemon=True)
+    thread.start()
+
+    previous = os.environ.get("GOOGLE_PLACES_BASE_URL")
+    os.environ["GOOGLE_PLACES_BASE_URL"] = places.base_url
+    try:
+        yield places
+    finally:
+        if previous is None:
+            os.environ.pop("GOOGLE_PLACES_BASE_URL", None)
+        else:
+            os.environ["GOOGLE_PLACES_BASE_URL"] = previous
+        server.shutdown()
+        server.server_close()
@@ -1,47 +1,83 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 from app.models.lead import Lead, LeadStatus
 from app.services.analyzer import analyze_url
+from app.services.contact_crawler import run_contact_crawl
 from app.services.google_places import get_place_details
+from app.services.link_checker import run_link_check
 
 logger = logging.getLogger(__name__)
 
 
-def process_lead_analysis(lead_id):
+# Post-fetch stages: each takes analyze_url's results (and a host_limiter) and adds its own fields
+SITE_STAGES = (run_contact_crawl, run_link_check)
+
+
+def run_site_stages(analysis, host_limiter=None):
     """
-    Runs the full enrichment pipeline for a lead:
-    1. Fetches deep contact details (website, phone) from Google Places API.
-    2. Runs technical heuristic scans on the business website.
-    3. Calculates a priority score and updates the record.
+    Runs the post-fetch stages side by side, so a lead waits for the slowest
+    stage's budget rather than the sum of them. Each stage works on its own
+    copy; changed fields and log lines are merged back in stage order.
+    A shared host_limiter puts the stages' fetches under the caller's per-host cap.
     """
-    from app import db_session
+    if not analysis:
+        return analysis
 
-    lead = Lead.query.get(lead_id)
-    if not lead:
-        return False
+    with ThreadPoolExecutor(max_workers=len(SITE_STAGES), thread_name_prefix="site-stage") as executor:
+        futures = [
+            (stage, executor.submit(stage, {**analysis, "logs": []}, host_limiter=host_limiter))
+            for stage in SITE_STAGES
+        ]
+
+    original = dict(analysis)
+    for stage, future in futures:
+        try:
+            output = future.result()
+        except Exception as e:
+            logger.warning(f"Site stage {stage.__name__} failed: {e}")
+            continue
+        logs = output.pop("logs")
+        analysis.update({key: value for key, value in output.items() if original.get(key) is not value})
+        analysis.setdefault("logs", []).extend(logs)
+    return analysis
 
+
+def apply_enrichment(lead, details, analysis):
+    """
+    Maps Google Details and website analysis results onto a Lead record.
+    Pure in-memory update: the caller owns the commit.
+    """
     # --- Phase 1: Contact Enrichment ---
-    # Refresh core contact data from Google Details API
-    details = get_place_details(lead.place_id)
     if details:
         lead.phone = details.get("formatted_phone_number", lead.phone)
         lead.website_url = details.get("website", lead.website_url)
         lead.address = details.get("formatted_address", lead.address)
 
     # --- Phase 2: Technical Analysis ---
-    if lead.website_url:
-        analysis = analyze_url(lead.website_url)
-
+    if lead.website_url and analysis:
         # Map analysis metrics
         lead.ssl_active = analysis.get("ssl_active", False)
+        lead.ssl_issuer = analysis.get("ssl_issuer")
+        lead.ssl_expires_at = analysis.get("ssl_expires_at")
+        lead.ssl_protocol = analysis.get("ssl_protocol")
         lead.mobile_viewport = analysis.get("mobile_viewport", False)
         lead.contact_info_found = analysis.get("contact_info_found", False)
+        if analysis.get("email"):
+            lead.email = analysis["email"]
+        if analysis.get("phone") and not lead.phone:
+            # Google's listing number wins; the site's number only fills a gap
+            lead.phone = analysis["phone"]
         lead.copyright_year = analysis.get("copyright_year")
         lead.status_code = analysis.get("status_code")
         lead.analysis_error = analysis.get("error")
         lead.tech_stack = analysis.get("tech_stack")
+        lead.ttfb = analysis.get("ttfb")
         lead.load_time = analysis.get("load_time")
+        lead.links_checked = analysis.get("links_checked")
+        lead.broken_link_count = analysis.get("broken_link_count")
+        lead.broken_link_samples = "\n".join(analysis.get("broken_link_samples") or []) or None
 
         # Save technical logs
         if analysis.get("logs"):
@@ -68,6 +104,29 @@ def process_lead_analysis(lead_id):
     # Update analysis timestamp
     lead.analyzed_at = datetime.utcnow()
 
+
+def process_lead_analysis(lead_id):
+    """
+    Runs the full enrichment pipeline for a lead:
+    1. Fetches deep contact details (website, phone) from Google Places API,
+       reusing a cached response while it is fresh (PLACE_DETAILS_MAX_AGE).
+    2. Runs technical heuristic scans on the business website.
+    3. Crawls linked contact pages and checks the landing page's links for broken targets.
+    4. Calculates a priority score and updates the record.
+    """
+    from app import db_session
+
+    lead = Lead.query.get(lead_id)
+    if not lead:
+        return False
+
+    # Refresh core contact data from Google Details API (skipped while the cached copy is fresh)
+    details = get_place_details(lead.place_id)
+    website_url = details.get("website", lead.website_url) if details else lead.website_url
+
+    analysis = run_site_stages(analyze_url(website_url)) if website_url else None
+    apply_enrichment(lead, details, analysis)
+
     try:
         db_session.commit()
         logger.info(f"Analysis complete for lead {lead_id}: {lead.name}")
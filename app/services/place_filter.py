@@ -0,0 +1,60 @@
+import json
+import logging
+import os
+import re
+from pathlib import Path
+
+from app.services.tech_signatures import trie_pattern
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BLOCKLIST_FILE = Path(__file__).resolve().parent.parent / "data" / "place_blocklist.json"
+
+
+class PlaceFilter:
+    """
+    Compiled chain/type blocklist for Nearby Search results.
+    Chain names are matched as whole words (with an optional possessive or plural
+    "s"), so "bp" blocks "BP" but not "BPM Plumbing", and "lowe" still blocks
+    "Lowe's". All chains share one regex; types are a set lookup.
+    """
+
+    def __init__(self, chains=(), types=()):
+        self.chains = sorted({chain.strip().lower() for chain in chains if chain.strip()})
+        self.types = frozenset(types)
+        # Lowercased names with a case-sensitive regex: faster than re.IGNORECASE (see LiteralMatcher)
+        self._chain_regex = re.compile(r"\b" + trie_pattern(self.chains) + r"(?:['’]?s)?\b") if self.chains else None
+
+    @classmethod
+    def from_file(cls, path):
+        """Loads a blocklist from a JSON file with "chains" and "types" lists."""
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data.get("chains", ()), data.get("types", ()))
+
+    def is_chain(self, name):
+        return bool(self._chain_regex and name and self._chain_regex.search(name.lower()))
+
+    def has_blocked_type(self, place_types):
+        return not self.types.isdisjoint(place_types or ())
+
+    def blocks(self, place):
+        """Whether a Nearby Search result should be dropped as a chain or junk type."""
+        return self.has_blocked_type(place.get("types")) or self.is_chain(place.get("name", ""))
+
+
+def load_filter(path=None):
+    """
+    Builds the filter from PLACE_BLOCKLIST_FILE (or the bundled blocklist).
+    Falls back to the bundled file if a custom one cannot be read.
+    """
+    path = path or os.environ.get("PLACE_BLOCKLIST_FILE") or DEFAULT_BLOCKLIST_FILE
+    try:
+        return PlaceFilter.from_file(path)
+    except (OSError, ValueError) as e:
+        logger.error(f"Failed to load place blocklist from {path}: {e}")
+        return PlaceFilter.from_file(DEFAULT_BLOCKLIST_FILE)
+
+
+# Compiled once at import and shared by every scan
+FILTER = load_filter()
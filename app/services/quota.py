@@ -0,0 +1,83 @@
+import logging
+from collections import namedtuple
+
+from app.models.config import AppConfig
+from app.models.usage import ApiUsage, month_start
+from app.services.rate_limit import RateLimiter
+from app.services.settings import env_number
+
+logger = logging.getLogger(__name__)
+
+# --- Google Places Quota ---
+DEFAULT_QPS = 10  # GOOGLE_PLACES_QPS: requests per second shared by Nearby Search and Details
+# Usage counter -> (env override, default calls per billing month)
+MONTHLY_LIMITS = {
+    "google_api_nearby": ("GOOGLE_NEARBY_MONTHLY_LIMIT", 5000),
+    "google_api_details": ("GOOGLE_DETAILS_MONTHLY_LIMIT", 10000),
+}
+# List price per 1,000 calls (USD, before Google's monthly credit), for the /usage cost chart
+PRICE_PER_1000 = {"google_api_nearby": 32.0, "google_api_details": 17.0}
+PAGES_PER_SEARCH = 3  # Worst case: Google serves up to 3 pages per Nearby Search
+MIN_SPLIT_TILES = 5  # A root cell plus one split into four; fewer tiles cannot tile at all
+
+ScanPlan = namedtuple("ScanPlan", ["categories", "tiling", "max_tiles", "estimated_calls", "remaining", "skipped"])
+
+
+def monthly_limit(counter):
+    env, default = MONTHLY_LIMITS[counter]
+    return env_number(env, default, minimum=0)
+
+
+def used_this_month(counter):
+    """Calls counted so far this billing month: the api_usage ledger plus counts not flushed yet."""
+    since = month_start()
+    try:
+        used = ApiUsage.totals(since, [counter]).get(counter, 0)
+    except Exception as e:
+        logger.warning(f"Failed to read {counter} usage: {e}")
+        used = 0
+    return used + AppConfig.pending_usage(counter, since)
+
+
+def remaining(counter):
+    """Calls left in this month's budget for a usage counter."""
+    return max(0, monthly_limit(counter) - used_this_month(counter))
+
+
+# One bucket for every Google Places call in the process, so concurrent scans and bulk runs share the rate
+_limiter = RateLimiter(DEFAULT_QPS)
+
+
+def api_limiter():
+    """The shared Google Places rate limiter, kept in sync with GOOGLE_PLACES_QPS."""
+    qps = env_number("GOOGLE_PLACES_QPS", DEFAULT_QPS, float)
+    if qps != _limiter.qps:
+        _limiter.set_rate(qps)
+    return _limiter
+
+
+def plan_scan(categories, budget, tiling=False, max_tiles=1, cached=()):
+    """
+    Pre-flight estimate of a scan's worst-case Nearby Search calls, trimmed to fit `budget`.
+    Categories in `cached` are served from the response cache and cost nothing.
+    When over budget, the tiling allowance shrinks first (tiling is dropped if it can no
+    longer split once), then trailing categories are skipped. An empty plan means refuse.
+    """
+    live = [kw for kw in categories if kw not in cached]
+    tiles = max(1, max_tiles) if tiling else 1
+
+    if tiling and live and len(live) * PAGES_PER_SEARCH * tiles > budget:
+        tiles = budget // (len(live) * PAGES_PER_SEARCH)
+        if tiles < MIN_SPLIT_TILES:
+            tiling, tiles = False, 1
+
+    keep = min(len(live), budget // (PAGES_PER_SEARCH * tiles))
+    kept = set(live[:keep])
+    return ScanPlan(
+        categories=[kw for kw in categories if kw in cached or kw in kept],
+        tiling=tiling,
+        max_tiles=tiles,
+        estimated_calls=keep * PAGES_PER_SEARCH * tiles,
+        remaining=budget,
+        skipped=live[keep:],
+    )
@@ -0,0 +1,77 @@
+import threading
+import time
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket: allows `qps` calls per second on average, with
+    bursts of up to `burst` calls. acquire() blocks the calling thread until
+    a token is free, so concurrent workers share one request budget.
+    A qps of 0 or less disables limiting.
+    """
+
+    def __init__(self, qps, burst=1):
+        self.qps = float(qps)
+        self.burst = max(1, int(burst))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.qps)
+        self._updated = now
+
+    def set_rate(self, qps):
+        """Changes the rate in place; tokens already earned are kept."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.qps = float(qps)
+
+    def try_acquire(self):
+        """Takes a token if one is available right now; returns whether it did."""
+        if self.qps <= 0:
+            return True
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    def acquire(self):
+        """Blocks until a token is available, then takes it."""
+        if self.qps <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.qps
+            time.sleep(wait)
+
+
+class CallBudget:
+    """
+    Thread-safe countdown of the calls one job may still make.
+    take() claims one call and returns False once the budget is spent;
+    a limit of None means unlimited.
+    """
+
+    def __init__(self, limit=None):
+        self.limit = limit
+        self.used = 0
+        self._lock = threading.Lock()
+
+    def take(self):
+        with self._lock:
+            if self.limit is not None and self.used >= self.limit:
+                return False
+            self.used += 1
+            return True
+
+    @property
+    def exhausted(self):
+        return self.limit is not None and self.used >= self.limit
@@ -0,0 +1,38 @@
+import os
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Values that switch an on/off setting off; anything else non-empty switches it on
+FALSE_VALUES = ("0", "false", "no", "off")
+
+
+def env_number(name, default, cast=int, minimum=None):
+    """
+    Reads a numeric setting from the environment, clamped to minimum when given.
+    Unset or malformed values fall back to default.
+    """
+    try:
+        value = cast(os.environ.get(name, default))
+    except (ValueError, TypeError):
+        return default
+    return value if minimum is None else max(minimum, value)
+
+
+def env_flag(name, default):
+    """Reads an on/off setting from the environment; unset or empty means default."""
+    value = (os.environ.get(name) or "").strip().lower()
+    if not value:
+        return default
+    return value not in FALSE_VALUES
+
+
+def new_session(headers=None, pool_connections=1, pool_maxsize=10, schemes=("http://", "https://")):
+    """A keep-alive session with a connection pool sized for its callers."""
+    session = requests.Session()
+    if headers:
+        session.headers.update(headers)
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+    for scheme in schemes:
+        session.mount(scheme, adapter)
+    return session
@@ -0,0 +1,151 @@
+import hashlib
+import json
+import logging
+import os
+import re
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SIGNATURES_FILE = Path(__file__).resolve().parent.parent / "data" / "tech_signatures.json"
+
+
+def trie_pattern(literals):
+    """
+    Builds a regex from a prefix trie of literals, e.g. ["wp-content", "wp-json"] -> "wp\\-(?:content|json)".
+    Alternatives that share a prefix share the match work, so each text position costs
+    roughly one branch per character no matter how many signatures are loaded.
+    """
+    trie = {}
+    for literal in literals:
+        node = trie
+        for char in literal:
+            node = node.setdefault(char, {})
+        node[""] = None  # End-of-literal marker
+
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        # A literal may end here while longer ones continue: make the rest optional (greedy)
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+class LiteralMatcher:
+    """
+    Matches many case-insensitive literals in one regex scan and maps hits back to tech names.
+    Empty literals mean "present": they match any value at all (used for header existence checks).
+    """
+
+    def __init__(self, literal_map):
+        names = {}
+        self.always = set()
+        for literal, literal_names in literal_map.items():
+            if literal:
+                names.setdefault(literal.lower(), set()).update(literal_names)
+            else:
+                self.always.update(literal_names)
+        # A match is the longest literal starting at its position: credit it with
+        # the names of every shorter literal it begins with as well
+        self._names = {
+            literal: set().union(
+                *(names[literal[:end]] for end in range(1, len(literal) + 1) if literal[:end] in names)
+            )
+            for literal in names
+        }
+        self.max_length = max((len(literal) for literal in self._names), default=0)
+        # Case-sensitive over lowercased text: re.IGNORECASE disables the engine's
+        # literal-prefix scan and is several times slower on large pages.
+        self._regex = re.compile(trie_pattern(self._names)) if self._names else None
+
+    def find(self, text):
+        """Returns the set of tech names whose literals occur in text (case-insensitive)."""
+        found = set(self.always)
+        if self._regex and text:
+            text = text.lower()
+            # Overlapping scan: resume one character after each match's start, so a
+            # literal that begins inside another match ("abc" / "bcd") is still seen
+            match = self._regex.search(text)
+            while match:
+                found.update(self._names[match.group()])
+                match = self._regex.search(text, match.start() + 1)
+        return found
+
+
+class SignatureEngine:
+    """
+    Compiled tech-stack fingerprints loaded from a signature database.
+    Each kind (raw HTML, script src, per-header values, cookie names) gets one
+    combined matcher, so per-page cost stays flat as signatures are added.
+    """
+
+    def __init__(self, signatures):
+        self.names = list(signatures)
+        self._order = {name: i for i, name in enumerate(self.names)}
+        # Identifies this database in cached results, so editing it invalidates them
+        self.version = hashlib.sha1(json.dumps(signatures, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+
+        html, script, cookies, headers = {}, {}, {}, {}
+        for name, rules in signatures.items():
+            for literal in rules.get("html", ()):
+                html.setdefault(literal, set()).add(name)
+            for literal in rules.get("script", ()):
+                script.setdefault(literal, set()).add(name)
+            for literal in rules.get("cookies", ()):
+                cookies.setdefault(literal, set()).add(name)
+            for header, literals in rules.get("headers", {}).items():
+                for literal in literals:
+                    headers.setdefault(header.lower(), {}).setdefault(literal, set()).add(name)
+
+        self.html = LiteralMatcher(html)
+        self.script = LiteralMatcher(script)
+        self.cookies = LiteralMatcher(cookies)
+        self.headers = {header: LiteralMatcher(literals) for header, literals in headers.items()}
+
+    @classmethod
+    def from_file(cls, path):
+        """Loads a signature database from a JSON file."""
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def match_html(self, text):
+        return self.html.find(text)
+
+    def match_script(self, src):
+        return self.script.find(src)
+
+    def match_headers(self, headers):
+        """Matches header values and Set-Cookie names against the database."""
+        found = set()
+        for header, matcher in self.headers.items():
+            value = headers.get(header)
+            if value is not None:
+                found |= matcher.find(str(value))
+        cookie_header = headers.get("set-cookie")
+        if cookie_header:
+            found |= self.cookies.find(str(cookie_header))
+        return found
+
+    def ordered(self, names):
+        """Sorts tech names into database order for stable output."""
+        return sorted(names, key=lambda name: self._order.get(name, len(self._order)))
+
+
+def load_engine(path=None):
+    """
+    Builds the engine from TECH_SIGNATURES_FILE (or the bundled database).
+    Falls back to the bundled file if a custom one cannot be read.
+    """
+    path = path or os.environ.get("TECH_SIGNATURES_FILE") or DEFAULT_SIGNATURES_FILE
+    try:
+        return SignatureEngine.from_file(path)
+    except (OSError, ValueError) as e:
+        logger.error(f"Failed to load tech signatures from {path}: {e}")
+        return SignatureEngine.from_file(DEFAULT_SIGNATURES_FILE)
+
+
+# Compiled once at import and shared by every analysis
+ENGINE = load_engine()
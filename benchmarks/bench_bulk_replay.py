@@ -0,0 +1,99 @@
+"""
+Benchmark: bulk analysis throughput against a recorded corpus, with no network.
+
+Runs app.services.bulk.run_bulk_analysis over --leads leads (cycling through the
+sites recorded by benchmarks.record_corpus) with every website request served
+from the corpus and an in-memory SQLite database. Place Details come from a
+pre-seeded details cache, so no Google call is made either. Leads that repeat
+a site share its scan, as they do in production ("shared scans" below).
+
+Usage:
+    python -m benchmarks.bench_bulk_replay --corpus corpus/
+    python -m benchmarks.bench_bulk_replay --corpus corpus/ --latency recorded --workers 16
+    python -m benchmarks.bench_bulk_replay --corpus corpus/ --latency 0.2 --leads 200
+"""
+
+import argparse
+import itertools
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import scoped_session, sessionmaker  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+import app  # noqa: E402
+from app.services.bulk import run_bulk_analysis  # noqa: E402
+from app.services.dns_cache import resolver  # noqa: E402
+from app.services.google_places import details_cache  # noqa: E402
+from app.services.http_replay import HttpCorpus, replaying  # noqa: E402
+
+
+def parse_latency(value):
+    if value in (None, "none", "0"):
+        return None
+    return value if value == "recorded" else float(value)
+
+
+def setup_db():
+    """Points the app at a fresh in-memory database shared by every thread."""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    app.db_session = scoped_session(sessionmaker(autocommit=False, autoflush=False, bind=engine))
+    app.Base.query = app.db_session.query_property()
+    app.sync_schema(engine)
+    return app.db_session
+
+
+def seed_leads(db, urls):
+    """Adds one scraped lead per URL, with its Place Details already cached. Returns the lead ids."""
+    from app.models.lead import Lead
+
+    leads = []
+    for i, url in enumerate(urls):
+        place_id = f"bench-{i}"
+        details_cache.set(place_id, {"name": f"Lead {i}", "website": url})
+        leads.append(Lead(place_id=place_id, name=f"Lead {i}", website_url=url))
+    db.add_all(leads)
+    db.commit()
+    return [lead.id for lead in leads]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", required=True, help="Corpus directory from benchmarks.record_corpus")
+    parser.add_argument("--leads", type=int, default=0, help="Leads to simulate (default: one per recorded site)")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--per-host", type=int, default=2)
+    parser.add_argument("--latency", default=None, help="none, recorded, or fixed seconds per request")
+    args = parser.parse_args()
+
+    seeds = HttpCorpus(args.corpus).seeds()
+    if not seeds:
+        sys.exit(f"No seeds in {args.corpus}; record one with benchmarks.record_corpus")
+    urls = list(itertools.islice(itertools.cycle(seeds), args.leads or len(seeds)))
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        os.environ["CACHE_DIR"] = cache_dir  # Cold page cache: every site does a full fetch
+        resolver.clear()
+        db = setup_db()
+        lead_ids = seed_leads(db, urls)
+        with replaying(args.corpus, latency=parse_latency(args.latency)) as adapter:
+            start = time.perf_counter()
+            result = run_bulk_analysis(lead_ids, max_workers=args.workers, per_host=args.per_host)
+            wall = time.perf_counter() - start
+        db.remove()
+
+    print(f"Leads: {len(urls)} ({len(seeds)} recorded sites) | workers {args.workers} | latency {args.latency}")
+    print(
+        f"Wall: {wall:.2f}s | {len(urls) / wall:.1f} leads/s | saved {result.processed} | "
+        f"errors {result.errors} | shared scans {result.fetches_saved} | corpus misses {adapter.misses}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Benchmark: single-pass HTML feature extractor vs. the legacy BeautifulSoup path.
+
+Reports per-page CPU time and peak traced memory for each approach.
+
+Usage:
+    python -m benchmarks.bench_html_extractor                  # synthetic pages
+    python -m benchmarks.bench_html_extractor --pages DIR      # every *.html file in DIR
+    python -m benchmarks.bench_html_extractor --corpus DIR     # HTML bodies from a replay corpus
+    python -m benchmarks.bench_html_extractor --backend lxml   # optional faster backend
+"""
+
+import argparse
+import re
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+from app.services.html_features import HtmlFeatureExtractor, resolve_backend  # noqa: E402
+from app.services.http_replay import HttpCorpus  # noqa: E402
+
+
+def legacy_extract(html):
+    """The pre-extractor analyzer path: soup tree, lowercase copy, get_text and two regexes."""
+    soup = BeautifulSoup(html, "html.parser")
+    html_content = html.lower()
+
+    stack = []
+    if "wp-content" in html_content:
+        stack.append("WordPress")
+    if "wix.com" in html_content or "_wix_" in html_content:
+        stack.append("Wix")
+    if "squarespace" in html_content:
+        stack.append("Squarespace")
+    if "shopify" in html_content:
+        stack.append("Shopify")
+    if "go daddy" in html_content or "godaddy" in html_content:
+        stack.append("GoDaddy")
+
+    viewport = soup.find("meta", attrs={"name": "viewport"})
+    mobile = bool(viewport and "width=device-width" in str(viewport.get("content", "")).lower())
+
+    text_content = soup.get_text()
+    contact = bool(
+        re.search(r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}", text_content)
+        or re.search(r"\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}", text_content)
+    )
+    match = re.search(r"(?:Copyright|©).*?(\d{4})", text_content[-2000:], re.IGNORECASE | re.DOTALL)
+    return {
+        "mobile_viewport": mobile,
+        "contact_info_found": contact,
+        "copyright_year": int(match.group(1)) if match else None,
+        "tech_stack": stack,
+    }
+
+
+def extractor_extract(html, backend, chunk_size=16384):
+    """The new path, fed in network-sized chunks like the streaming fetch does."""
+    extractor = HtmlFeatureExtractor(backend=backend)
+    for i in range(0, len(html), chunk_size):
+        extractor.feed(html[i : i + chunk_size])
+    features = extractor.close()
+    for key in ("links", "email", "phone"):  # Not produced by the legacy path
+        features.pop(key)
+    return features
+
+
+def synthetic_page(target_kb):
+    """Builds a small-business-style page of roughly target_kb kilobytes."""
+    head = (
+        "<html><head><title>Joe's Plumbing</title>"
+        '<meta name="viewport" content="width=device-width, initial-scale=1">'
+        '<link rel="stylesheet" href="/wp-content/themes/plumb/style.css">'
+        "<script>var config = {tracking: true, phone: null};</script></head><body>"
+    )
+    block = (
+        '<div class="service"><h2>Drain Cleaning</h2><p>We clear clogged drains, sewer lines and '
+        'more across the county. <a href="/services/drains">Learn more</a></p>'
+        '<img src="/wp-content/uploads/drain.jpg" alt="drain"></div>\n'
+    )
+    footer = "<footer><p>Call (555) 123-4567 · info@joesplumbing.example</p><p>© 2019 Joe's Plumbing</p></footer>"
+    repeats = max(1, (target_kb * 1024) // len(block))
+    return head + block * repeats + footer + "</body></html>"
+
+
+def measure(fn, html, iterations):
+    """Returns (cpu_ms_per_page, peak_kb) for fn over one page."""
+    start = time.process_time()
+    for _ in range(iterations):
+        fn(html)
+    cpu_ms = (time.process_time() - start) * 1000 / iterations
+
+    tracemalloc.start()
+    fn(html)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return cpu_ms, peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", help="Directory of saved .html pages to benchmark")
+    parser.add_argument("--corpus", help="Replay corpus directory (see benchmarks.record_corpus)")
+    parser.add_argument("--backend", default=None, help="Extractor backend (html.parser or lxml)")
+    parser.add_argument("--iterations", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.pages:
+        pages = [(p.name, p.read_text(errors="replace")) for p in sorted(Path(args.pages).glob("*.html"))]
+    elif args.corpus:
+        pages = list(HttpCorpus(args.corpus).html_pages())
+    else:
+        pages = [(f"synthetic-{kb}kb", synthetic_page(kb)) for kb in (50, 500, 2000)]
+
+    backend = resolve_backend(args.backend)
+    print(f"Extractor backend: {backend}\n")
+    print(f"{'page':<28}{'size':>10}{'legacy ms':>12}{'new ms':>10}{'legacy KB':>12}{'new KB':>10}  match")
+
+    for name, html in pages:
+        legacy_cpu, legacy_mem = measure(legacy_extract, html, args.iterations)
+        new_cpu, new_mem = measure(lambda h: extractor_extract(h, backend), html, args.iterations)
+        same = legacy_extract(html) == extractor_extract(html, backend)
+        print(
+            f"{name[:27]:<28}{len(html) // 1024:>8}KB{legacy_cpu:>12.1f}{new_cpu:>10.1f}"
+            f"{legacy_mem:>12.0f}{new_mem:>10.0f}  {'yes' if same else 'DIFF'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Benchmark: end-to-end Omni-Search scans against the local mock Places server.
+
+Streams full /search scans (NDJSON) through the Flask app with a fresh SQLite
+file database, with Google served by app.services.mock_places, and reports
+leads per second, time spent in the database and API calls per lead.
+Each scan searches a new area, so every lead is new and no checkpoint resumes.
+
+Usage:
+    python -m benchmarks.bench_scan                                  # 3 scans, 20 categories
+    python -m benchmarks.bench_scan --categories 40 --latency 0.1 --jitter 0.1
+    python -m benchmarks.bench_scan --results 60 --tiling --error-rate 0.05
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import event  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.services import google_places  # noqa: E402
+from app.services.google_places import DEFAULT_OMNI_CATEGORIES  # noqa: E402
+from app.services.mock_places import serving  # noqa: E402
+
+
+class DbTimer:
+    """Wall time spent in SQL statements and commits on one engine."""
+
+    def __init__(self, engine):
+        self.seconds = 0.0
+        self.commits = 0
+        self._in_commit = False
+        event.listen(engine, "before_cursor_execute", self._before_statement)
+        event.listen(engine, "after_cursor_execute", self._after_statement)
+        event.listen(Session, "before_commit", self._before_commit)
+        event.listen(Session, "after_commit", self._after_commit)
+
+    def _before_statement(self, conn, cursor, statement, parameters, context, executemany):
+        context._bench_start = time.perf_counter()
+
+    def _after_statement(self, conn, cursor, statement, parameters, context, executemany):
+        if not self._in_commit:  # Flushes are already inside the commit span
+            self.seconds += time.perf_counter() - context._bench_start
+
+    def _before_commit(self, session):
+        self._in_commit = True
+        self._commit_start = time.perf_counter()
+
+    def _after_commit(self, session):
+        self._in_commit = False
+        self.commits += 1
+        self.seconds += time.perf_counter() - self._commit_start
+
+
+def run_scan(client, lat, args):
+    """Streams one /search scan; returns (total_scanned, new_leads)."""
+    os.environ["DEFAULT_LAT"] = str(lat)
+    form = {"keyword": "business", "radius": str(args.radius)}
+    if args.tiling:
+        form["tiling"] = "1"
+    response = client.post("/search", data=form, buffered=False)
+    done = {}
+    for line in response.response:
+        message = json.loads(line)
+        if message["type"] == "done":
+            done = message
+    response.close()
+    return done.get("total_scanned", 0), done.get("new_leads", 0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scans", type=int, default=3)
+    parser.add_argument("--categories", type=int, default=20)
+    parser.add_argument("--radius", type=int, default=5000)
+    parser.add_argument("--results", type=int, default=60, help="Places per Nearby Search (20 per page)")
+    parser.add_argument("--overlap", type=float, default=0.2, help="Share of results common to all categories")
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds per mock API call")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--token-delay", type=float, default=0.0, help="Page-token activation delay (Google: 2s)")
+    parser.add_argument("--workers", type=int, default=google_places.DEFAULT_SEARCH_WORKERS)
+    parser.add_argument("--qps", type=float, default=0, help="GOOGLE_PLACES_QPS (0: unlimited)")
+    parser.add_argument("--tiling", action="store_true")
+    args = parser.parse_args()
+
+    categories = (DEFAULT_OMNI_CATEGORIES * (args.categories // len(DEFAULT_OMNI_CATEGORIES) + 1))[: args.categories]
+    google_places.PAGE_TOKEN_DELAY = args.token_delay
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        os.environ.update(
+            {
+                "CACHE_DIR": work_dir,
+                "DATABASE_URI": f"sqlite:///{work_dir}/bench.db",
+                "GOOGLE_PLACES_API_KEY": "bench-key",
+                "GOOGLE_PLACES_QPS": str(args.qps),
+                "GOOGLE_NEARBY_MONTHLY_LIMIT": str(10**9),
+                "NEARBY_CACHE_TTL": "0",
+                "OMNI_SEARCH_CATEGORIES": ",".join(dict.fromkeys(categories)),
+                "OMNI_SEARCH_WORKERS": str(args.workers),
+            }
+        )
+        import app as app_module
+
+        flask_app = app_module.create_app()
+        db_timer = DbTimer(app_module.db_session.get_bind())
+        client = flask_app.test_client()
+
+        with serving(
+            results=args.results,
+            overlap=args.overlap,
+            latency=args.latency,
+            jitter=args.jitter,
+            error_rate=args.error_rate,
+            token_delay=args.token_delay,
+        ) as places:
+            scanned = new = 0
+            start = time.perf_counter()
+            for i in range(args.scans):
+                found, added = run_scan(client, 37.0 + i * 0.5, args)
+                scanned += found
+                new += added
+            wall = time.perf_counter() - start
+
+    calls = places.calls["nearby"]
+    print(
+        f"Scans: {args.scans} x {len(set(categories))} categories | {args.results} results/search"
+        f" | latency {args.latency}s | workers {args.workers} | tiling {args.tiling}"
+    )
+    print(f"Wall: {wall:.2f}s | {scanned / wall:.1f} leads/s | {scanned} leads ({new} new)")
+    print(
+        f"DB: {db_timer.seconds:.2f}s ({db_timer.seconds / wall:.0%} of wall) over {db_timer.commits} commits"
+        f" | {db_timer.seconds * 1000 / max(1, new):.2f}ms per new lead"
+    )
+    print(f"API: {calls} Nearby calls ({places.errors} injected errors) | {calls / max(1, scanned):.2f} calls/lead")
+
+
+if __name__ == "__main__":
+    main()
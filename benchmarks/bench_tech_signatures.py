@@ -0,0 +1,85 @@
+"""
+Microbenchmark: compiled tech-signature engine vs. a chain of `in` checks.
+
+Scales the bundled signature database with synthetic platforms to show how
+per-page cost grows with the number of signatures for each approach.
+
+Usage:
+    python -m benchmarks.bench_tech_signatures                # synthetic pages
+    python -m benchmarks.bench_tech_signatures --pages DIR    # every *.html file in DIR
+"""
+
+import argparse
+import json
+import random
+import string
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.tech_signatures import DEFAULT_SIGNATURES_FILE, SignatureEngine  # noqa: E402
+from benchmarks.bench_html_extractor import synthetic_page  # noqa: E402
+
+
+def scaled_signatures(total):
+    """Bundled signatures padded with random synthetic platforms up to `total` entries."""
+    with open(DEFAULT_SIGNATURES_FILE, encoding="utf-8") as f:
+        signatures = json.load(f)
+    rng = random.Random(42)
+    while len(signatures) < total:
+        token = "".join(rng.choices(string.ascii_lowercase, k=8))
+        signatures[f"Platform {token}"] = {"html": [f"{token}.cdn-site.com", f"data-{token}-id"]}
+    return signatures
+
+
+def chained_in(signatures):
+    """The legacy approach generalized: lowercase the page, then one `in` scan per literal."""
+    rules = [(name, rule.get("html", [])) for name, rule in signatures.items()]
+
+    def detect(html):
+        lowered = html.lower()
+        return {name for name, literals in rules if any(literal.lower() in lowered for literal in literals)}
+
+    return detect
+
+
+def per_page_ms(detect, pages, iterations):
+    start = time.process_time()
+    for _ in range(iterations):
+        for html in pages:
+            detect(html)
+    return (time.process_time() - start) * 1000 / (iterations * len(pages))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", help="Directory of saved .html pages (the corpus)")
+    parser.add_argument("--iterations", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.pages:
+        pages = [p.read_text(errors="replace") for p in sorted(Path(args.pages).glob("*.html"))]
+    else:
+        pages = [synthetic_page(kb) for kb in (30, 80, 250)]
+    if not pages:
+        sys.exit("No pages found")
+
+    total_kb = sum(len(p) for p in pages) // 1024
+    print(f"Corpus: {len(pages)} pages, {total_kb} KB\n")
+    print(f"{'signatures':>10}{'chained in (ms/page)':>24}{'engine (ms/page)':>20}  same result")
+
+    for total in (30, 100, 300, 1000):
+        signatures = scaled_signatures(total)
+        engine = SignatureEngine(signatures)
+        legacy = chained_in(signatures)
+        same = all(legacy(html) == engine.match_html(html) for html in pages)
+        print(
+            f"{len(signatures):>10}{per_page_ms(legacy, pages, args.iterations):>24.2f}"
+            f"{per_page_ms(engine.match_html, pages, args.iterations):>20.2f}  {'yes' if same else 'DIFF'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
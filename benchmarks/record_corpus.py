@@ -0,0 +1,52 @@
+"""
+Records a replay corpus: analyzes real websites once with the network and
+saves every HTTP exchange (plus TLS probes) for offline benchmarks.
+
+Usage:
+    python -m benchmarks.record_corpus --corpus corpus/ https://example.com joes.com
+    python -m benchmarks.record_corpus --corpus corpus/ --urls-file sites.txt
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.analyzer import analyze_url  # noqa: E402
+from app.services.http_replay import HttpCorpus, recording  # noqa: E402
+from app.services.pipeline import run_site_stages  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("urls", nargs="*", help="Website URLs to analyze")
+    parser.add_argument("--urls-file", help="File with one URL per line")
+    parser.add_argument("--corpus", required=True, help="Corpus directory to write")
+    args = parser.parse_args()
+
+    urls = list(args.urls)
+    if args.urls_file:
+        urls += [line.strip() for line in Path(args.urls_file).read_text().splitlines() if line.strip()]
+    if not urls:
+        parser.error("no URLs given")
+
+    # Start from an empty page cache so every page is fetched in full
+    with tempfile.TemporaryDirectory() as cache_dir:
+        os.environ["CACHE_DIR"] = cache_dir
+        with recording(args.corpus):
+            for url in urls:
+                start = time.perf_counter()
+                analysis = run_site_stages(analyze_url(url))
+                outcome = analysis.get("error") or f"status {analysis.get('status_code')}"
+                print(f"{url:<50} {outcome:<40} {(time.perf_counter() - start) * 1000:>8.0f}ms")
+
+    HttpCorpus(args.corpus).add_seeds(urls)
+    print(f"\nRecorded {len(urls)} sites into {args.corpus}")
+
+
+if __name__ == "__main__":
+    main()
@@ -15,6 +15,34 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from app import Base
 
 
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path, monkeypatch):
+    """Keeps on-disk caches written during tests out of the working tree."""
+    monkeypatch.setenv("CACHE_DIR", str(tmp_path / "cache"))
+
+
+@pytest.fixture(autouse=True)
+def fresh_dns_cache():
+    """Resets the process-wide resolver cache between tests."""
+    from app.services.dns_cache import resolver
+
+    resolver.clear()
+    yield
+    resolver.clear()
+
+
+@pytest.fixture(autouse=True)
+def fresh_usage_counts():
+    """Drops usage counts and cached navbar stats held in memory between tests."""
+    from app.models import config
+
+    config._pending.clear()
+    config._invalidate_stats()
+    yield
+    config._pending.clear()
+    config._invalidate_stats()
+
+
 @pytest.fixture(scope="function")
 def test_db():
     """Creates an in-memory SQLite database for testing."""
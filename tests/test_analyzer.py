@@ -3,9 +3,32 @@ Tests for the website analyzer service.
 Critical path: SSL verification, heuristics detection.
 """
 
+import ssl
+from datetime import datetime
 from unittest.mock import MagicMock, patch
 
-from app.services.analyzer import analyze_url, check_ssl_valid
+import pytest
+
+from app.services.analyzer import analyze_url, candidate_urls, check_ssl_valid, probe_url, tls_info_from_response
+
+
+def _mock_response(text, url="http://example.com", status_code=200, headers=None):
+    """Builds a streaming response mock that serves text through iter_content."""
+    response = MagicMock()
+    response.status_code = status_code
+    response.url = url
+    response.encoding = "utf-8"
+    response.headers = {"Content-Type": "text/html; charset=utf-8"} if headers is None else headers
+    response.iter_content.return_value = [text.encode("utf-8")]
+    return response
+
+
+@pytest.fixture
+def no_tls_probe():
+    """Stubs the port-443 probe that plain-HTTP analyses run."""
+    with patch("app.services.analyzer.get_ssl_info") as mock_probe:
+        mock_probe.return_value = {"valid": False, "issuer": None, "expires_at": None, "protocol": None}
+        yield mock_probe
 
 
 class TestSSLVerification:
@@ -32,6 +55,50 @@ class TestSSLVerification:
         assert result is True
 
 
+class TestTLSFromFetchConnection:
+    """Tests for reading certificate details off the fetch's own connection."""
+
+    def test_reads_cert_details_from_response_socket(self):
+        """Should extract issuer, expiry and protocol from the live TLS socket."""
+        sock = MagicMock(spec=ssl.SSLSocket)
+        sock.version.return_value = "TLSv1.3"
+        sock.getpeercert.return_value = {
+            "issuer": ((("countryName", "US"),), (("organizationName", "Let's Encrypt"),)),
+            "notAfter": "Jan 15 12:00:00 2027 GMT",
+        }
+        response = MagicMock()
+        response.raw.connection.sock = sock
+
+        info = tls_info_from_response(response)
+
+        assert info == {"issuer": "Let's Encrypt", "expires_at": datetime(2027, 1, 15, 12, 0), "protocol": "TLSv1.3"}
+
+    @patch("app.services.analyzer.get_ssl_info")
+    @patch("app.services.analyzer.requests.get")
+    def test_verified_https_fetch_skips_second_handshake(self, mock_get, mock_probe):
+        """Should trust the verified fetch and never open a separate TLS probe."""
+        mock_get.return_value = _mock_response("<html></html>", url="https://example.com/")
+
+        result = analyze_url("https://example.com")
+
+        assert result["ssl_active"] is True
+        mock_probe.assert_not_called()
+
+    @patch("app.services.analyzer.get_ssl_info")
+    @patch("app.services.analyzer.requests.get")
+    def test_plain_http_fetch_probes_port_443(self, mock_get, mock_probe):
+        """Should probe for an unused certificate only when the site was served over HTTP."""
+        mock_probe.return_value = {"valid": True, "issuer": "R3", "expires_at": None, "protocol": "TLSv1.2"}
+        mock_get.return_value = _mock_response("<html></html>", url="http://example.com/")
+
+        result = analyze_url("http://example.com")
+
+        mock_probe.assert_called_once_with("example.com")
+        assert result["ssl_active"] is False
+        assert result["ssl_issuer"] == "R3"
+
+
+@pytest.mark.usefixtures("no_tls_probe")
 class TestAnalyzeUrl:
     """Tests for the main URL analysis function."""
 
@@ -47,29 +114,55 @@ class TestAnalyzeUrl:
         assert result["exists"] is False
         assert result["error"] == "No URL provided"
 
-    def test_analyze_url_adds_http_scheme(self):
-        """Should add http:// to URLs without scheme."""
+    @patch.dict("os.environ", {"ANALYZER_PROBE_MODE": "sequential"})
+    def test_analyze_url_probes_both_schemes_for_scheme_less_urls(self):
+        """Should try https:// then http:// for URLs without scheme, preferring HTTPS."""
+        import requests
+
+        def fetch(url, **kwargs):
+            if url.startswith("https://refused."):
+                raise requests.exceptions.ConnectionError("Connection refused")
+            return _mock_response("<html></html>", url=url)
+
         with patch("app.services.analyzer.requests.get") as mock_get:
-            mock_response = MagicMock()
-            mock_response.status_code = 200
-            mock_response.url = "http://example.com"
-            mock_response.text = "<html></html>"
-            mock_get.return_value = mock_response
+            mock_get.side_effect = fetch
+
+            assert analyze_url("example.com")["final_url"] == "https://example.com"
+            assert analyze_url("refused.example")["final_url"] == "http://refused.example"
 
-            analyze_url("example.com")
+            assert [call.args[0] for call in mock_get.call_args_list] == [
+                "https://example.com",
+                "https://refused.example",
+                "http://refused.example",
+            ]
 
-            # First call should be to http://example.com
-            call_args = mock_get.call_args_list[0]
-            assert call_args[0][0] == "http://example.com"
+    @patch.dict("os.environ", {"ANALYZER_PROBE_MODE": "sequential"})
+    def test_analyze_url_prefers_working_http_over_unverified_https(self):
+        """Should use http:// when https:// only loads with certificate verification off."""
+        import requests
+
+        def fetch(url, **kwargs):
+            if url.startswith("https://"):
+                if kwargs.get("verify", True):
+                    raise requests.exceptions.SSLError("certificate verify failed")
+                return _mock_response("<html><title>cPanel</title></html>", url=url)
+            return _mock_response("<html><title>Plumbing</title></html>", url=url)
+
+        with patch("app.services.analyzer.requests.get") as mock_get:
+            mock_get.side_effect = fetch
+            result = analyze_url("example.com")
+
+        assert result["final_url"] == "http://example.com"
+        assert [call.args[0] for call in mock_get.call_args_list] == [
+            "https://example.com",
+            "https://example.com",
+            "http://example.com",
+        ]
 
     @patch("app.services.analyzer.requests.get")
     def test_analyze_url_detects_wordpress(self, mock_get):
         """Should detect WordPress from wp-content in HTML."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.url = "http://example.com"
-        mock_response.text = '<html><link href="/wp-content/themes/theme.css"></html>'
-        mock_get.return_value = mock_response
+        mock_get.return_value = _mock_response('<html><link href="/wp-content/themes/theme.css"></html>')
 
         result = analyze_url("http://example.com")
 
@@ -78,11 +171,7 @@ class TestAnalyzeUrl:
     @patch("app.services.analyzer.requests.get")
     def test_analyze_url_detects_wix(self, mock_get):
         """Should detect Wix from wix.com in HTML."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.url = "http://example.com"
-        mock_response.text = '<html><script src="https://static.wix.com/script.js"></script></html>'
-        mock_get.return_value = mock_response
+        mock_get.return_value = _mock_response('<html><script src="https://static.wix.com/script.js"></script></html>')
 
         result = analyze_url("http://example.com")
 
@@ -91,13 +180,9 @@ class TestAnalyzeUrl:
     @patch("app.services.analyzer.requests.get")
     def test_analyze_url_detects_mobile_viewport(self, mock_get):
         """Should detect mobile-optimized viewport meta tag."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.url = "http://example.com"
-        mock_response.text = (
+        mock_get.return_value = _mock_response(
             '<html><head><meta name="viewport" content="width=device-width, initial-scale=1"></head></html>'
         )
-        mock_get.return_value = mock_response
 
         result = analyze_url("http://example.com")
 
@@ -106,11 +191,7 @@ class TestAnalyzeUrl:
     @patch("app.services.analyzer.requests.get")
     def test_analyze_url_detects_contact_email(self, mock_get):
         """Should detect email addresses in page content."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.url = "http://example.com"
-        mock_response.text = "<html><body>Contact us at info@example.com</body></html>"
-        mock_get.return_value = mock_response
+        mock_get.return_value = _mock_response("<html><body>Contact us at info@example.com</body></html>")
 
         result = analyze_url("http://example.com")
 
@@ -119,11 +200,7 @@ class TestAnalyzeUrl:
     @patch("app.services.analyzer.requests.get")
     def test_analyze_url_detects_contact_phone(self, mock_get):
         """Should detect phone numbers in page content."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.url = "http://example.com"
-        mock_response.text = "<html><body>Call us: (555) 123-4567</body></html>"
-        mock_get.return_value = mock_response
+        mock_get.return_value = _mock_response("<html><body>Call us: (555) 123-4567</body></html>")
 
         result = analyze_url("http://example.com")
 
@@ -132,11 +209,7 @@ class TestAnalyzeUrl:
     @patch("app.services.analyzer.requests.get")
     def test_analyze_url_extracts_copyright_year(self, mock_get):
         """Should extract copyright year from page footer."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.url = "http://example.com"
-        mock_response.text = "<html><body><footer>© 2024 Example Corp</footer></body></html>"
-        mock_get.return_value = mock_response
+        mock_get.return_value = _mock_response("<html><body><footer>© 2024 Example Corp</footer></body></html>")
 
         result = analyze_url("http://example.com")
 
@@ -165,3 +238,222 @@ class TestAnalyzeUrl:
 
         assert result["exists"] is False
         assert result["error"] == "Timeout"
+
+
+@pytest.mark.usefixtures("no_tls_probe")
+class TestStreamingFetch:
+    """Tests for the bounded streaming fetch."""
+
+    @patch("app.services.analyzer.requests.get")
+    def test_stops_reading_at_byte_cap(self, mock_get):
+        """Should stop consuming the body once the byte cap is reached."""
+        chunks = [b"<html><body>" + b"x" * 16384 for _ in range(10)]
+        response = _mock_response("")
+        response.iter_content.return_value = iter(chunks)
+        mock_get.return_value = response
+
+        with patch.dict("os.environ", {"ANALYZER_MAX_BYTES": "32768"}):
+            result = analyze_url("http://example.com")
+
+        assert any("capped" in log for log in result["logs"])
+        assert len(list(response.iter_content.return_value)) == 8  # Remaining chunks never read
+
+    @patch("app.services.analyzer.requests.get")
+    def test_skips_body_for_non_html_content(self, mock_get):
+        """Should not read the body of images, PDFs and other media."""
+        response = _mock_response("", headers={"Content-Type": "application/pdf"})
+        mock_get.return_value = response
+
+        result = analyze_url("http://example.com")
+
+        response.iter_content.assert_not_called()
+        assert result["exists"] is True
+        assert result["tech_stack"] is None
+
+    @patch("app.services.analyzer.requests.get")
+    def test_detects_tech_from_headers(self, mock_get):
+        """Should fingerprint platforms from response headers before the body."""
+        mock_get.return_value = _mock_response(
+            "<html><body>Hello</body></html>",
+            headers={"Content-Type": "text/html", "link": '<https://example.com/wp-json/>; rel="https://api.w.org/"'},
+        )
+
+        result = analyze_url("http://example.com")
+
+        assert result["tech_stack"] == "WordPress"
+
+    @patch("app.services.analyzer.requests.get")
+    def test_records_ttfb_separately_from_load_time(self, mock_get):
+        """Should report TTFB and a load time that includes the body download."""
+        mock_get.return_value = _mock_response("<html></html>")
+
+        result = analyze_url("http://example.com")
+
+        assert result["ttfb"] is not None
+        assert result["load_time"] >= result["ttfb"]
+        assert mock_get.call_args.kwargs["stream"] is True
+
+
+@pytest.mark.usefixtures("no_tls_probe")
+class TestConditionalCache:
+    """Tests for conditional re-analysis against the on-disk page cache."""
+
+    PAGE = '<html><head><meta name="viewport" content="width=device-width"></head><body>© 2022</body></html>'
+
+    @patch("app.services.analyzer.requests.get")
+    def test_revalidates_with_etag_and_reuses_analysis_on_304(self, mock_get):
+        """Should send If-None-Match and reuse stored features on 304 Not Modified."""
+        mock_get.return_value = _mock_response(self.PAGE, headers={"Content-Type": "text/html", "ETag": '"v1"'})
+        first = analyze_url("http://example.com")
+
+        not_modified = _mock_response("", status_code=304)
+        mock_get.return_value = not_modified
+        second = analyze_url("http://example.com")
+
+        assert mock_get.call_args.kwargs["headers"]["If-None-Match"] == '"v1"'
+        not_modified.iter_content.assert_not_called()
+        assert second["status_code"] == 200
+        assert second["mobile_viewport"] is True
+        assert second["copyright_year"] == first["copyright_year"] == 2022
+
+    @patch("app.services.analyzer.requests.get")
+    def test_skips_parsing_when_content_hash_matches(self, mock_get):
+        """Should reuse stored features when a validator-less page is byte-identical."""
+        from app.services.html_features import HtmlFeatureExtractor
+
+        mock_get.return_value = _mock_response(self.PAGE)
+        analyze_url("http://example.com")
+
+        mock_get.return_value = _mock_response(self.PAGE)
+        with patch.object(HtmlFeatureExtractor, "feed") as mock_feed:
+            result = analyze_url("http://example.com")
+
+        assert result["mobile_viewport"] is True
+        assert any("unchanged" in log for log in result["logs"])
+        assert not any(call.args[0] for call in mock_feed.call_args_list)  # Only the empty decoder flush
+
+    @patch("app.services.analyzer.requests.get")
+    def test_entries_from_another_version_are_misses(self, mock_get):
+        """Should refetch and reparse when the signatures or extractor changed since the entry was stored."""
+        mock_get.return_value = _mock_response(self.PAGE, headers={"Content-Type": "text/html", "ETag": '"v1"'})
+        analyze_url("http://example.com")
+
+        mock_get.return_value = _mock_response(self.PAGE)
+        with patch("app.services.analyzer.PAGE_CACHE_VERSION", "0-stale"):
+            result = analyze_url("http://example.com")
+
+        assert "If-None-Match" not in mock_get.call_args.kwargs["headers"]
+        assert not any("reusing cached analysis" in log for log in result["logs"])
+        assert result["mobile_viewport"] is True
+
+
+class TestUrlProbing:
+    """Tests for racing deep-link / root / scheme variants."""
+
+    def test_candidate_order(self):
+        """Should prefer the deep link over the root, and HTTPS over HTTP for scheme-less input."""
+        assert candidate_urls("https://joes.com/menu") == ["https://joes.com/menu", "https://joes.com/"]
+        assert candidate_urls("http://joes.com") == ["http://joes.com"]
+        assert candidate_urls("joes.com/menu") == [
+            "https://joes.com/menu",
+            "http://joes.com/menu",
+            "https://joes.com/",
+            "http://joes.com/",
+        ]
+
+    @patch("app.services.analyzer.requests.get")
+    def test_slow_deep_link_loses_to_root(self, mock_get):
+        """Should not wait out a hanging deep link once the root has answered."""
+        import time
+
+        from app.services import analyzer
+
+        def fetch(url, **kwargs):
+            if url.endswith("/menu"):
+                time.sleep(0.5)
+            return _mock_response("<html></html>", url=url)
+
+        mock_get.side_effect = fetch
+        with patch.object(analyzer, "PROBE_GRACE", 0.05):
+            start = time.monotonic()
+            probe, tried = probe_url("https://joes.com/menu", mode="race")
+
+        assert probe.url == "https://joes.com/"
+        assert tried == 2
+        assert time.monotonic() - start < 0.4
+
+    @patch("app.services.analyzer.requests.get")
+    def test_preferred_candidate_wins_within_grace(self, mock_get):
+        """Should keep the deep link when it answers shortly after the root."""
+        import time
+
+        def fetch(url, **kwargs):
+            if url.endswith("/menu"):
+                time.sleep(0.05)
+            return _mock_response("<html></html>", url=url)
+
+        mock_get.side_effect = fetch
+        probe, _ = probe_url("https://joes.com/menu", mode="race")
+
+        assert probe.url == "https://joes.com/menu"
+
+    @pytest.mark.parametrize("mode", ["race", "sequential"])
+    @patch("app.services.analyzer.requests.get")
+    def test_deep_link_404_falls_back_to_root_and_closes_loser(self, mock_get, mode):
+        responses = {
+            "https://joes.com/menu": _mock_response("", url="https://joes.com/menu", status_code=404),
+            "https://joes.com/": _mock_response("<html></html>", url="https://joes.com/"),
+        }
+        mock_get.side_effect = lambda url, **kwargs: responses[url]
+
+        probe, _ = probe_url("https://joes.com/menu", mode=mode)
+
+        assert probe.url == "https://joes.com/"
+        responses["https://joes.com/menu"].close.assert_called_once()
+        responses["https://joes.com/"].close.assert_not_called()
+
+    @patch("app.services.analyzer.requests.get")
+    def test_race_stays_within_host_slots(self, mock_get):
+        """Should race only as wide as the host limiter has free slots, and return them afterwards."""
+        import threading
+        import time
+
+        from app.services.host_limits import HostLimiter
+
+        active = {"now": 0, "peak": 0}
+        lock = threading.Lock()
+
+        def fetch(url, **kwargs):
+            with lock:
+                active["now"] += 1
+                active["peak"] = max(active["peak"], active["now"])
+            time.sleep(0.02)
+            with lock:
+                active["now"] -= 1
+            return _mock_response("", url=url, status_code=404)
+
+        mock_get.side_effect = fetch
+        limiter = HostLimiter(per_host=2)
+        with limiter.limit("joes.com"):
+            _, tried = probe_url("joes.com/menu", mode="race", host_limiter=limiter)
+            assert tried == 4
+            assert active["peak"] == 2
+
+            # With the only other slot taken, the candidates are tried one at a time
+            with limiter.limit("joes.com"):
+                active["peak"] = 0
+                probe_url("joes.com/menu", mode="race", host_limiter=limiter)
+                assert active["peak"] == 1
+
+        assert limiter.try_acquire("joes.com", 2) == 2
+
+    @patch("app.services.analyzer.requests.get")
+    def test_all_candidates_failing_reraises_preferred_error(self, mock_get):
+        import requests
+
+        mock_get.side_effect = lambda url, **kwargs: (_ for _ in ()).throw(
+            requests.exceptions.Timeout() if url.endswith("/menu") else requests.exceptions.ConnectionError()
+        )
+
+        with pytest.raises(requests.exceptions.Timeout):
+            probe_url("https://joes.com/menu", mode="race")
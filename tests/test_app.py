@@ -0,0 +1,26 @@
+"""
+Tests for application bootstrap helpers.
+Critical path: Schema sync for databases created by older versions.
+"""
+
+from sqlalchemy import create_engine, inspect, text
+
+from app import sync_schema
+
+
+class TestSyncSchema:
+    """Tests for the lightweight schema upgrade."""
+
+    def test_adds_columns_missing_from_existing_table(self, tmp_path):
+        """Should add new model columns to a table created by an older version."""
+        engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE leads (id INTEGER PRIMARY KEY, place_id VARCHAR(255), name VARCHAR(255))"))
+            conn.execute(text("INSERT INTO leads (place_id, name) VALUES ('p1', 'Joe')"))
+
+        sync_schema(engine)
+
+        columns = {column["name"] for column in inspect(engine).get_columns("leads")}
+        assert {"ttfb", "load_time", "status"} <= columns
+        with engine.connect() as conn:
+            assert conn.execute(text("SELECT name FROM leads")).scalar() == "Joe"
@@ -0,0 +1,206 @@
+"""
+Tests for the concurrent bulk analysis engine.
+Critical path: Per-host limits, serialized writes, error accounting.
+"""
+
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.models.lead import LeadStatus
+from app.services.bulk import HostLimiter, run_bulk_analysis, site_key
+
+
+def _mock_lead(lead_id, website_url):
+    lead = MagicMock()
+    lead.id = lead_id
+    lead.place_id = f"place-{lead_id}"
+    lead.website_url = website_url
+    lead.status = LeadStatus.SCRAPED
+    return lead
+
+
+class TestHostLimiter:
+    """Tests for the per-host concurrency cap."""
+
+    def test_limits_concurrency_per_host(self):
+        """Should never allow more than per_host fetches against one host."""
+        limiter = HostLimiter(per_host=2)
+        active = {"now": 0, "peak": 0}
+        lock = threading.Lock()
+
+        def fetch():
+            with limiter.limit("https://example.com/page"):
+                with lock:
+                    active["now"] += 1
+                    active["peak"] = max(active["peak"], active["now"])
+                time.sleep(0.02)
+                with lock:
+                    active["now"] -= 1
+
+        threads = [threading.Thread(target=fetch) for _ in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert active["peak"] == 2
+
+    def test_scheme_less_urls_share_host_slot(self):
+        """Should key semaphores by hostname regardless of scheme or path."""
+        limiter = HostLimiter(per_host=1)
+        assert limiter._semaphore("example.com") is limiter._semaphore("example.com")
+        with limiter.limit("example.com/about"):
+            assert not limiter._semaphore("example.com").acquire(blocking=False)
+
+
+@pytest.fixture(autouse=True)
+def no_dns_prefetch():
+    """Keeps the pre-resolution stage off the network."""
+    with patch("app.services.bulk.resolver") as mock_resolver:
+        mock_resolver.prefetch.return_value = (0, [])
+        yield mock_resolver
+
+
+class TestSiteKey:
+    """Tests for website URL normalization."""
+
+    def test_equivalent_urls_share_a_key(self):
+        assert site_key("HTTPS://Joes.com/") == site_key("joes.com") == site_key("http://joes.com:80#top")
+
+    def test_distinct_pages_and_hosts_differ(self):
+        assert site_key("joes.com/locations/a") != site_key("joes.com/locations/b")
+        assert site_key("joes.com") != site_key("www.joes.com")
+
+
+class TestRunBulkAnalysis:
+    """Tests for the bulk engine's writer loop."""
+
+    @patch("app.db_session")
+    @patch("app.services.bulk.analyze_url")
+    @patch("app.services.bulk.get_place_details")
+    @patch("app.services.bulk.Lead")
+    def test_analyzes_all_leads_and_commits_each(self, mock_lead_class, mock_details, mock_analyze, mock_db):
+        """Should apply every result on the writer thread and commit per lead."""
+        leads = {i: _mock_lead(i, f"https://site{i}.example") for i in range(1, 6)}
+        mock_lead_class.query.get.side_effect = lambda lead_id: leads.get(lead_id)
+        mock_details.return_value = {}
+        mock_analyze.return_value = {"exists": True, "ssl_active": True, "logs": []}
+
+        count, errors, _ = run_bulk_analysis(list(leads), max_workers=3)
+
+        assert (count, errors) == (5, 0)
+        assert mock_db.commit.call_count == 5
+        assert all(lead.status == LeadStatus.ANALYZED for lead in leads.values())
+
+    @patch("app.db_session")
+    @patch("app.models.config.AppConfig.flush_usage")
+    @patch("app.services.bulk.analyze_url")
+    @patch("app.services.bulk.get_place_details")
+    @patch("app.services.bulk.Lead")
+    def test_usage_is_committed_on_the_writer_thread(
+        self, mock_lead_class, mock_details, mock_analyze, mock_flush, mock_db, monkeypatch
+    ):
+        """Should keep Details usage from worker threads in memory for the writer to commit."""
+        from app.models.config import AppConfig
+
+        monkeypatch.setenv("USAGE_FLUSH_INTERVAL", "0")
+        leads = {i: _mock_lead(i, None) for i in range(1, 5)}
+        mock_lead_class.query.get.side_effect = lambda lead_id: leads.get(lead_id)
+        flush_threads = []
+        mock_flush.side_effect = lambda: flush_threads.append(threading.current_thread())
+        mock_details.side_effect = lambda place_id: AppConfig.record_usage("google_api_details") or {}
+
+        run_bulk_analysis(list(leads), max_workers=2)
+
+        assert AppConfig.pending_usage("google_api_details") == 4
+        assert flush_threads and set(flush_threads) == {threading.current_thread()}
+
+    @patch("app.db_session")
+    @patch("app.services.bulk.analyze_url")
+    @patch("app.services.bulk.get_place_details")
+    @patch("app.services.bulk.Lead")
+    def test_counts_worker_failures_and_missing_leads(self, mock_lead_class, mock_details, mock_analyze, mock_db):
+        """Should count crashed workers and unknown lead ids as errors."""
+        leads = {1: _mock_lead(1, "https://ok.example"), 2: _mock_lead(2, "https://boom.example")}
+        mock_lead_class.query.get.side_effect = lambda lead_id: leads.get(lead_id)
+        mock_details.return_value = {}
+
+        def analyze(url, **kwargs):
+            if "boom" in url:
+                raise RuntimeError("boom")
+            return {"exists": True, "logs": []}
+
+        mock_analyze.side_effect = analyze
+
+        count, errors, _ = run_bulk_analysis([1, 2, 999], max_workers=2)
+
+        assert count == 1
+        assert errors == 2
+
+    @patch("app.db_session")
+    @patch("app.services.bulk.analyze_url")
+    @patch("app.services.bulk.get_place_details")
+    @patch("app.services.bulk.Lead")
+    def test_preresolves_hosts_before_analysis(
+        self, mock_lead_class, mock_details, mock_analyze, mock_db, no_dns_prefetch
+    ):
+        """Should resolve every website host once, before any scan starts."""
+        leads = {
+            1: _mock_lead(1, "https://a.example/x"),
+            2: _mock_lead(2, "a.example/y"),
+            3: _mock_lead(3, None),
+        }
+        mock_lead_class.query.get.side_effect = lambda lead_id: leads.get(lead_id)
+        mock_details.side_effect = lambda place_id: {"website": "https://b.example"} if place_id == "place-3" else {}
+        mock_analyze.side_effect = lambda url, **kwargs: (
+            no_dns_prefetch.prefetch.assert_called_once() or {"exists": True, "logs": []}
+        )
+
+        count, errors, _ = run_bulk_analysis(list(leads), max_workers=2)
+
+        assert (count, errors) == (3, 0)
+        (hosts,), _ = no_dns_prefetch.prefetch.call_args
+        assert hosts == {"a.example", "b.example"}
+
+    @patch("app.db_session")
+    @patch("app.services.bulk.analyze_url")
+    @patch("app.services.bulk.get_place_details")
+    @patch("app.services.bulk.Lead")
+    def test_preresolve_can_be_disabled(self, mock_lead_class, mock_details, mock_analyze, mock_db, no_dns_prefetch):
+        """Should skip the DNS stage and still save leads without a website."""
+        leads = {1: _mock_lead(1, None)}
+        mock_lead_class.query.get.side_effect = lambda lead_id: leads.get(lead_id)
+        mock_details.return_value = None
+
+        count, errors, _ = run_bulk_analysis([1], preresolve=False)
+
+        assert (count, errors) == (1, 0)
+        mock_analyze.assert_not_called()
+        no_dns_prefetch.prefetch.assert_not_called()
+
+    @patch("app.db_session")
+    @patch("app.services.bulk.analyze_url")
+    @patch("app.services.bulk.get_place_details")
+    @patch("app.services.bulk.Lead")
+    def test_shared_websites_are_scanned_once(self, mock_lead_class, mock_details, mock_analyze, mock_db):
+        """Should analyze each unique site once and fan the result out to every lead."""
+        leads = {
+            1: _mock_lead(1, "https://franchise.example/"),
+            2: _mock_lead(2, "franchise.example"),
+            3: _mock_lead(3, "HTTP://Franchise.example"),
+            4: _mock_lead(4, "https://other.example"),
+        }
+        mock_lead_class.query.get.side_effect = lambda lead_id: leads.get(lead_id)
+        mock_details.return_value = {}
+        mock_analyze.return_value = {"exists": True, "mobile_viewport": True, "logs": ["scanned"]}
+
+        result = run_bulk_analysis(list(leads), max_workers=4)
+
+        assert result == (4, 0, 2)
+        assert mock_analyze.call_count == 2
+        assert all(lead.mobile_viewport for lead in leads.values())
+        assert "Shared scan" in leads[2].analysis_notes
+        assert mock_analyze.return_value["logs"] == ["scanned"]
@@ -0,0 +1,37 @@
+"""
+Tests for the on-disk JSON cache.
+Critical path: Round trips, TTL expiry, corrupt entries.
+"""
+
+import time
+from unittest.mock import patch
+
+from app.services.cache import DiskCache
+
+
+class TestDiskCache:
+    """Tests for DiskCache get/set semantics."""
+
+    def test_round_trips_json_values(self):
+        """Should return exactly what was stored."""
+        cache = DiskCache("unit")
+        cache.set("https://example.com/", {"etag": '"abc"', "features": {"tech_stack": ["Wix"]}})
+
+        assert cache.get("https://example.com/") == {"etag": '"abc"', "features": {"tech_stack": ["Wix"]}}
+
+    def test_expires_entries_older_than_ttl(self):
+        """Should treat entries past the TTL as missing."""
+        cache = DiskCache("unit", ttl=60)
+        cache.set("key", 1)
+
+        with patch("app.services.cache.time.time", return_value=time.time() + 120):
+            assert cache.get("key") is None
+            assert cache.get("key", max_age=3600) == 1
+
+    def test_ignores_corrupt_entries(self):
+        """Should return None instead of raising on unreadable files."""
+        cache = DiskCache("unit")
+        cache.set("key", 1)
+        cache._path("key").write_text("{not json")
+
+        assert cache.get("key") is None
@@ -1,64 +1,150 @@
 """
 Tests for the AppConfig model.
-Critical path: Atomic increment, monthly reset.
+Critical path: Write-behind usage counts, cached navbar stats, get/set.
 """
 
-from unittest.mock import MagicMock, patch
+from datetime import date
+from unittest.mock import patch
 
+import pytest
+from sqlalchemy import text
 
-class TestAppConfigIncrement:
-    """Tests for atomic increment functionality."""
 
-    @patch("app.db_session")
-    def test_increment_creates_key_if_missing(self, mock_db):
-        """Should create key with value 1 if it doesn't exist."""
+def _ledger(db):
+    """{counter: total} straight from the api_usage table."""
+    return dict(db.execute(text("SELECT counter, SUM(count) FROM api_usage GROUP BY counter")).all())
+
+
+class TestUsageWriteBehind:
+    """Tests for in-memory usage counts flushed to the usage ledger in batches."""
+
+    @pytest.fixture(autouse=True)
+    def db(self, test_db, monkeypatch):
         from app.models.config import AppConfig
 
-        mock_db.get.return_value = None
+        monkeypatch.setenv("USAGE_FLUSH_INTERVAL", "3600")
+        with patch("app.db_session", test_db):
+            AppConfig.flush_usage()  # Starts the interval now
+            yield test_db
+
+    def test_records_in_memory_until_flushed(self, db):
+        """Should hold counts in memory, then append their sums on flush."""
+        from app.models.config import AppConfig
 
-        # Mock check_monthly_reset to avoid side effects
-        with patch.object(AppConfig, "check_monthly_reset"):
-            with patch.object(mock_db, "execute"):
-                with patch.object(mock_db, "commit"):
-                    with patch.object(mock_db, "add"):
-                        result = AppConfig.increment("test_counter")
+        for _ in range(3):
+            AppConfig.record_usage("google_api_nearby")
+        AppConfig.record_usage("google_api_details", 2)
 
-        # Should return a value (even if 0 due to mocking)
-        assert isinstance(result, int)
+        assert _ledger(db) == {}
+        assert AppConfig.pending_usage("google_api_nearby") == 3
 
-    @patch("app.db_session")
-    def test_increment_uses_atomic_sql(self, mock_db):
-        """Should use SQL UPDATE for atomic increment."""
+        AppConfig.flush_usage()
+        AppConfig.record_usage("google_api_nearby")
+        AppConfig.flush_usage()
+
+        assert _ledger(db) == {"google_api_nearby": 4, "google_api_details": 2}
+        assert db.execute(text("SELECT COUNT(*) FROM api_usage")).scalar() == 3  # Appended, never updated
+        assert AppConfig.pending_usage("google_api_nearby") == 0
+
+    def test_one_commit_per_flush(self, db):
+        """Should write a whole batch with a single commit."""
+        from app.models.config import AppConfig
+
+        for _ in range(50):
+            AppConfig.record_usage("google_api_nearby")
+        with patch.object(db, "commit") as mock_commit:
+            AppConfig.flush_usage()
+
+        mock_commit.assert_called_once()
+
+    def test_failed_flush_keeps_counts(self, db):
+        """Should keep counts in memory when the write fails."""
+        from app.models.config import AppConfig
+
+        AppConfig.record_usage("google_api_nearby", 5)
+        with patch.object(db, "commit", side_effect=RuntimeError("locked")):
+            AppConfig.flush_usage()
+
+        assert AppConfig.pending_usage("google_api_nearby") == 5
+
+    def test_flushes_when_interval_elapses(self, db, monkeypatch):
+        """Should write through on the next record once the flush interval has passed."""
+        from app.models.config import AppConfig
+
+        monkeypatch.setenv("USAGE_FLUSH_INTERVAL", "0")
+        AppConfig.record_usage("nearby_cache_hits")
+
+        assert _ledger(db) == {"nearby_cache_hits": 1}
+
+    def test_remaining_budget_counts_pending_usage(self, monkeypatch):
+        """Should charge unflushed calls against the monthly budget."""
+        from app.models.config import AppConfig
+        from app.services.quota import remaining
+
+        monkeypatch.setenv("GOOGLE_NEARBY_MONTHLY_LIMIT", "10")
+        AppConfig.record_usage("google_api_nearby", 4)
+        AppConfig.flush_usage()
+        for _ in range(3):
+            AppConfig.record_usage("google_api_nearby")
+
+        assert remaining("google_api_nearby") == 3
+
+
+class TestUsageStatsCache:
+    """Tests for the cached navbar usage stats."""
+
+    @pytest.fixture(autouse=True)
+    def db(self, test_db, monkeypatch):
         from app.models.config import AppConfig
 
-        mock_item = MagicMock()
-        mock_item.value = "5"
-        mock_db.get.return_value = mock_item
+        monkeypatch.setenv("USAGE_FLUSH_INTERVAL", "3600")
+        monkeypatch.setenv("USAGE_STATS_TTL", "3600")
+        with patch("app.db_session", test_db):
+            AppConfig.record_usage("google_api_nearby", 7)
+            AppConfig.flush_usage()
+            yield test_db
 
-        with patch.object(AppConfig, "check_monthly_reset"):
-            AppConfig.increment("test_key")
+    def test_reuses_ledger_totals(self, db):
+        """Should read the rollup once, then serve renders without touching the DB."""
+        from app.models.config import AppConfig
 
-        # Should have called execute for atomic update
-        mock_db.execute.assert_called_once()
+        assert AppConfig.usage_stats()["google_api_nearby"] == 7
+        with patch.object(db, "query", side_effect=AssertionError("DB read")):
+            assert AppConfig.usage_stats()["google_api_nearby"] == 7
 
+    def test_adds_pending_counts_without_db_reads(self, db):
+        """Should include counts not flushed yet."""
+        from app.models.config import AppConfig
 
-class TestAppConfigMonthlyReset:
-    """Tests for monthly counter reset."""
+        AppConfig.usage_stats()
+        AppConfig.record_usage("google_api_nearby", 3)
+        with patch.object(db, "query", side_effect=AssertionError("DB read")):
+            assert AppConfig.usage_stats()["google_api_nearby"] == 10
 
-    def test_resets_counters_on_new_month(self):
-        """Should reset counters when month changes."""
+    def test_invalidated_by_flush(self):
+        """Should re-read after this process flushes."""
         from app.models.config import AppConfig
 
-        # Set up: pretend last month was different
-        with patch.object(AppConfig, "get", return_value="2024-01"):
-            with patch.object(AppConfig, "set") as mock_set:
-                with patch("app.models.config.datetime") as mock_dt:
-                    mock_dt.now.return_value.strftime.return_value = "2024-02"
+        AppConfig.usage_stats()
+        AppConfig.record_usage("google_api_details", 2)
+        AppConfig.flush_usage()
+        with patch.object(AppConfig, "pending_usage", return_value=0):
+            assert AppConfig.usage_stats()["google_api_details"] == 2
+
+    def test_expires_after_ttl(self, db, monkeypatch):
+        """Should re-read once the TTL passes, picking up writes from other processes."""
+        from app.models.config import AppConfig
 
-                    AppConfig.check_monthly_reset()
+        AppConfig.usage_stats()
+        db.execute(
+            text("INSERT INTO api_usage (counter, day, count) VALUES ('google_api_nearby', :day, 2)"),
+            {"day": date.today().isoformat()},
+        )
+        db.commit()
+        assert AppConfig.usage_stats()["google_api_nearby"] == 7
 
-                    # Should have called set for the new month and counters
-                    assert mock_set.call_count >= 1
+        monkeypatch.setenv("USAGE_STATS_TTL", "0")
+        assert AppConfig.usage_stats()["google_api_nearby"] == 9
 
 
 class TestAppConfigGetSet:
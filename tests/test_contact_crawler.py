@@ -0,0 +1,150 @@
+"""
+Tests for the contact-page crawl stage.
+Critical path: Candidate selection, budgeted fetching, merging into analysis results.
+"""
+
+import time
+from unittest.mock import MagicMock, patch
+
+from app.services.contact_crawler import contact_page_candidates, crawl_contact_pages, run_contact_crawl
+from app.services.pipeline import run_site_stages
+
+
+def _page(html, status_code=200):
+    response = MagicMock()
+    response.status_code = status_code
+    response.iter_content.return_value = [html.encode("utf-8")]
+    return response
+
+
+def _session(pages, delay=0):
+    def get(url, **kwargs):
+        time.sleep(delay)
+        return pages.get(url) or _page("", status_code=404)
+
+    session = MagicMock()
+    session.get.side_effect = get
+    return session
+
+
+class TestCandidates:
+    """Tests for picking contact-like pages from homepage links."""
+
+    def test_prefers_same_site_contact_pages(self):
+        hrefs = ["/about-us", "https://facebook.com/contact", "/menu", "https://www.joes.com/contact", "/locations"]
+
+        assert contact_page_candidates("https://joes.com/", hrefs, max_pages=2) == [
+            "https://www.joes.com/contact",
+            "https://joes.com/about-us",
+        ]
+
+
+class TestCrawl:
+    """Tests for the budgeted crawl."""
+
+    @patch("app.services.contact_crawler.new_session")
+    def test_merges_details_from_several_pages(self, mock_session):
+        mock_session.return_value = _session(
+            {
+                "https://joes.com/contact": _page('<body><a href="mailto:hello@joes.com">Email us</a></body>'),
+                "https://joes.com/about": _page("<body>Call (555) 123-4567</body>"),
+            }
+        )
+
+        report = crawl_contact_pages("https://joes.com/", ["/about", "/contact"], budget=2)
+
+        assert report["email"] == "hello@joes.com"
+        assert report["phone"] == "(555) 123-4567"
+        assert report["sources"] == {"email": "https://joes.com/contact", "phone": "https://joes.com/about"}
+
+    @patch("app.services.contact_crawler.new_session")
+    def test_stops_at_budget(self, mock_session):
+        mock_session.return_value = _session({"https://joes.com/contact": _page("hi@joes.com")}, delay=0.5)
+
+        start = time.monotonic()
+        report = crawl_contact_pages("https://joes.com/", ["/contact"], budget=0.1)
+
+        assert time.monotonic() - start < 0.4
+        assert report["pages"] == []
+
+    @patch("app.services.contact_crawler.new_session")
+    def test_fetches_under_shared_host_limiter(self, mock_session):
+        """Should never fetch more pages of one host at once than the shared limiter allows."""
+        import threading
+
+        from app.services.host_limits import HostLimiter
+
+        active = {"now": 0, "peak": 0}
+        lock = threading.Lock()
+
+        def get(url, **kwargs):
+            with lock:
+                active["now"] += 1
+                active["peak"] = max(active["peak"], active["now"])
+            time.sleep(0.05)
+            with lock:
+                active["now"] -= 1
+            return _page("")
+
+        session = MagicMock()
+        session.get.side_effect = get
+        mock_session.return_value = session
+
+        report = crawl_contact_pages(
+            "https://joes.com/", ["/contact", "/about", "/hours"], budget=2, host_limiter=HostLimiter(per_host=1)
+        )
+
+        assert len(report["pages"]) == 3
+        assert active["peak"] == 1
+
+
+class TestRunContactCrawl:
+    """Tests for the stage wrapper around analyze_url results."""
+
+    @patch("app.services.contact_crawler.crawl_contact_pages")
+    def test_fills_missing_fields_only(self, mock_crawl):
+        mock_crawl.return_value = {
+            "pages": ["https://joes.com/contact"],
+            "email": "hi@joes.com",
+            "phone": "555-000-0000",
+            "sources": {"email": "https://joes.com/contact", "phone": "https://joes.com/contact"},
+        }
+        analysis = {"status_code": 200, "final_url": "https://joes.com/", "phone": "555-123-4567", "logs": []}
+
+        run_contact_crawl(analysis)
+
+        assert analysis["email"] == "hi@joes.com"
+        assert analysis["phone"] == "555-123-4567"
+        assert analysis["contact_info_found"] is True
+
+    @patch("app.services.contact_crawler.crawl_contact_pages")
+    def test_skips_when_homepage_has_everything(self, mock_crawl):
+        run_contact_crawl({"status_code": 200, "email": "a@b.co", "phone": "555-123-4567", "logs": []})
+
+        mock_crawl.assert_not_called()
+
+
+class TestSiteStages:
+    """Tests for running the post-fetch stages side by side."""
+
+    def test_merges_stage_outputs_in_order(self):
+        def crawl(analysis, host_limiter=None):
+            time.sleep(0.05)
+            analysis["email"] = "hi@joes.com"
+            analysis["logs"].append("crawl")
+            return analysis
+
+        def links(analysis, host_limiter=None):
+            analysis["broken_link_count"] = 2
+            analysis["logs"].append("links")
+            return analysis
+
+        def broken(analysis, host_limiter=None):
+            raise RuntimeError("boom")
+
+        with patch("app.services.pipeline.SITE_STAGES", (crawl, links, broken)):
+            analysis = run_site_stages({"status_code": 200, "email": None, "logs": ["fetched"]})
+
+        assert analysis["email"] == "hi@joes.com"
+        assert analysis["broken_link_count"] == 2
+        assert analysis["logs"] == ["fetched", "crawl", "links"]
@@ -0,0 +1,159 @@
+"""
+Tests for the resolver cache.
+Critical path: Failure classification, negative caching, TTL expiry, fail-fast analysis.
+"""
+
+import socket
+from unittest.mock import patch
+
+import pytest
+import requests
+
+from app.services.analyzer import analyze_url
+from app.services.dns_cache import ResolverCache, classify_failure, resolver
+
+ADDRINFO = [(socket.AF_INET, socket.SOCK_STREAM, 6, "", ("93.184.216.34", 443))]
+
+
+class TestClassifyFailure:
+    """Tests for mapping errors to negative-cache reasons."""
+
+    def test_nxdomain_gaierror(self):
+        assert classify_failure(socket.gaierror(socket.EAI_NONAME, "Name or service not known")) == "nxdomain"
+
+    def test_temporary_dns_failure_is_not_cached(self):
+        """Should treat EAI_AGAIN as transient."""
+        assert classify_failure(socket.gaierror(socket.EAI_AGAIN, "Temporary failure in name resolution")) is None
+
+    def test_refused(self):
+        assert classify_failure(ConnectionRefusedError(111, "Connection refused")) == "refused"
+
+    def test_wrapped_requests_errors(self):
+        """Should read the reason out of urllib3's wrapped messages."""
+        nx = requests.exceptions.ConnectionError(
+            "Failed to establish a new connection: [Errno -2] Name or service not known"
+        )
+        refused = requests.exceptions.ConnectionError(
+            "Failed to establish a new connection: [Errno 111] Connection refused"
+        )
+        assert classify_failure(nx) == "nxdomain"
+        assert classify_failure(refused) == "refused"
+        assert classify_failure(requests.exceptions.ConnectionError("Connection reset by peer")) is None
+
+
+class TestResolverCache:
+    """Tests for positive and negative caching."""
+
+    @patch("app.services.dns_cache.socket.getaddrinfo", return_value=ADDRINFO)
+    def test_positive_lookups_are_reused(self, mock_getaddrinfo):
+        cache = ResolverCache(ttl=60, negative_ttl=60)
+        assert cache.resolve("Example.com") == ["93.184.216.34"]
+        assert cache.resolve("example.com") == ["93.184.216.34"]
+        assert mock_getaddrinfo.call_count == 1
+
+    @patch("app.services.dns_cache.socket.getaddrinfo")
+    def test_nxdomain_is_negative_cached(self, mock_getaddrinfo):
+        """Should fail later lookups without touching the resolver."""
+        mock_getaddrinfo.side_effect = socket.gaierror(socket.EAI_NONAME, "Name or service not known")
+        cache = ResolverCache(ttl=60, negative_ttl=60)
+
+        for _ in range(3):
+            with pytest.raises(socket.gaierror):
+                cache.resolve("expired.example")
+
+        assert mock_getaddrinfo.call_count == 1
+        assert cache.dead_reason("expired.example") == "nxdomain"
+
+    def test_refusals_are_cached_per_port(self):
+        """Should remember a refused port without condemning the host, and skip refusals with no port."""
+        cache = ResolverCache(ttl=60, negative_ttl=60)
+        refused = ConnectionRefusedError(111, "Connection refused")
+
+        assert cache.record_failure("shop.example", refused, port=443) == "refused"
+        assert cache.record_failure("other.example", refused) == "refused"
+
+        assert cache.dead_reason("shop.example", 443) == "refused"
+        assert cache.dead_reason("shop.example", 80) is None
+        assert cache.dead_reason("shop.example") is None
+        assert cache.dead_reason("other.example", 443) is None
+
+    def test_entries_expire(self):
+        cache = ResolverCache(ttl=0, negative_ttl=0)
+        cache.mark_dead("gone.example", "refused")
+        assert cache.dead_reason("gone.example") is None
+
+    @patch("app.services.dns_cache.socket.getaddrinfo")
+    def test_prefetch_reports_dead_hosts(self, mock_getaddrinfo):
+        def lookup(host, port, type=None):
+            if host == "dead.example":
+                raise socket.gaierror(socket.EAI_NONAME, "Name or service not known")
+            if host == "flaky.example":
+                raise socket.gaierror(socket.EAI_AGAIN, "Temporary failure in name resolution")
+            return ADDRINFO
+
+        mock_getaddrinfo.side_effect = lookup
+        cache = ResolverCache(ttl=60, negative_ttl=60)
+
+        resolved, dead = cache.prefetch(["live.example", "dead.example", "flaky.example", "LIVE.example", ""])
+
+        assert resolved == 1
+        assert dead == ["dead.example"]
+        assert cache.cached_addresses("live.example") == ["93.184.216.34"]
+
+
+class TestFailFastAnalysis:
+    """Tests for the analyzer's use of the negative cache."""
+
+    @patch("app.services.analyzer.requests.get")
+    def test_dead_host_skips_network(self, mock_get):
+        resolver.mark_dead("parked.example", "nxdomain")
+
+        result = analyze_url("https://parked.example/about")
+
+        mock_get.assert_not_called()
+        assert result["exists"] is False
+        assert result["error"] == "Connection failed (DNS or Server down)"
+
+    @patch("app.services.analyzer.get_ssl_info")
+    @patch("app.services.analyzer.requests.get")
+    def test_connection_failure_marks_host_dead(self, mock_get, mock_ssl):
+        mock_get.side_effect = requests.exceptions.ConnectionError(
+            "Failed to establish a new connection: [Errno -2] Name or service not known"
+        )
+
+        analyze_url("http://expired.example")
+        analyze_url("http://expired.example/contact")
+
+        assert mock_get.call_count == 1
+        assert resolver.dead_reason("expired.example") == "nxdomain"
+
+    @patch("app.services.analyzer.socket.create_connection")
+    def test_refused_tls_probe_does_not_condemn_host(self, mock_connect):
+        """A closed port 443 must not block later plain-HTTP fetches of the same host."""
+        from app.services.analyzer import get_ssl_info
+
+        mock_connect.side_effect = ConnectionRefusedError(111, "Connection refused")
+        assert get_ssl_info("http-only.example")["valid"] is False
+        assert resolver.dead_reason("http-only.example", 80) is None
+        assert resolver.dead_reason("http-only.example", 443) == "refused"
+
+        mock_connect.side_effect = socket.gaierror(socket.EAI_NONAME, "Name or service not known")
+        get_ssl_info("expired.example")
+        assert resolver.dead_reason("expired.example") == "nxdomain"
+
+    @patch("app.services.analyzer.get_ssl_info")
+    @patch("app.services.analyzer.requests.get")
+    def test_refused_port_does_not_block_other_scheme(self, mock_get, mock_ssl):
+        """A refused HTTPS fetch must not fail a later plain-HTTP fetch of the same host."""
+        mock_get.side_effect = requests.exceptions.ConnectionError(
+            "Failed to establish a new connection: [Errno 111] Connection refused"
+        )
+
+        analyze_url("https://http-only.example/")
+        analyze_url("https://http-only.example/about")
+        analyze_url("http://http-only.example/")
+
+        assert [call.args[0] for call in mock_get.call_args_list] == [
+            "https://http-only.example/",
+            "http://http-only.example/",
+        ]
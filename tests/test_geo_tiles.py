@@ -0,0 +1,44 @@
+"""
+Tests for the geographic cell helpers used by adaptive tiling.
+Critical path: Child cells cover their parent, cells outside the search circle are dropped.
+"""
+
+import random
+
+from app.services.geo_tiles import distance_m, offset, root_cell, subdivide
+
+
+class TestGeometry:
+    def test_offset_round_trips_with_distance(self):
+        lat, lng = offset(37.7749, -122.4194, 3000, 4000)
+        assert abs(distance_m(37.7749, -122.4194, lat, lng) - 5000) < 5
+
+
+class TestSubdivide:
+    def test_children_cover_the_parent_circle(self):
+        """Every point of the searched circle should fall inside at least one child cell."""
+        origin = root_cell(37.7749, -122.4194, 10000)
+        children = subdivide(origin, origin, min_radius=100)
+        assert len(children) == 4
+        assert all(c.depth == 1 and c.radius < origin.radius for c in children)
+
+        rng = random.Random(7)
+        for _ in range(500):
+            north, east = rng.uniform(-10000, 10000), rng.uniform(-10000, 10000)
+            lat, lng = offset(origin.lat, origin.lng, north, east)
+            if distance_m(origin.lat, origin.lng, lat, lng) > origin.radius:
+                continue
+            assert any(distance_m(c.lat, c.lng, lat, lng) <= c.radius + 1 for c in children)
+
+    def test_drops_cells_outside_the_search_circle(self):
+        """Corner cells that miss the circle entirely should not be searched."""
+        origin = root_cell(37.7749, -122.4194, 10000)
+        cell = origin
+        for _ in range(2):  # Walk into the north-east corner
+            cell = max(subdivide(cell, origin, min_radius=100), key=lambda c: c.lat + c.lng)
+        # The corner square now spans 5-10km north/east; its own NE quadrant (7.5-10km) lies outside the circle
+        assert len(subdivide(cell, origin, min_radius=100)) == 3
+
+    def test_stops_at_min_radius(self):
+        origin = root_cell(37.7749, -122.4194, 300)
+        assert subdivide(origin, origin, min_radius=250) == []
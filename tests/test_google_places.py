@@ -3,13 +3,21 @@ Tests for the Google Places service.
 Critical path: Filtering, deduplication, API tracking.
 """
 
+import time
 from unittest.mock import MagicMock, patch
 
 import pytest
+import requests
 
 from app.services.google_places import get_omni_categories, get_place_details, search_nearby
 
 
+@pytest.fixture(autouse=True)
+def no_scan_checkpoints(monkeypatch):
+    """Keeps scans from resuming each other through a shared DB; TestScanCheckpoints opts back in."""
+    monkeypatch.setenv("SCAN_CHECKPOINTS", "0")
+
+
 class TestOmniCategories:
     """Tests for category configuration."""
 
@@ -31,8 +39,8 @@ class TestOmniCategories:
 class TestSearchFiltering:
     """Tests for chain and type blocklist filtering."""
 
-    @patch("app.services.google_places.requests.get")
-    @patch("app.services.google_places.AppConfig.increment")
+    @patch("app.services.google_places._session.get")
+    @patch("app.services.google_places.AppConfig.record_usage")
     def test_filters_chain_businesses(self, mock_increment, mock_get):
         """Should filter out chain businesses like McDonald's."""
         mock_response = MagicMock()
@@ -53,8 +61,8 @@ class TestSearchFiltering:
         assert len(result_items) == 1
         assert result_items[0][1]["name"] == "Local Plumber Joe"
 
-    @patch("app.services.google_places.requests.get")
-    @patch("app.services.google_places.AppConfig.increment")
+    @patch("app.services.google_places._session.get")
+    @patch("app.services.google_places.AppConfig.record_usage")
     def test_filters_type_blocklist(self, mock_increment, mock_get):
         """Should filter out blocklisted place types."""
         mock_response = MagicMock()
@@ -79,8 +87,8 @@ class TestSearchFiltering:
         assert len(result_items) == 1
         assert result_items[0][1]["name"] == "Corner Store Fix"
 
-    @patch("app.services.google_places.requests.get")
-    @patch("app.services.google_places.AppConfig.increment")
+    @patch("app.services.google_places._session.get")
+    @patch("app.services.google_places.AppConfig.record_usage")
     def test_deduplicates_across_categories(self, mock_increment, mock_get):
         """Should not return same place_id twice across categories."""
         mock_response = MagicMock()
@@ -114,8 +122,8 @@ class TestAPIErrorHandling:
             with pytest.raises(ValueError, match="GOOGLE_PLACES_API_KEY"):
                 list(search_nearby(37.7749, -122.4194, 1000, "plumber"))
 
-    @patch("app.services.google_places.requests.get")
-    @patch("app.services.google_places.AppConfig.increment")
+    @patch("app.services.google_places._session.get")
+    @patch("app.services.google_places.AppConfig.record_usage")
     def test_handles_api_error_status(self, mock_increment, mock_get):
         """Should log error and continue on API error status."""
         mock_response = MagicMock()
@@ -129,11 +137,567 @@ class TestAPIErrorHandling:
         assert any("Google API Error" in r[1] for r in log_items)
 
 
+class TestConcurrentScan:
+    """Tests for concurrent Omni-Search category scanning."""
+
+    @staticmethod
+    def _paged_api(pages_per_category=2):
+        """Fake Nearby Search: each category returns pages_per_category pages of one unique place."""
+
+        def get(url, params=None, **kwargs):
+            token = params.get("pagetoken")
+            keyword, page = token.split(":") if token else (params["keyword"], "0")
+            data = {"status": "OK", "results": [{"place_id": f"{keyword}-{page}", "name": f"{keyword} {page}"}]}
+            if int(page) + 1 < pages_per_category:
+                data["next_page_token"] = f"{keyword}:{int(page) + 1}"
+            response = MagicMock()
+            response.json.return_value = data
+            return response
+
+        return get
+
+    @patch("app.services.google_places.PAGE_TOKEN_DELAY", 0.2)
+    @patch("app.services.google_places._session.get")
+    @patch("app.services.google_places.AppConfig.record_usage")
+    def test_page_token_waits_overlap_across_categories(self, mock_increment, mock_get):
+        """Should scan categories concurrently, so token delays do not add up."""
+        import threading
+
+        mock_get.side_effect = self._paged_api(pages_per_category=2)
+        increment_threads = set()
+        nearby_calls = []
+
+        def increment(key):
+            increment_threads.add(threading.current_thread())
+            if key == "google_api_nearby":
+                nearby_calls.append(key)
+
+        mock_increment.side_effect = increment
+
+        env = {
+            "GOOGLE_PLACES_API_KEY": "test-key",
+            "OMNI_SEARCH_CATEGORIES": "a,b,c,d",
+            "OMNI_SEARCH_WORKERS": "4",
+            "GOOGLE_PLACES_QPS": "0",
+        }
+        with patch.dict("os.environ", env):
+            start = time.monotonic()
+            results = [r for r in search_nearby(1.0, 2.0, 1000, "business") if r[0] == "result"]
+            elapsed = time.monotonic() - start
+
+        assert sorted(r[1]["place_id"] for r in results) == ["a-0", "a-1", "b-0", "b-1", "c-0", "c-1", "d-0", "d-1"]
+        assert elapsed < 0.6  # Serial scanning would wait 4 x 0.2s
+        assert len(nearby_calls) == 8
+        assert increment_threads == {threading.current_thread()}
+
+    @patch("app.services.google_places._session.get")
+    @patch("app.services.google_places.AppConfig.record_usage")
+    def test_respects_qps_limit(self, mock_increment, mock_get):
+        """Should spread requests out to the configured rate across all workers."""
+        mock_get.side_effect = self._paged_api(pages_per_category=1)
+        env = {
+            "GOOGLE_PLACES_API_KEY": "test-key",
+            "OMNI_SEARCH_CATEGORIES": "a,b,c,d,e",
+            "OMNI_SEARCH_WORKERS": "5",
+            "GOOGLE_PLACES_QPS": "20",
+        }
+        with patch.dict("os.environ", env):
+            start = time.monotonic()
+            list(search_nearby(1.0, 2.0, 1000, "business"))
+
+        assert time.monotonic() - start >= 0.19  # 5 calls at 20/s: 1 burst token + 4 x 50ms
+        assert mock_get.call_count == 5
+
+
+class TestNearbyCache:
+    """Tests for the Nearby Search response cache."""
+
+    ENV = {"GOOGLE_PLACES_API_KEY": "test-key", "GOOGLE_PLACES_QPS": "0"}
+
+    @staticmethod
+    def _api(mock_get, pages=1):
+        mock_get.side_effect = TestConcurrentScan._paged_api(pages_per_category=pages)
+
+    @staticmethod
+    def _counts(mock_increment):
+        counts = {}
+        for call in mock_increment.call_args_list:
+            counts[call.args[0]] = counts.get(call.args[0], 0) + 1
+        return counts
+
+    @staticmethod
+    def _place_ids(results):
+        return sorted(r[1]["place_id"] for r in results if r[0] == "result")
+
+    @patch("app.services.google_places.PAGE_TOKEN_DELAY", 0)
+    @patch("app.services.google_places._session.get")
+    @patch("app.services.google_places.AppConfig.record_usage")
+    def test_repeat_scan_is_served_from_cache(self, mock_increment, mock_get):
+        """Should not re-buy any page when the same area is scanned again."""
+        self._api(mock_get, pages=2)
+        with patch.dict("os.environ", self.ENV):
+            first = list(search_nearby(37.7749, -122.4194, 1000, "plumber"))
+            mock_increment.reset_mock()
+            second = list(search_nearby(37.77491, -122.41941, 1000, "Plumber "))
+
+        assert mock_get.call_count == 2  # Two pages, bought once
+        assert self._place_ids(second) == self._place_ids(first) == ["plumber-0", "plumber-1"]
+        assert self._counts(mock_increment) == {"nearby_cache_hits": 2}
+        assert any("from cache" in r[1] for r in second if r[0] == "log")
+
+    @patch("app.services.google_places._session.get")
+    @patch("app.services.google_places.AppConfig.record_usage")
+    def test_force_refresh_bypasses_and_refreshes_cache(self, mock_increment, mock_get):
+        """Should re-query Google on force_refresh and store the fresh pages."""
+        self._api(mock_get)
+        with patch.dict("os.environ", self.ENV):
+            list(search_nearby(1.0, 2.0, 1000, "plumber"))
+            list(search_nearby(1.0, 2.0, 1000, "plumber", force_refresh=True))
+            list(search_nearby(1.0, 2.0, 1000, "plumber"))
+
+        assert mock_get.call_count == 2
+        assert self._counts(mock_increment) == {
+            "google_api_nearby": 2,
+            "nearby_cache_misses": 1,
+            "nearby_cache_hits": 1,
+        }
+
+    @patch("app.services.google_places._session.get")
+    @patch("app.services.google_places.AppConfig.record_usage")
+    def test_cache_is_keyed_by_radius_and_keyword(self, mock_increment, mock_get):
+        """Should treat a different radius or keyword as a different search."""
+        self._api(mock_get)
+        with patch.dict("os.environ", self.ENV):
+            list(search_nearby(1.0, 2.0, 1000, "plumber"))
+            list(search_nearby(1.0, 2.0, 2000, "plumber"))
+            list(search_nearby(1.0, 2.0, 1000, "roofer"))
+
+        assert mock_get.call_count == 3
+
+    @patch("app.services.google_places._session.get")
+    @patch("app.services.google_places.AppConfig.record_usage")
+    def test_expired_or_disabled_cache_queries_google(self, mock_increment, mock_get):
+        """Should ignore entries older than NEARBY_CACHE_TTL, and not cache at all with a TTL of 0."""
+        self._api(mock_get)
+        with patch.dict("os.environ", {**self.ENV, "NEARBY_CACHE_TTL": "0"}):
+            list(search_nearby(1.0, 2.0, 1000, "plumber"))
+            list(search_nearby(1.0, 2.0, 1000, "plumber"))
+        assert mock_get.call_count == 2
+        assert "nearby_cache_misses" not in self._counts(mock_increment)
+
+        with patch.dict("os.environ", self.ENV):
+            list(search_nearby(1.0, 2.0, 1000, "plumber"))
+            with patch("app.services.cache.time.time", return_value=time.time() + 86401):
+                list(search_nearby(1.0, 2.0, 1000, "plumber"))
+        assert mock_get.call_count == 4
+
+    @patch("app.services.google_places.PAGE_TOKEN_DELAY", 0)
+    @patch("app.services.google_places._session.get")
+    @patch("app.services.google_places.AppConfig.record_usage")
+    def test_partially_cached_chain_is_refetched(self, mock_increment, mock_get):
+        """Should restart from page 0 when a later page is missing, since page tokens expire."""
+        from app.services.google_places import nearby_cache, nearby_cache_key
+
+        self._api(mock_get, pages=2)
+        with patch.dict("os.environ", self.ENV):
+            list(search_nearby(1.0, 2.0, 1000, "plumber"))
+            nearby_cache.delete(nearby_cache_key(1.0, 2.0, 1000, "plumber", 1))
+            results = list(search_nearby(1.0, 2.0, 1000, "plumber"))
+
+        assert mock_get.call_count == 4
+        assert self._place_ids(results) == ["plumber-0", "plumber-1"]
+
+    @patch("app.services.google_places._session.get")
+    @patch("app.services.google_places.AppConfig.record_usage")
+    def test_error_responses_are_not_cached(self, mock_increment, mock_get):
+        """Should keep re-querying while Google returns an error status."""
+        mock_response = MagicMock()
+        mock_response.json.return_value = {"status": "REQUEST_DENIED"}
+        mock_get.return_value = mock_response
+        with patch.dict("os.environ", self.ENV):
+            list(search_nearby(1.0, 2.0, 1000, "plumber"))
+            list(search_nearby(1.0, 2.0, 1000, "plumber"))
+
+        assert mock_get.call_count == 2
+
+
+class TestAdaptiveTiling:
+    """Tests for splitting saturated searches into smaller cells."""
+
+    ENV = {"GOOGLE_PLACES_API_KEY": "test-key", "GOOGLE_PLACES_QPS": "0", "NEARBY_CACHE_TTL": "0"}
+    CENTER = (37.7749, -122.4194)
+
+    @classmethod
+    def _dense_api(cls):
+        """The 10km root search is capped at 60 results; each smaller cell finds one more place."""
+        here = {"lat": cls.CENTER[0], "lng": cls.CENTER[1]}
+
+        def get(url, params=None, **kwargs):
+            token = params.get("pagetoken")
+            if token or params["radius"] == 10000:
+                page = int(token) if token else 0
+                results = [
+                    {"place_id": f"big-{i}", "name": f"Shop {i}", "geometry": {"location": here}}
+                    for i in range(page * 20, page * 20 + 20)
+                ]
+                data = {"status": "OK", "results": results}
+                if page < 2:
+                    data["next_page_token"] = str(page + 1)
+            else:
+                location = params["location"]
+                data = {
+                    "status": "OK",
+                    "results": [
+                        {"place_id": "big-0", "name": "Shop 0", "geometry": {"location": here}},
+                        {"place_id": f"cell-{location}", "name": "Cell Shop", "geometry": {"location": here}},
+                        {
+                            "place_id": f"far-{location}",
+                            "name": "Far Shop",
+                            "geometry": {"location": {"lat": 0, "lng": 0}},
+                        },
+                    ],
+                }
+            response = MagicMock()
+            response.json.return_value = data
+            return response
+
+        return get
+
+    @patch("app.services.google_places.PAGE_TOKEN_DELAY", 0)
+    @patch("app.services.google_places._session.get")
+    @patch("app.services.google_places.AppConfig.record_usage")
+    def test_splits_saturated_search_into_cells(self, mock_increment, mock_get):
+        """Should re-search a capped area in four cells, de-duplicate, and drop places outside the circle."""
+        mock_get.side_effect = self._dense_api()
+        with patch.dict("os.environ", self.ENV):
+            results = list(search_nearby(*self.CENTER, 10000, "plumber", tiling=True))
+
+        place_ids = [r[1]["place_id"] for r in results if r[0] == "result"]
+        logs = [r[1] for r in results if r[0] == "log"]
+        assert mock_get.call_count == 3 + 4
+        assert len(place_ids) == len(set(place_ids)) == 64
+        assert not any(pid.startswith("far-") for pid in place_ids)
+        assert any("split into 4 smaller cells" in line for line in logs)
+        assert any("7 API call(s) for 64 unique leads" in line for line in logs)
+
+    @patch("app.services.google_places.PAGE_TOKEN_DELAY", 0)
+    @patch("app.services.google_places._session.get")
+    @patch("app.services.google_places.AppConfig.record_usage")
+    def test_tiling_off_keeps_single_search(self, mock_increment, mock_get):
+        """Should stop at Google's cap when tiling is disabled."""
+        mock_get.side_effect = self._dense_api()
+        with patch.dict("os.environ", self.ENV):
+            results = list(search_nearby(*self.CENTER, 10000, "plumber", tiling=False))
+
+        assert mock_get.call_count == 3
+        assert len([r for r in results if r[0] == "result"]) == 60
+
+    @patch("app.services.google_places.PAGE_TOKEN_DELAY", 0)
+    @patch("app.services.google_places._session.get")
+    @patch("app.services.google_places.AppConfig.record_usage")
+    def test_tile_budget_caps_subdivision(self, mock_increment, mock_get):
+        """Should stop splitting once a category has used NEARBY_TILING_MAX_TILES cells."""
+        mock_get.side_effect = self._dense_api()
+        with patch.dict("os.environ", {**self.ENV, "NEARBY_TILING_MAX_TILES": "3"}):
+            results = list(search_nearby(*self.CENTER, 10000, "plumber", tiling=True))
+
+        logs = [r[1] for r in results if r[0] == "log"]
+        assert mock_get.call_count == 3 + 2
+        assert any("split into 2 smaller cells" in log for log in logs)
+        assert any("tiling limit (3 cells) reached, skipped 2 saturated sub-cells" in log for log in logs)
+
+
+class TestScanBudget:
+    """Tests for the monthly budget guard on scans."""
+
+    ENV = {"GOOGLE_PLACES_API_KEY": "test-key", "GOOGLE_PLACES_QPS": "0", "NEARBY_CACHE_TTL": "0"}
+
+    @patch("app.services.google_places.remaining", return_value=2)
+    @patch("app.services.google_places._session.get")
+    @patch("app.services.google_places.AppConfig.record_usage")
+    def test_refuses_scan_without_budget(self, mock_increment, mock_get, mock_remaining):
+        """Should not call Google when even one category's worst case does not fit."""
+        with patch.dict("os.environ", self.ENV):
+            results = list(search_nearby(1.0, 2.0, 1000, "plumber"))
+
+        assert mock_get.call_count == 0
+        assert any("scan refused" in r[1] for r in results if r[0] == "log")
+
+    @patch("app.services.google_places.remaining", return_value=7)
+    @patch("app.services.google_places._session.get")
+    @patch("app.services.google_places.AppConfig.record_usage")
+    def test_trims_categories_to_budget(self, mock_increment, mock_get, mock_remaining):
+        """Should scan only the categories whose worst case fits, and say which were skipped."""
+        mock_get.side_effect = TestConcurrentScan._paged_api(pages_per_category=1)
+        with patch.dict("os.environ", {**self.ENV, "OMNI_SEARCH_CATEGORIES": "a,b,c,d"}):
+            results = list(search_nearby(1.0, 2.0, 1000, "business"))
+
+        assert sorted(r[1]["place_id"] for r in results if r[0] == "result") == ["a-0", "b-0"]
+        assert any("skipping 2 categories" in r[1] for r in results if r[0] == "log")
+
+    @patch("app.services.google_places.PAGE_TOKEN_DELAY", 0)
+    @patch("app.services.google_places.plan_scan")
+    @patch("app.services.google_places.remaining", return_value=3)
+    @patch("app.services.google_places._session.get")
+    @patch("app.services.google_places.AppConfig.record_usage")
+    def test_hard_cap_stops_scan_at_budget(self, mock_increment, mock_get, mock_remaining, mock_plan):
+        """Should never exceed the remaining budget, even when the plan underestimates."""
+        from app.services.quota import ScanPlan
+
+        mock_plan.return_value = ScanPlan(["a", "b"], False, 1, 2, 3, [])
+        mock_get.side_effect = TestConcurrentScan._paged_api(pages_per_category=2)
+        with patch.dict("os.environ", {**self.ENV, "OMNI_SEARCH_CATEGORIES": "a,b"}):
+            results = list(search_nearby(1.0, 2.0, 1000, "business"))
+
+        assert mock_get.call_count == 3
+        assert sum("budget reached" in r[1] for r in results if r[0] == "log") == 1
+
+
+class TestScanCheckpoints:
+    """Tests for resuming interrupted scans from persisted checkpoints."""
+
+    ENV = {
+        "GOOGLE_PLACES_API_KEY": "test-key",
+        "GOOGLE_PLACES_QPS": "0",
+        "NEARBY_CACHE_TTL": "0",
+        "SCAN_CHECKPOINTS": "1",
+        "OMNI_SEARCH_CATEGORIES": "a,b,c",
+    }
+
+    @pytest.fixture(autouse=True)
+    def db(self, test_db):
+        with patch("app.db_session", test_db), patch("app.services.google_places.AppConfig.record_usage"):
+            yield test_db
+
+    @staticmethod
+    def _checkpoint(db, **fields):
+        from app.models.scan_checkpoint import ScanCheckpoint
+
+        checkpoint = ScanCheckpoint.start(ScanCheckpoint.key_for(1.0, 2.0, 1000, "business"))
+        checkpoint.save(**fields)
+        return checkpoint
+
+    @staticmethod
+    def _result_ids(results):
+        return sorted(r[1]["place_id"] for r in results if r[0] == "result")
+
+    @patch("app.services.google_places.PAGE_TOKEN_DELAY", 0)
+    @patch("app.services.google_places._session.get")
+    def test_completed_scan_is_checkpointed(self, mock_get, db):
+        """Should record every category as done and close the checkpoint."""
+        from app.models.scan_checkpoint import ScanCheckpoint
+
+        mock_get.side_effect = TestConcurrentScan._paged_api(pages_per_category=2)
+        with patch.dict("os.environ", self.ENV):
+            list(search_nearby(1.0, 2.0, 1000, "business"))
+
+        checkpoint = db.query(ScanCheckpoint).one()
+        assert checkpoint.status == "complete"
+        assert checkpoint.completed == ["a", "b", "c"]
+        assert checkpoint.tokens == {}
+        assert checkpoint.seen == ["a-0", "a-1", "b-0", "b-1", "c-0", "c-1"]
+
+    @patch("app.services.google_places.PAGE_TOKEN_DELAY", 0)
+    @patch("app.services.google_places._session.get")
+    def test_failed_category_stays_resumable(self, mock_get, db):
+        """Should leave the checkpoint running, with only the finished categories done."""
+        from app.models.scan_checkpoint import ScanCheckpoint
+
+        paged = TestConcurrentScan._paged_api(pages_per_category=1)
+
+        def get(url, params=None, **kwargs):
+            if params.get("keyword") == "b":
+                response = MagicMock()
+                response.json.return_value = {"status": "REQUEST_DENIED"}
+                return response
+            return paged(url, params)
+
+        mock_get.side_effect = get
+        with patch.dict("os.environ", self.ENV):
+            list(search_nearby(1.0, 2.0, 1000, "business"))
+
+        checkpoint = db.query(ScanCheckpoint).one()
+        assert checkpoint.status == "running"
+        assert checkpoint.completed == ["a", "c"]
+
+    @patch("app.services.google_places.PAGE_TOKEN_DELAY", 0)
+    @patch("app.services.google_places._session.get")
+    def test_resumes_from_saved_token(self, mock_get, db):
+        """Should skip finished categories and continue a paged one from its saved token."""
+        self._checkpoint(db, completed=["a"], tokens={"b": {"token": "b:1", "page": 1}}, seen=["a-0", "a-1", "b-0"])
+        mock_get.side_effect = TestConcurrentScan._paged_api(pages_per_category=2)
+        with patch.dict("os.environ", self.ENV):
+            results = list(search_nearby(1.0, 2.0, 1000, "business"))
+
+        assert self._result_ids(results) == ["b-1", "c-0", "c-1"]
+        requested = [
+            call.kwargs["params"].get("keyword") or call.kwargs["params"]["pagetoken"]
+            for call in mock_get.call_args_list
+        ]
+        assert sorted(requested) == ["b:1", "c", "c:1"]
+        assert any("1/3 categories already done" in r[1] for r in results if r[0] == "log")
+
+    @patch("app.services.google_places.PAGE_TOKEN_DELAY", 0)
+    @patch("app.services.google_places._session.get")
+    def test_expired_token_restarts_category(self, mock_get, db):
+        """Should start a category over when its saved page token has expired."""
+        self._checkpoint(db, completed=["a", "c"], tokens={"b": {"token": "stale", "page": 1}}, seen=["b-0"])
+        paged = TestConcurrentScan._paged_api(pages_per_category=2)
+
+        def get(url, params=None, **kwargs):
+            if params.get("pagetoken") == "stale":
+                response = MagicMock()
+                response.json.return_value = {"status": "INVALID_REQUEST"}
+                return response
+            return paged(url, params)
+
+        mock_get.side_effect = get
+        with patch.dict("os.environ", self.ENV):
+            results = list(search_nearby(1.0, 2.0, 1000, "business"))
+
+        assert self._result_ids(results) == ["b-1"]
+        assert mock_get.call_count == 3
+        assert any("token expired" in r[1] for r in results if r[0] == "log")
+
+    @patch("app.services.google_places.PAGE_TOKEN_DELAY", 0)
+    @patch("app.services.google_places._session.get")
+    def test_closing_early_saves_consumed_pages(self, mock_get, db):
+        """Should checkpoint on disconnect, so a resumed scan does not buy the pages already read again."""
+        mock_get.side_effect = TestConcurrentScan._paged_api(pages_per_category=2)
+        env = {**self.ENV, "SCAN_CHECKPOINT_INTERVAL": "3600"}
+        with patch.dict("os.environ", env):
+            scan = search_nearby(1.0, 2.0, 1000, "business")
+            first = []
+            for event in scan:
+                first.append(event)
+                if event[0] == "log" and "Found" in event[1]:
+                    break
+            scan.close()
+
+        read = self._result_ids(first)
+        assert read
+        mock_get.reset_mock()
+        with patch.dict("os.environ", env):
+            resumed = self._result_ids(search_nearby(1.0, 2.0, 1000, "business"))
+
+        requested = {
+            call.kwargs["params"].get("pagetoken") or f"{call.kwargs['params']['keyword']}:0"
+            for call in mock_get.call_args_list
+        }
+        assert not requested & {pid.replace("-", ":") for pid in read}
+        assert sorted(read + resumed) == ["a-0", "a-1", "b-0", "b-1", "c-0", "c-1"]
+
+    @patch("app.services.google_places._session.get")
+    def test_force_refresh_starts_over(self, mock_get, db):
+        """Should ignore an existing checkpoint when forcing a refresh."""
+        self._checkpoint(db, completed=["a", "b"], tokens={}, seen=["a-0", "b-0"])
+        mock_get.side_effect = TestConcurrentScan._paged_api(pages_per_category=1)
+        with patch.dict("os.environ", self.ENV):
+            results = list(search_nearby(1.0, 2.0, 1000, "business", force_refresh=True))
+
+        assert self._result_ids(results) == ["a-0", "b-0", "c-0"]
+
+    @patch("app.services.google_places.PAGE_TOKEN_DELAY", 0)
+    @patch("app.services.google_places._session.get")
+    def test_announces_checkpoints_at_interval(self, mock_get):
+        """Should yield a checkpoint event before each (throttled) save, and one at the end."""
+        mock_get.side_effect = TestConcurrentScan._paged_api(pages_per_category=2)
+        with patch.dict("os.environ", {**self.ENV, "SCAN_CHECKPOINT_INTERVAL": "3600"}):
+            events = [r[0] for r in search_nearby(1.0, 2.0, 1000, "business")]
+        assert events.count("checkpoint") == 1
+
+        with patch.dict("os.environ", {**self.ENV, "SCAN_CHECKPOINT_INTERVAL": "0"}):
+            events = [r[0] for r in search_nearby(1.0, 2.0, 1000, "business", force_refresh=True)]
+        assert events.count("checkpoint") == 10  # 6 pages, 3 finished categories and the end
+
+    @patch("app.services.google_places._session.get")
+    def test_scans_without_database(self, mock_get):
+        """Should still scan when no database is configured."""
+        mock_get.side_effect = TestConcurrentScan._paged_api(pages_per_category=1)
+        with patch("app.db_session", None), patch.dict("os.environ", self.ENV):
+            results = list(search_nearby(1.0, 2.0, 1000, "business"))
+
+        assert self._result_ids(results) == ["a-0", "b-0", "c-0"]
+
+
+class TestRetries:
+    """Tests for the pooled session's retry/backoff and timing."""
+
+    ENV = {"GOOGLE_PLACES_API_KEY": "test-key", "GOOGLE_PLACES_QPS": "0", "NEARBY_CACHE_TTL": "0"}
+
+    @staticmethod
+    def _response(status_code=200, data=None):
+        response = MagicMock(status_code=status_code)
+        response.json.return_value = data or {}
+        if status_code >= 400:
+            response.raise_for_status.side_effect = requests.exceptions.HTTPError(f"HTTP {status_code}")
+        return response
+
+    @patch("app.services.google_places._backoff", return_value=0)
+    @patch("app.services.google_places._session.get")
+    @patch("app.services.google_places.AppConfig.record_usage")
+    def test_retries_transient_statuses(self, mock_increment, mock_get, mock_backoff):
+        """Should retry 5xx and OVER_QUERY_LIMIT, counting every attempt as an API call."""
+        ok = {"status": "OK", "results": [{"place_id": "1", "name": "Joe's Plumbing"}]}
+        mock_get.side_effect = [
+            self._response(503),
+            self._response(data={"status": "OVER_QUERY_LIMIT"}),
+            self._response(data=ok),
+        ]
+        with patch.dict("os.environ", self.ENV):
+            results = list(search_nearby(1.0, 2.0, 1000, "plumber"))
+
+        assert [r[1]["place_id"] for r in results if r[0] == "result"] == ["1"]
+        assert [c.args[0] for c in mock_increment.call_args_list] == ["google_api_nearby"] * 3
+        assert mock_backoff.call_count == 2
+        assert mock_get.call_args.kwargs["timeout"] == (5, 15)
+        assert any("Google latency" in r[1] for r in results if r[0] == "log")
+
+    @patch("app.services.google_places._backoff", return_value=0)
+    @patch("app.services.google_places._session.get")
+    @patch("app.services.google_places.AppConfig.record_usage")
+    def test_gives_up_after_max_retries(self, mock_increment, mock_get, mock_backoff):
+        """Should report the category as failed once GOOGLE_PLACES_RETRIES is spent."""
+        mock_get.return_value = self._response(500)
+        with patch.dict("os.environ", {**self.ENV, "GOOGLE_PLACES_RETRIES": "2"}):
+            results = list(search_nearby(1.0, 2.0, 1000, "plumber"))
+
+        assert mock_get.call_count == 3
+        assert any("Error fetching plumber" in r[1] for r in results if r[0] == "log")
+
+    @patch("app.services.google_places._backoff", return_value=0)
+    @patch("app.services.google_places._session.get")
+    @patch("app.services.google_places.AppConfig.record_usage")
+    def test_does_not_retry_permanent_errors(self, mock_increment, mock_get, mock_backoff):
+        mock_get.return_value = self._response(data={"status": "REQUEST_DENIED"})
+        with patch.dict("os.environ", self.ENV):
+            list(search_nearby(1.0, 2.0, 1000, "plumber"))
+
+        assert mock_get.call_count == 1
+
+    @patch("app.services.google_places._backoff", return_value=0)
+    @patch("app.services.google_places._session.get")
+    @patch("app.services.google_places.AppConfig.record_usage")
+    def test_details_retry_connection_errors_and_record_latency(self, mock_increment, mock_get, mock_backoff):
+        """Should retry a dropped connection and time each Details attempt."""
+        from app.services.google_places import latency
+
+        before = latency.summary().get("details", {}).get("calls", 0)
+        mock_get.side_effect = [
+            requests.exceptions.ConnectionError("reset"),
+            self._response(data={"status": "OK", "result": {"website": "https://example.com"}}),
+        ]
+        with patch.dict("os.environ", {"GOOGLE_PLACES_API_KEY": "test-key", "GOOGLE_PLACES_QPS": "0"}):
+            assert get_place_details("retry-place") == {"website": "https://example.com"}
+
+        assert latency.summary()["details"]["calls"] == before + 2
+
+
 class TestGetPlaceDetails:
     """Tests for place details fetching."""
 
-    @patch("app.services.google_places.requests.get")
-    @patch("app.services.google_places.AppConfig.increment")
+    @patch("app.services.google_places._session.get")
+    @patch("app.services.google_places.AppConfig.record_usage")
     def test_returns_details_on_success(self, mock_increment, mock_get):
         """Should return place details dict on success."""
         mock_response = MagicMock()
@@ -148,8 +712,8 @@ class TestGetPlaceDetails:
         assert result["formatted_phone_number"] == "(555) 123-4567"
         assert result["website"] == "https://example.com"
 
-    @patch("app.services.google_places.requests.get")
-    @patch("app.services.google_places.AppConfig.increment")
+    @patch("app.services.google_places._session.get")
+    @patch("app.services.google_places.AppConfig.record_usage")
     def test_returns_empty_dict_on_error(self, mock_increment, mock_get):
         """Should return empty dict on API error."""
         mock_get.side_effect = Exception("Network error")
@@ -158,3 +722,60 @@ class TestGetPlaceDetails:
             result = get_place_details("test-place-id")
 
         assert result == {}
+
+    @patch("app.services.google_places._session.get")
+    @patch("app.services.google_places.AppConfig.record_usage")
+    def test_reuses_fresh_cached_details(self, mock_increment, mock_get):
+        """Should skip the API call, and the usage counter, while the cached response is fresh."""
+        mock_response = MagicMock()
+        mock_response.json.return_value = {"status": "OK", "result": {"website": "https://example.com"}}
+        mock_get.return_value = mock_response
+
+        with patch.dict("os.environ", {"GOOGLE_PLACES_API_KEY": "test-key"}):
+            first = get_place_details("test-place-id")
+            second = get_place_details("test-place-id")
+
+        assert first == second == {"website": "https://example.com"}
+        assert mock_get.call_count == 1
+        assert [c.args[0] for c in mock_increment.call_args_list] == ["google_api_details", "details_cache_hits"]
+
+    @patch("app.services.google_places._session.get")
+    @patch("app.services.google_places.AppConfig.record_usage")
+    def test_refetches_after_freshness_window(self, mock_increment, mock_get):
+        """Should call the API again once the cached response is older than PLACE_DETAILS_MAX_AGE."""
+        mock_response = MagicMock()
+        mock_response.json.return_value = {"status": "OK", "result": {"website": "https://example.com"}}
+        mock_get.return_value = mock_response
+
+        with patch.dict("os.environ", {"GOOGLE_PLACES_API_KEY": "test-key", "PLACE_DETAILS_MAX_AGE": "60"}):
+            get_place_details("test-place-id")
+            with patch("app.services.cache.time.time", return_value=time.time() + 61):
+                get_place_details("test-place-id")
+            get_place_details("test-place-id", max_age=0)
+
+        assert mock_get.call_count == 3
+
+    @patch("app.services.google_places._session.get")
+    @patch("app.services.google_places.AppConfig.record_usage")
+    def test_does_not_cache_failed_lookups(self, mock_increment, mock_get):
+        """Should retry a place whose Details call returned no result."""
+        mock_response = MagicMock()
+        mock_response.json.return_value = {"status": "NOT_FOUND"}
+        mock_get.return_value = mock_response
+
+        with patch.dict("os.environ", {"GOOGLE_PLACES_API_KEY": "test-key"}):
+            assert get_place_details("gone") == {}
+            assert get_place_details("gone") == {}
+
+        assert mock_get.call_count == 2
+
+    @patch("app.services.google_places.remaining", return_value=0)
+    @patch("app.services.google_places._session.get")
+    @patch("app.services.google_places.AppConfig.record_usage")
+    def test_skips_call_when_monthly_budget_spent(self, mock_increment, mock_get, mock_remaining):
+        """Should not call the API (or count usage) once the Details budget is spent."""
+        with patch.dict("os.environ", {"GOOGLE_PLACES_API_KEY": "test-key"}):
+            assert get_place_details("test-place-id") == {}
+
+        mock_get.assert_not_called()
+        mock_increment.assert_not_called()
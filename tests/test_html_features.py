@@ -0,0 +1,100 @@
+"""
+Tests for the single-pass HTML feature extractor.
+Critical path: Parity with the legacy heuristics, chunked streaming.
+"""
+
+import pytest
+
+from app.services.html_features import HtmlFeatureExtractor, extract_features, resolve_backend
+
+
+class TestExtractFeatures:
+    """Tests for the individual page heuristics."""
+
+    def test_detects_viewport_and_tech_stack(self):
+        """Should find the viewport meta and platform fingerprints in one pass."""
+        html = (
+            '<html><head><meta name="viewport" content="Width=Device-Width, initial-scale=1">'
+            '<link href="/wp-content/themes/x.css"></head><body>Hi</body></html>'
+        )
+        features = extract_features(html)
+
+        assert features["mobile_viewport"] is True
+        assert features["tech_stack"] == ["WordPress"]
+
+    def test_ignores_script_text_for_contact_info(self):
+        """Should not count phone-like numbers inside scripts as contact info."""
+        html = "<html><body><script>var id = 5551234567;</script><p>Welcome</p></body></html>"
+
+        assert extract_features(html)["contact_info_found"] is False
+
+    def test_matches_phone_split_across_text_nodes(self):
+        """Should match contact patterns that span adjacent text nodes."""
+        html = "<html><body><span>(555)</span> <b>123-4567</b></body></html>"
+
+        assert extract_features(html)["contact_info_found"] is True
+
+    def test_copyright_only_from_footer_text(self):
+        """Should read the copyright year from the trailing text window."""
+        filler = "<p>" + ("lorem ipsum " * 400) + "</p>"
+        html = f"<html><body><p>© 2001 Old Header</p>{filler}<footer>&copy; 2023 Shop</footer></body></html>"
+
+        assert extract_features(html)["copyright_year"] == 2023
+
+    def test_captures_email_and_phone_values(self):
+        """Should keep the first email and phone, including ones only in mailto:/tel: links."""
+        html = '<body><p>Call 555.123.4567</p><a href="mailto:hello@joes.com?subject=Hi">Write us</a></body>'
+
+        features = extract_features(html)
+
+        assert features["email"] == "hello@joes.com"
+        assert features["phone"] == "555.123.4567"
+
+    def test_collects_distinct_link_targets_in_order(self):
+        """Should keep each <a href> once, in document order, for the link checker."""
+        html = (
+            '<body><a href="/menu">Menu</a><a>No href</a><a href=" /about ">About</a><a href="/menu">Again</a></body>'
+        )
+
+        assert extract_features(html)["links"] == ["/menu", "/about"]
+
+
+class TestStreaming:
+    """Tests for chunked feeding."""
+
+    def test_chunked_feed_matches_single_feed(self):
+        """Should produce identical results no matter how the page is split."""
+        html = (
+            '<html><head><meta name="viewport" content="width=device-width"></head>'
+            '<body><script src="https://static.wix.com/x.js"></script>'
+            "<p>Mail info@example.com</p><footer>Copyright 2020</footer></body></html>"
+        )
+        extractor = HtmlFeatureExtractor()
+        for i in range(0, len(html), 7):
+            extractor.feed(html[i : i + 7])
+
+        assert extractor.close() == extract_features(html)
+
+    def test_unknown_backend_falls_back_to_stdlib(self):
+        """Should fall back to html.parser for unsupported backends."""
+        assert resolve_backend("selectolax") == "html.parser"
+
+    def test_lxml_backend_matches_stdlib(self, caplog):
+        """Should extract the same features with lxml, without logging a parser failure."""
+        import logging
+
+        pytest.importorskip("lxml")
+        html = (
+            '<html><head><meta name="viewport" content="width=device-width">'
+            '<script src="/wp-content/plugins/elementor/frontend.js"></script></head>'
+            '<body><a href="/contact">Contact</a><a href="tel:555-123-4567">Call</a>'
+            "<p>Mail info@example.com</p><footer>Copyright 2020</footer></body></html>"
+        )
+        extractor = HtmlFeatureExtractor(backend="lxml")
+        with caplog.at_level(logging.DEBUG, logger="app.services.html_features"):
+            for i in range(0, len(html), 11):
+                extractor.feed(html[i : i + 11])
+            result = extractor.close()
+
+        assert result == extract_features(html, backend="html.parser")
+        assert not caplog.records
@@ -0,0 +1,107 @@
+"""
+Tests for the record/replay HTTP harness.
+Critical path: Faithful replay of recorded exchanges, offline errors, restoration of the real transport.
+"""
+
+import http.server
+import socket
+import socketserver
+import threading
+import time
+
+import pytest
+import requests
+
+from app.services.analyzer import analyze_url
+from app.services.http_replay import HttpCorpus, recording, replaying
+
+PAGE = (
+    b'<html><head><meta name="viewport" content="width=device-width"></head>'
+    b"<body>wp-content Call (555) 123-4567<footer>&copy; 2021</footer></body></html>"
+)
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path == "/old":
+            self.send_response(301)
+            self.send_header("Location", "/")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(PAGE)))
+        self.end_headers()
+        self.wfile.write(PAGE)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def local_site():
+    """Serves PAGE on a local port; yields the base URL."""
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def _closed_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class TestRecordReplay:
+    """Tests for round-tripping real traffic through the corpus."""
+
+    def test_replayed_analysis_matches_recorded(self, local_site, tmp_path):
+        """Should reproduce the analysis offline, redirects included."""
+        corpus = tmp_path / "corpus"
+        with recording(corpus):
+            live = analyze_url(f"{local_site}/old")
+
+        original_get_adapter = requests.Session.get_adapter
+        with replaying(corpus) as adapter:
+            replayed = analyze_url(f"{local_site}/old")
+
+        for field in ("status_code", "final_url", "tech_stack", "mobile_viewport", "phone", "copyright_year"):
+            assert replayed[field] == live[field]
+        assert live["tech_stack"] == "WordPress"
+        assert adapter.misses == 0
+        assert requests.Session.get_adapter is original_get_adapter
+
+    def test_recorded_errors_are_replayed(self, tmp_path):
+        url = f"http://127.0.0.1:{_closed_port()}/"
+        with recording(tmp_path), pytest.raises(requests.exceptions.ConnectionError):
+            requests.get(url, timeout=2)
+
+        with replaying(tmp_path), pytest.raises(requests.exceptions.ConnectionError):
+            requests.get(url, timeout=2)
+
+    def test_unrecorded_requests_fail_offline(self, tmp_path):
+        with replaying(tmp_path) as adapter, pytest.raises(requests.exceptions.ConnectionError):
+            requests.get("https://never-recorded.example/")
+        assert adapter.misses == 1
+
+    def test_simulated_latency(self, local_site, tmp_path):
+        with recording(tmp_path):
+            requests.get(f"{local_site}/", timeout=2)
+
+        with replaying(tmp_path, latency=0.1):
+            start = time.perf_counter()
+            response = requests.get(f"{local_site}/", stream=True)
+            assert time.perf_counter() - start >= 0.1
+            assert b"".join(response.iter_content(1024)) == PAGE
+
+    def test_corpus_exposes_html_pages_and_seeds(self, local_site, tmp_path):
+        corpus = HttpCorpus(tmp_path)
+        with recording(tmp_path):
+            requests.get(f"{local_site}/", timeout=2)
+        corpus.add_seeds([f"{local_site}/", f"{local_site}/"])
+
+        assert corpus.seeds() == [f"{local_site}/"]
+        assert list(corpus.html_pages()) == [(f"{local_site}/", PAGE.decode())]
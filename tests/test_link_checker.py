@@ -0,0 +1,157 @@
+"""
+Tests for the broken-link checker stage.
+Critical path: Link normalization, HEAD/GET fallback, budget enforcement, result mapping.
+"""
+
+import time
+from unittest.mock import MagicMock, patch
+
+import requests
+
+from app.services.dns_cache import resolver
+from app.services.link_checker import check_links, normalize_links, run_link_check
+
+
+def _response(status_code):
+    response = MagicMock()
+    response.status_code = status_code
+    return response
+
+
+def _session(head=None, get=None):
+    session = MagicMock()
+    session.head.side_effect = head
+    session.get.side_effect = get
+    return session
+
+
+class TestNormalizeLinks:
+    """Tests for turning raw hrefs into checkable URLs."""
+
+    def test_resolves_filters_and_dedupes(self):
+        hrefs = [
+            "/about",
+            "about#team",
+            "https://facebook.com/joes",
+            "mailto:joe@example.com",
+            "tel:5551234567",
+            "javascript:void(0)",
+            "#top",
+            "/",
+            "https://joes.com/about",
+        ]
+        assert normalize_links("https://joes.com/", hrefs, max_links=10) == [
+            "https://joes.com/about",
+            "https://facebook.com/joes",
+        ]
+
+    def test_respects_max_links(self):
+        hrefs = [f"/page-{i}" for i in range(10)]
+        assert len(normalize_links("https://joes.com", hrefs, max_links=3)) == 3
+
+
+class TestCheckLinks:
+    """Tests for the concurrent checker."""
+
+    @patch("app.services.link_checker.new_session")
+    def test_reports_broken_links(self, mock_session):
+        statuses = {"https://joes.com/ok": 200, "https://joes.com/gone": 404, "https://joes.com/busy": 429}
+        mock_session.return_value = _session(head=lambda url, **kwargs: _response(statuses[url]))
+
+        report = check_links("https://joes.com/", ["/ok", "/gone", "/busy"], budget=2)
+
+        assert report["checked"] == 2
+        assert report["unchecked"] == 1
+        assert report["broken"] == [("https://joes.com/gone", "404")]
+
+    @patch("app.services.link_checker.new_session")
+    def test_falls_back_to_get_when_head_is_rejected(self, mock_session):
+        session = _session(head=lambda url, **kwargs: _response(405), get=lambda url, **kwargs: _response(200))
+        mock_session.return_value = session
+
+        report = check_links("https://joes.com/", ["/menu"], budget=2)
+
+        assert report == {"checked": 1, "unchecked": 0, "broken": []}
+        assert session.get.call_args.kwargs["stream"] is True
+
+    @patch("app.services.link_checker.new_session")
+    def test_dead_domains_count_as_broken(self, mock_session):
+        def head(url, **kwargs):
+            raise requests.exceptions.ConnectionError("[Errno -2] Name or service not known")
+
+        mock_session.return_value = _session(head=head)
+
+        report = check_links("https://joes.com/", ["https://expired-partner.example/"], budget=2)
+
+        assert report["broken"] == [("https://expired-partner.example/", "nxdomain")]
+        assert resolver.dead_reason("expired-partner.example") is None
+
+    @patch("app.services.link_checker.new_session")
+    def test_refused_link_does_not_condemn_host(self, mock_session):
+        """A refused link is reported broken without touching the shared DNS cache."""
+
+        def head(url, **kwargs):
+            raise requests.exceptions.ConnectionError("[Errno 111] Connection refused")
+
+        mock_session.return_value = _session(head=head)
+
+        report = check_links("https://joes.com/", ["http://127.0.0.1:1/x"], budget=2)
+
+        assert report["broken"] == [("http://127.0.0.1:1/x", "refused")]
+        assert resolver.dead_reason("127.0.0.1", 1) is None
+        assert resolver.dead_reason("127.0.0.1", 8765) is None
+
+    @patch("app.services.link_checker.new_session")
+    def test_uses_shared_host_limiter(self, mock_session):
+        """Should wait for the caller's per-host slots, leaving links unchecked when none free up."""
+        from app.services.host_limits import HostLimiter
+
+        mock_session.return_value = _session(head=lambda url, **kwargs: _response(200))
+        limiter = HostLimiter(per_host=1)
+
+        with limiter.limit("https://joes.com/"):
+            report = check_links(
+                "https://joes.com/", ["/a", "https://other.example/"], budget=0.1, host_limiter=limiter
+            )
+
+        assert report == {"checked": 1, "unchecked": 1, "broken": []}
+
+    @patch("app.services.link_checker.new_session")
+    def test_stops_at_budget(self, mock_session):
+        """Should return once the budget is spent, leaving slow links unchecked."""
+
+        def head(url, **kwargs):
+            time.sleep(0.5)
+            return _response(200)
+
+        mock_session.return_value = _session(head=head)
+
+        start = time.monotonic()
+        report = check_links("https://joes.com/", ["/a", "/b", "/c"], budget=0.1)
+
+        assert time.monotonic() - start < 0.4
+        assert report == {"checked": 0, "unchecked": 3, "broken": []}
+
+
+class TestRunLinkCheck:
+    """Tests for the stage wrapper around analyze_url results."""
+
+    @patch("app.services.link_checker.check_links")
+    def test_adds_counts_samples_and_logs(self, mock_check):
+        mock_check.return_value = {"checked": 4, "unchecked": 0, "broken": [("https://joes.com/old", "404")]}
+        analysis = {"status_code": 200, "final_url": "https://joes.com/", "links": ["/old"], "logs": []}
+
+        run_link_check(analysis)
+
+        assert analysis["links_checked"] == 4
+        assert analysis["broken_link_count"] == 1
+        assert analysis["broken_link_samples"] == ["https://joes.com/old (404)"]
+        assert any("1 broken of 4 checked" in log for log in analysis["logs"])
+
+    @patch("app.services.link_checker.check_links")
+    def test_skips_unread_pages_and_disabled_stage(self, mock_check, monkeypatch):
+        run_link_check({"status_code": 404, "links": [], "logs": []})
+        monkeypatch.setenv("LINK_CHECK_ENABLED", "0")
+        run_link_check({"status_code": 200, "links": ["/a"], "logs": []})
+
+        mock_check.assert_not_called()
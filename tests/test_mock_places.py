@@ -0,0 +1,94 @@
+"""
+Tests for the local mock Google Places server.
+Critical path: Scans run end-to-end against it, pagination, error injection, restoring the real base URL.
+"""
+
+import os
+from unittest.mock import patch
+
+import pytest
+
+from app.services.google_places import get_place_details, places_url, search_nearby
+from app.services.mock_places import MockPlaces, serving
+
+ENV = {
+    "GOOGLE_PLACES_API_KEY": "test-key",
+    "GOOGLE_PLACES_QPS": "0",
+    "NEARBY_CACHE_TTL": "0",
+    "SCAN_CHECKPOINTS": "0",
+}
+
+
+@pytest.fixture(autouse=True)
+def offline_usage():
+    """No usage counters or monthly budget, and no page-token wait."""
+    with patch("app.services.google_places.AppConfig.record_usage"), patch.dict("os.environ", ENV):
+        with patch("app.services.google_places.remaining", return_value=1000):
+            with patch("app.services.google_places.PAGE_TOKEN_DELAY", 0):
+                yield
+
+
+class TestMockPlaces:
+    """Tests for the synthetic responses."""
+
+    def test_pages_through_results(self):
+        """Should serve `results` places in pages of 20 linked by tokens."""
+        places = MockPlaces(results=45)
+        first = places.nearby({"location": "1.0,2.0", "radius": "1000", "keyword": "plumber"})
+        second = places.nearby({"pagetoken": first["next_page_token"]})
+        third = places.nearby({"pagetoken": second["next_page_token"]})
+
+        assert [len(page["results"]) for page in (first, second, third)] == [20, 20, 5]
+        assert "next_page_token" not in third
+        assert len({p["place_id"] for page in (first, second, third) for p in page["results"]}) == 45
+
+    def test_results_are_deterministic(self):
+        """Should return the same places for the same query."""
+        query = {"location": "1.0,2.0", "radius": "1000", "keyword": "plumber"}
+        assert MockPlaces().nearby(query)["results"] == MockPlaces().nearby(query)["results"]
+
+    def test_token_delay(self):
+        """Should reject a page token used before it activates."""
+        places = MockPlaces(token_delay=60)
+        first = places.nearby({"location": "1.0,2.0", "radius": "1000", "keyword": "plumber"})
+        assert places.nearby({"pagetoken": first["next_page_token"]})["status"] == "INVALID_REQUEST"
+
+
+class TestServing:
+    """Tests for scans against the local server."""
+
+    def test_omni_search_end_to_end(self):
+        """Should run a full Omni-Search through the mock and de-duplicate shared places."""
+        with patch.dict("os.environ", {"OMNI_SEARCH_CATEGORIES": "plumber,electrician,roofer"}):
+            with serving(results=60, overlap=0.5) as places:
+                results = [r[1] for r in search_nearby(1.0, 2.0, 1000, "business") if r[0] == "result"]
+
+        assert places.calls["nearby"] == 9
+        assert len({r["place_id"] for r in results}) == len(results)
+        assert 60 < len(results) < 180
+
+    def test_injected_errors_are_retried(self):
+        """Should recover from injected 503s and OVER_QUERY_LIMIT responses via retries."""
+        with patch("app.services.google_places._backoff", return_value=0):
+            with serving(results=20, error_rate=0.5, seed=1) as places:
+                results = [r for r in search_nearby(1.0, 2.0, 1000, "plumber") if r[0] == "result"]
+
+        assert places.errors > 0
+        assert len(results) == 20
+
+    def test_details(self):
+        """Should serve Place Details for mock place ids."""
+        with patch.dict("os.environ", {"PLACE_DETAILS_MAX_AGE": "0"}), serving() as places:
+            first = places.nearby({"location": "1.0,2.0", "radius": "1000", "keyword": "x"})
+            place_id = first["results"][0]["place_id"]
+            details = get_place_details(place_id)
+
+        assert details["website"] == f"https://{place_id}.example.com"
+
+    def test_restores_base_url(self):
+        """Should point Google calls back at the real API afterwards."""
+        with serving() as places:
+            assert places_url("details").startswith(places.base_url)
+
+        assert "GOOGLE_PLACES_BASE_URL" not in os.environ
+        assert places_url("details") == "https://maps.googleapis.com/maps/api/place/details/json"
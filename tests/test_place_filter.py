@@ -0,0 +1,61 @@
+"""
+Tests for the compiled chain/type blocklist filter.
+Critical path: Whole-word chain matching, type blocklist, bundled blocklist file.
+"""
+
+import json
+
+import pytest
+
+from app.services.place_filter import FILTER, PlaceFilter, load_filter
+
+
+class TestChainMatching:
+    """Tests for word-boundary chain matching."""
+
+    @pytest.mark.parametrize(
+        "name",
+        ["McDonalds Store #123", "McDonald's", "Lowe's Home Improvement", "The UPS Store", "BP", "Wendy’s", "7-Eleven"],
+    )
+    def test_blocks_chain_names(self, name):
+        assert FILTER.is_chain(name)
+
+    @pytest.mark.parametrize(
+        "name",
+        [
+            "BPM Plumbing",
+            "Pups & Suds Grooming",
+            "Lowery Electric",
+            "Cupsmith Coffee",
+            "Shelly's Salon",
+            "Targeted Pest",
+        ],
+    )
+    def test_ignores_chains_inside_other_words(self, name):
+        """Should not flag real businesses whose names merely contain a chain substring."""
+        assert not FILTER.is_chain(name)
+
+    def test_empty_blocklist_blocks_nothing(self):
+        assert not PlaceFilter().blocks({"name": "Walmart", "types": ["supermarket"]})
+
+
+class TestPlaceFilter:
+    """Tests for whole-place filtering."""
+
+    def test_blocks_junk_types(self):
+        assert FILTER.blocks({"name": "Big Supermarket", "types": ["supermarket", "store"]})
+        assert not FILTER.blocks({"name": "Corner Store Fix", "types": ["store"]})
+        assert not FILTER.blocks({"name": "No Types"})
+
+    def test_loads_custom_blocklist_file(self, tmp_path, monkeypatch):
+        """Should build from PLACE_BLOCKLIST_FILE and fall back to the bundled file when unreadable."""
+        path = tmp_path / "blocklist.json"
+        path.write_text(json.dumps({"chains": ["acme"], "types": ["car_dealer"]}))
+        monkeypatch.setenv("PLACE_BLOCKLIST_FILE", str(path))
+
+        custom = load_filter()
+        assert custom.is_chain("ACME Plumbing") and not custom.is_chain("Walmart")
+        assert custom.blocks({"name": "Joe's", "types": ["car_dealer"]})
+
+        monkeypatch.setenv("PLACE_BLOCKLIST_FILE", str(tmp_path / "missing.json"))
+        assert load_filter().is_chain("Walmart")
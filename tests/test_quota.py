@@ -0,0 +1,84 @@
+"""
+Tests for Google Places quota budgets and the pre-flight scan planner.
+Critical path: Budget math, trimming order, billing-month awareness.
+"""
+
+from datetime import date
+from unittest.mock import patch
+
+from app.services.quota import api_limiter, monthly_limit, plan_scan, remaining
+
+
+class TestPlanScan:
+    """Tests for plan_scan."""
+
+    def test_fits_within_budget_unchanged(self):
+        plan = plan_scan(["a", "b", "c"], budget=100)
+        assert plan.categories == ["a", "b", "c"]
+        assert plan.estimated_calls == 9  # 3 pages worst case per category
+        assert plan.skipped == []
+
+    def test_skips_trailing_categories_over_budget(self):
+        plan = plan_scan(["a", "b", "c", "d"], budget=7)
+        assert plan.categories == ["a", "b"]
+        assert plan.skipped == ["c", "d"]
+        assert plan.estimated_calls == 6
+
+    def test_cached_categories_are_free(self):
+        """Should keep fully cached categories even when nothing else fits."""
+        plan = plan_scan(["a", "b", "c"], budget=3, cached={"b", "c"})
+        assert plan.categories == ["a", "b", "c"]
+        assert plan.estimated_calls == 3
+
+    def test_shrinks_tiling_before_dropping_categories(self):
+        plan = plan_scan(["a", "b"], budget=60, tiling=True, max_tiles=64)
+        assert plan.tiling and plan.max_tiles == 10
+        assert plan.categories == ["a", "b"]
+
+    def test_drops_tiling_when_it_cannot_split(self):
+        plan = plan_scan(["a", "b"], budget=20, tiling=True, max_tiles=64)
+        assert not plan.tiling and plan.max_tiles == 1
+        assert plan.categories == ["a", "b"]
+
+    def test_empty_plan_when_budget_spent(self):
+        plan = plan_scan(["a"], budget=2)
+        assert plan.categories == [] and plan.skipped == ["a"]
+
+
+class TestMonthlyBudget:
+    """Tests for remaining-budget lookups."""
+
+    def test_remaining_uses_current_month_usage(self, test_db, monkeypatch):
+        """Should charge only this billing month's ledger rows against the budget."""
+        from app.models.usage import ApiUsage
+
+        monkeypatch.setenv("GOOGLE_NEARBY_MONTHLY_LIMIT", "100")
+        test_db.add_all(
+            [
+                ApiUsage(counter="google_api_nearby", day=date(2030, 5, 31), count=25),
+                ApiUsage(counter="google_api_nearby", day=date(2030, 6, 1), count=30),
+                ApiUsage(counter="google_api_nearby", day=date(2030, 6, 2), count=10),
+                ApiUsage(counter="google_api_details", day=date(2030, 6, 2), count=50),
+            ]
+        )
+        test_db.commit()
+        with patch("app.db_session", test_db), patch("app.models.usage.date") as mock_date:
+            mock_date.today.return_value = date(2030, 6, 15)
+            assert remaining("google_api_nearby") == 60
+
+            # Past months keep their history but no longer count
+            mock_date.today.return_value = date(2030, 7, 1)
+            assert remaining("google_api_nearby") == 100
+
+    def test_monthly_limit_defaults_and_override(self, monkeypatch):
+        monkeypatch.delenv("GOOGLE_DETAILS_MONTHLY_LIMIT", raising=False)
+        assert monthly_limit("google_api_details") == 10000
+        monkeypatch.setenv("GOOGLE_DETAILS_MONTHLY_LIMIT", "250")
+        assert monthly_limit("google_api_details") == 250
+
+    def test_shared_limiter_follows_env_rate(self, monkeypatch):
+        monkeypatch.setenv("GOOGLE_PLACES_QPS", "3")
+        limiter = api_limiter()
+        assert limiter.qps == 3
+        monkeypatch.setenv("GOOGLE_PLACES_QPS", "7")
+        assert api_limiter() is limiter and limiter.qps == 7
@@ -0,0 +1,51 @@
+"""
+Tests for the shared token-bucket rate limiter.
+Critical path: Rate enforcement across threads, burst handling.
+"""
+
+import threading
+import time
+
+from app.services.rate_limit import CallBudget, RateLimiter
+
+
+class TestRateLimiter:
+    """Tests for RateLimiter."""
+
+    def test_allows_burst_then_limits(self):
+        limiter = RateLimiter(qps=1, burst=3)
+        assert [limiter.try_acquire() for _ in range(4)] == [True, True, True, False]
+
+    def test_acquire_spreads_calls_across_threads(self):
+        """Should hold many threads to the shared rate."""
+        limiter = RateLimiter(qps=50)
+        start = time.monotonic()
+        threads = [threading.Thread(target=limiter.acquire) for _ in range(11)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert time.monotonic() - start >= 0.19  # 1 initial token + 10 x 20ms
+
+    def test_zero_qps_disables_limiting(self):
+        limiter = RateLimiter(qps=0)
+        start = time.monotonic()
+        for _ in range(100):
+            limiter.acquire()
+        assert limiter.try_acquire()
+        assert time.monotonic() - start < 0.05
+
+
+class TestCallBudget:
+    """Tests for CallBudget."""
+
+    def test_counts_down_to_zero(self):
+        budget = CallBudget(2)
+        assert [budget.take() for _ in range(3)] == [True, True, False]
+        assert budget.exhausted
+
+    def test_unlimited_by_default(self):
+        budget = CallBudget()
+        assert all(budget.take() for _ in range(1000))
+        assert not budget.exhausted
@@ -0,0 +1,123 @@
+"""
+Tests for the /search NDJSON stream.
+Critical path: Batched lead inserts, new-lead counts from the insert, writes before each scan checkpoint.
+"""
+
+import json
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import event
+
+
+def _result(pid):
+    return ("result", {"place_id": pid, "name": f"Biz {pid}", "address": "1 Main St", "rating": None, "types": []})
+
+
+@pytest.fixture
+def app_db(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATABASE_URI", f"sqlite:///{tmp_path / 'app.db'}")
+    import app as app_module
+
+    flask_app = app_module.create_app()
+    flask_app.config["TESTING"] = True
+    # The routes module imported the first test's session; point it at this one
+    monkeypatch.setattr("app.routes.main.db_session", app_module.db_session)
+    return flask_app.test_client(), app_module.db_session
+
+
+def _scan(client, events):
+    with patch("app.routes.main.search_nearby", return_value=iter(events)):
+        response = client.post("/search", data={"keyword": "plumber", "radius": "1000"})
+    return [json.loads(line) for line in response.data.decode().splitlines()]
+
+
+class TestSearchStream:
+    """Tests for writing streamed results."""
+
+    def test_counts_only_new_leads(self, app_db):
+        """Should skip place_ids already stored and report the rest as new."""
+        from app.models.lead import Lead
+
+        client, db = app_db
+        db.add(Lead(place_id="p1", name="Existing"))
+        db.commit()
+
+        messages = _scan(client, [("log", "start"), _result("p1"), _result("p2"), _result("p3")])
+
+        assert messages[0] == {"type": "log", "message": "start"}
+        assert messages[-1] == {"type": "done", "new_leads": 2, "total_scanned": 3}
+        assert sorted(lead.place_id for lead in Lead.query.all()) == ["p1", "p2", "p3"]
+        assert Lead.query.filter_by(place_id="p1").one().name == "Existing"
+
+    @patch("app.routes.main.LEAD_INSERT_CHUNK", 10)
+    def test_inserts_in_chunks_without_lookups(self, app_db):
+        """Should write 25 results with 3 INSERTs and no per-place SELECT."""
+        client, db = app_db
+        statements = []
+        event.listen(db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2].split()[0]))
+
+        messages = _scan(client, [_result(f"p{i}") for i in range(25)])
+
+        assert messages[-1]["new_leads"] == 25
+        assert statements.count("INSERT") == 3
+        assert statements.count("SELECT") == 0
+
+    def test_default_chunk_fits_sqlite_parameter_limit(self, app_db):
+        """Should keep every INSERT within the 999 bound parameters older SQLite builds allow."""
+        from app.routes.main import LEAD_INSERT_CHUNK
+
+        client, db = app_db
+        params = []
+        event.listen(
+            db.get_bind(),
+            "before_cursor_execute",
+            lambda *args: params.append(len(args[3])) if args[2].startswith("INSERT") else None,
+        )
+
+        messages = _scan(client, [_result(f"p{i}") for i in range(LEAD_INSERT_CHUNK + 1)])
+
+        assert messages[-1]["new_leads"] == LEAD_INSERT_CHUNK + 1
+        assert len(params) == 2
+        assert 900 < max(params) <= 999
+
+    def test_writes_pending_results_before_checkpoint(self, app_db):
+        """Should insert buffered results when the scan is about to checkpoint."""
+        from app.models.lead import Lead
+
+        client, db = app_db
+        written = []
+
+        def events():
+            yield _result("p1")
+            yield ("checkpoint", None)
+            written.append(db.query(Lead).count())
+            yield _result("p2")
+
+        with patch("app.routes.main.search_nearby", return_value=events()):
+            client.post("/search", data={"keyword": "plumber"})
+
+        assert written == [1]
+
+    def test_disconnect_writes_pending_results_before_closing_scan(self, app_db):
+        """Should insert buffered results on disconnect, before the scan saves its checkpoint."""
+        from app.models.lead import Lead
+
+        client, db = app_db
+        written = []
+
+        def events():
+            try:
+                yield _result("p1")
+                yield ("log", "page done")
+                yield _result("p2")
+            finally:
+                written.append(db.query(Lead).count())
+
+        with patch("app.routes.main.search_nearby", return_value=events()):
+            response = client.post("/search", data={"keyword": "plumber"}, buffered=False)
+            assert json.loads(next(iter(response.response))) == {"type": "log", "message": "page done"}
+            response.close()
+
+        assert written == [1]
+        assert [lead.place_id for lead in Lead.query.all()] == ["p1"]
@@ -0,0 +1,56 @@
+"""
+Tests for the shared environment settings helpers.
+Critical path: Fallbacks on bad input, clamping, on/off parsing.
+"""
+
+from unittest.mock import patch
+
+from app.services.settings import env_flag, env_number, new_session
+
+
+class TestEnvNumber:
+    """Tests for env_number."""
+
+    def test_unset_uses_default(self):
+        assert env_number("LEADSCAN_TEST_NUMBER", 7) == 7
+
+    @patch.dict("os.environ", {"LEADSCAN_TEST_NUMBER": "2.5"})
+    def test_casts_value(self):
+        assert env_number("LEADSCAN_TEST_NUMBER", 1.0, float) == 2.5
+
+    @patch.dict("os.environ", {"LEADSCAN_TEST_NUMBER": "lots"})
+    def test_malformed_value_uses_default(self):
+        assert env_number("LEADSCAN_TEST_NUMBER", 7) == 7
+
+    @patch.dict("os.environ", {"LEADSCAN_TEST_NUMBER": "-3"})
+    def test_clamps_to_minimum(self):
+        assert env_number("LEADSCAN_TEST_NUMBER", 7, minimum=1) == 1
+        assert env_number("LEADSCAN_TEST_NUMBER", 7) == -3
+
+
+class TestEnvFlag:
+    """Tests for env_flag."""
+
+    def test_unset_or_empty_uses_default(self):
+        assert env_flag("LEADSCAN_TEST_FLAG", True) is True
+        with patch.dict("os.environ", {"LEADSCAN_TEST_FLAG": " "}):
+            assert env_flag("LEADSCAN_TEST_FLAG", False) is False
+
+    def test_parses_on_and_off(self):
+        for value in ("0", "false", "No", " OFF "):
+            with patch.dict("os.environ", {"LEADSCAN_TEST_FLAG": value}):
+                assert env_flag("LEADSCAN_TEST_FLAG", True) is False
+        for value in ("1", "true", "yes", "on"):
+            with patch.dict("os.environ", {"LEADSCAN_TEST_FLAG": value}):
+                assert env_flag("LEADSCAN_TEST_FLAG", False) is True
+
+
+class TestNewSession:
+    """Tests for new_session."""
+
+    def test_sets_headers_and_pool_size(self):
+        session = new_session({"User-Agent": "test"}, pool_maxsize=4, schemes=("https://",))
+
+        assert session.headers["User-Agent"] == "test"
+        assert session.get_adapter("https://example.com")._pool_maxsize == 4
+        assert session.get_adapter("http://example.com") is not session.get_adapter("https://example.com")
@@ -0,0 +1,77 @@
+"""
+Tests for the compiled tech-stack signature engine.
+Critical path: Multi-literal matching, headers/cookies, bundled database.
+"""
+
+import re
+
+from app.services.html_features import extract_features
+from app.services.tech_signatures import ENGINE, SignatureEngine, trie_pattern
+
+
+class TestTriePattern:
+    """Tests for the combined literal regex."""
+
+    def test_matches_literals_sharing_prefixes(self):
+        """Should match every literal, including ones that are prefixes of others."""
+        regex = re.compile(trie_pattern(["wp", "wp-content", "wp-json", "wix.com"]))
+
+        assert regex.findall("x wp-json y wp-content z wp- w wix.com") == ["wp-json", "wp-content", "wp", "wix.com"]
+
+
+class TestSignatureEngine:
+    """Tests for the per-kind matchers."""
+
+    def setup_method(self):
+        self.engine = SignatureEngine(
+            {
+                "Alpha": {"html": ["alpha-cdn"], "script": ["/alpha.js"], "headers": {"x-alpha": [""]}},
+                "Beta": {"html": ["beta"], "headers": {"server": ["beta-server"]}, "cookies": ["beta_session"]},
+            }
+        )
+
+    def test_html_matching_is_case_insensitive(self):
+        """Should find literals regardless of case."""
+        assert self.engine.match_html("<div class='ALPHA-CDN'>Beta</div>") == {"Alpha", "Beta"}
+
+    def test_header_presence_and_cookie_names(self):
+        """Should treat empty literals as presence checks and scan Set-Cookie."""
+        headers = {"x-alpha": "1", "set-cookie": "beta_session=abc; Path=/"}
+
+        assert self.engine.match_headers(headers) == {"Alpha", "Beta"}
+
+    def test_overlapping_literals(self):
+        """Should find literals that start inside another match or are prefixes of it."""
+        engine = SignatureEngine({"X": {"html": ["abc"]}, "Y": {"html": ["bcd"]}, "Z": {"html": ["ab"]}})
+
+        assert engine.match_html("xxabcdxx") == {"X", "Y", "Z"}
+
+    def test_orders_results_by_database_order(self):
+        """Should return names in signature-file order."""
+        assert self.engine.ordered({"Beta", "Alpha"}) == ["Alpha", "Beta"]
+
+
+class TestBundledDatabase:
+    """Tests for the shipped signature file."""
+
+    def test_detects_builders_beyond_the_original_five(self):
+        """Should fingerprint Weebly, Duda, Joomla and Drupal sites."""
+        html = (
+            '<html><head><script src="//cdn2.editmysite.com/js/site/main.js"></script>'
+            '<link href="https://irp.cdn-website.com/x.css"></head>'
+            '<body><script src="/media/jui/js/jquery.min.js"></script>'
+            '<script type="application/json" data-drupal-selector="drupal-settings-json"></script></body></html>'
+        )
+
+        assert extract_features(html)["tech_stack"] == ["Weebly", "Duda", "Joomla", "Drupal"]
+
+    def test_plugin_inside_wordpress_path(self):
+        """Should see Elementor in a script URL that also matches WordPress literals."""
+        src = "https://example.com/wp-content/plugins/elementor/assets/js/frontend.min.js"
+
+        assert {"WordPress", "Elementor"} <= ENGINE.match_script(src)
+
+    def test_engine_is_compiled_once_at_import(self):
+        """Should expose a shared engine loaded from the data file."""
+        assert "WordPress" in ENGINE.names
+        assert ENGINE.html.max_length > 0
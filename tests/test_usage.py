@@ -0,0 +1,105 @@
+"""
+Tests for the append-only API usage ledger.
+Critical path: Per-day rollups, upgrade from app_config counters, survival across DB resets.
+"""
+
+from datetime import date
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from app import sync_schema
+from app.models.usage import ApiUsage, month_start
+
+
+@pytest.fixture
+def ledger(test_db):
+    test_db.add_all(
+        [
+            ApiUsage(counter="google_api_nearby", day=date(2030, 5, 31), count=4),
+            ApiUsage(counter="google_api_nearby", day=date(2030, 6, 1), count=3),
+            ApiUsage(counter="google_api_nearby", day=date(2030, 6, 1), count=2),
+            ApiUsage(counter="google_api_details", day=date(2030, 6, 2), count=7),
+        ]
+    )
+    test_db.commit()
+    with patch("app.db_session", test_db):
+        yield test_db
+
+
+class TestRollups:
+    """Tests for ledger aggregation."""
+
+    def test_totals_since_day(self, ledger):
+        assert ApiUsage.totals(date(2030, 6, 1)) == {"google_api_nearby": 5, "google_api_details": 7}
+        assert ApiUsage.totals(date(2030, 5, 1), ["google_api_nearby"]) == {"google_api_nearby": 9}
+
+    def test_daily_sums_rows_per_day(self, ledger):
+        assert ApiUsage.daily(date(2030, 5, 31)) == [
+            (date(2030, 5, 31), {"google_api_nearby": 4}),
+            (date(2030, 6, 1), {"google_api_nearby": 5}),
+            (date(2030, 6, 2), {"google_api_details": 7}),
+        ]
+
+    def test_month_start(self):
+        assert month_start(date(2030, 6, 17)) == date(2030, 6, 1)
+
+
+class TestUpgrade:
+    """Tests for seeding the ledger from the legacy app_config counters."""
+
+    def _old_db(self, tmp_path, month):
+        engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE app_config (key VARCHAR(50) PRIMARY KEY, value VARCHAR(255))"))
+            conn.execute(
+                text("INSERT INTO app_config VALUES ('last_billing_month', :month), ('google_api_nearby', '42')"),
+                {"month": month},
+            )
+        return engine
+
+    def test_imports_this_months_counters(self, tmp_path):
+        engine = self._old_db(tmp_path, date.today().strftime("%Y-%m"))
+        sync_schema(engine)
+
+        with engine.connect() as conn:
+            rows = conn.execute(text("SELECT counter, count FROM api_usage")).all()
+        assert rows == [("google_api_nearby", 42)]
+
+    def test_ignores_stale_counters(self, tmp_path):
+        engine = self._old_db(tmp_path, "2001-01")
+        sync_schema(engine)
+
+        with engine.connect() as conn:
+            assert conn.execute(text("SELECT COUNT(*) FROM api_usage")).scalar() == 0
+
+
+class TestUsageRoutes:
+    """Tests for the usage page and the ledger surviving a DB reset."""
+
+    @pytest.fixture
+    def client(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("DATABASE_URI", f"sqlite:///{tmp_path / 'app.db'}")
+        from app import create_app
+
+        app = create_app()
+        app.config["TESTING"] = True
+        return app.test_client()
+
+    def test_usage_page_shows_daily_cost(self, client):
+        from app.models.config import AppConfig
+
+        AppConfig.record_usage("google_api_nearby", 1000)
+        response = client.get("/usage?days=7")
+
+        assert response.status_code == 200
+        assert b"$32.00" in response.data
+
+    def test_reset_keeps_ledger(self, client):
+        from app.models.config import AppConfig
+
+        AppConfig.record_usage("google_api_details", 3)
+        client.post("/reset-db")
+
+        assert ApiUsage.totals(month_start()) == {"google_api_details": 3}